@@ -34,7 +34,7 @@ try:
 except Exception:
     # 如果读取失败，使用默认依赖
     requirements = [
-        'psutil>=5.8.0',
+        'psutil>=6.1.0',
         'paramiko>=2.7.0'
     ]
 
@@ -77,6 +77,9 @@ setup(
             'pyinstaller>=4.0',
             'setuptools>=50.0.0',
             'wheel>=0.36.0',
+        ],
+        'uring': [
+            'liburing; sys_platform == "linux"',
         ]
     },
     
@@ -7,8 +7,14 @@
 """
 
 import os
+import re
 import signal
+import socket
+import struct
+import sys
 import time
+from collections import namedtuple
+from dataclasses import replace
 from typing import List, Optional, Dict, Any, Tuple
 
 try:
@@ -21,6 +27,106 @@ from ..utils.logger import get_logger
 
 logger = get_logger(__name__)
 
+# 获取进程信息时一次批量读取的属性
+_PROCESS_ATTRS = [
+    'name', 'exe', 'cmdline', 'status', 'create_time', 'memory_info', 'cpu_percent'
+]
+
+# 会随时间变化的进程属性，命中缓存时只重新读取这些属性
+_VOLATILE_ATTRS = ['status', 'memory_info', 'cpu_percent']
+
+# 进程信息缓存达到该数量时清理已退出的进程
+_PROCESS_CACHE_SWEEP_SIZE = 512
+
+# 网络连接快照的默认有效期（秒），有效期内的多次查询共用一次解析结果
+CONNECTION_SNAPSHOT_TTL = 0.5
+
+# 受保护的系统进程PID（空闲进程、init/systemd、kthreadd）
+_PROTECTED_PIDS = frozenset({0, 1, 2})
+
+# 受保护的系统进程名称
+_PROTECTED_NAMES = frozenset({
+    'systemd', 'init', 'kthreadd', 'launchd', 'kernel_task',
+    'System', 'System Idle Process', 'smss.exe', 'csrss.exe', 'wininit.exe',
+    'winlogon.exe', 'services.exe', 'lsass.exe',
+})
+
+# 各协议对应的psutil连接类型（IPv4, IPv6），只解析需要的/proc/net文件
+_CONNECTION_KINDS = {
+    Protocol.TCP: ('tcp4', 'tcp6'),
+    Protocol.UDP: ('udp4', 'udp6'),
+}
+
+# Linux下直接解析/proc/net文件的连接类型，其余类型仍使用psutil
+_IS_LINUX = sys.platform == 'linux'
+_PROC_NET_FILES = {
+    'tcp4': ('/proc/net/tcp', socket.AF_INET),
+    'tcp6': ('/proc/net/tcp6', socket.AF_INET6),
+}
+
+# /proc/net/tcp每行的本地地址、远程地址、状态和inode字段
+_PROC_NET_LINE_RE = re.compile(
+    r'^\s*\d+:\s+([0-9A-F]+):([0-9A-F]{4})\s+([0-9A-F]+):([0-9A-F]{4})\s+([0-9A-F]{2})'
+    r'\s+\S+\s+\S+\s+\S+\s+\d+\s+\d+\s+(\d+)',
+    re.MULTILINE
+)
+
+# /proc/net/tcp中十六进制状态码对应的psutil连接状态
+_TCP_STATES = {
+    '01': 'ESTABLISHED', '02': 'SYN_SENT', '03': 'SYN_RECV', '04': 'FIN_WAIT1',
+    '05': 'FIN_WAIT2', '06': 'TIME_WAIT', '07': 'CLOSE', '08': 'CLOSE_WAIT',
+    '09': 'LAST_ACK', '0A': 'LISTEN', '0B': 'CLOSING', '0C': 'NEW_SYN_RECV',
+}
+
+# 与psutil一致的地址元组
+_Address = namedtuple('_Address', ['ip', 'port'])
+
+
+def _decode_proc_address(hex_ip: str, port: int, family: int):
+    """将/proc/net中的十六进制地址转换为地址元组
+
+    内核按本机字节序逐个32位字输出地址，因此按本机字节序重新打包。
+
+    Args:
+        hex_ip: 十六进制IP地址
+        port: 端口号
+        family: 地址族
+
+    Returns:
+        地址元组
+    """
+    words = [int(hex_ip[i:i + 8], 16) for i in range(0, len(hex_ip), 8)]
+    packed = struct.pack(f'={len(words)}I', *words)
+    return _Address(socket.inet_ntop(family, packed), port)
+
+
+class _ProcNetConnection:
+    """从/proc/net解析的TCP连接，属性与psutil连接对象一致
+
+    地址只在访问时解码，按端口分组时不需要转换IP。
+    """
+
+    __slots__ = ('port', 'pid', 'status', '_local_ip', '_remote', '_family')
+
+    def __init__(self, port, pid, status, local_ip, remote, family):
+        self.port = port
+        self.pid = pid
+        self.status = status
+        self._local_ip = local_ip
+        self._remote = remote
+        self._family = family
+
+    @property
+    def laddr(self):
+        return _decode_proc_address(self._local_ip, self.port, self._family)
+
+    @property
+    def raddr(self):
+        hex_ip, port = self._remote
+        if not port:
+            return ()
+        return _decode_proc_address(hex_ip, port, self._family)
+
 
 class ProcessManager:
     """进程管理器
@@ -32,6 +138,19 @@ class ProcessManager:
         """初始化进程管理器"""
         self.logger = get_logger(self.__class__.__name__)
         
+        # 进程信息缓存，键为(PID, 创建时间)，PID被复用时创建时间不同不会误命中
+        self._proc_cache: Dict[Tuple[int, float], ProcessInfo] = {}
+        
+        # 网络连接快照，键为psutil连接类型，值为(获取时间, {端口: [连接对象]})
+        self._conn_snapshot: Dict[str, Tuple[float, Dict[int, list]]] = {}
+        
+        # socket inode到PID的映射快照，(获取时间, {inode: PID})
+        self._inode_snapshot: Optional[Tuple[float, Dict[int, int]]] = None
+        
+        # 受保护进程的PID和名称集合
+        self._protected_pids = _PROTECTED_PIDS
+        self._protected_names = _PROTECTED_NAMES
+        
         # 检查psutil是否可用
         if psutil is None:
             self.logger.warning("psutil模块未安装，某些功能可能不可用")
@@ -51,20 +170,28 @@ class ProcessManager:
         
         try:
             process = psutil.Process(pid)
+            key = (pid, process.create_time())
             
-            # 获取进程信息
-            process_info = ProcessInfo(
-                pid=process.pid,
-                name=process.name(),
-                executable=process.exe() if hasattr(process, 'exe') else None,
-                command_line=' '.join(process.cmdline()) if process.cmdline() else None,
-                status=process.status(),
-                create_time=process.create_time(),
-                memory_usage=process.memory_info().rss if hasattr(process, 'memory_info') else None,
-                cpu_percent=process.cpu_percent() if hasattr(process, 'cpu_percent') else None
-            )
+            # 名称、路径、命令行等属性在进程生命周期内不变，命中缓存时只读取变化的属性
+            cached = self._proc_cache.get(key)
+            if cached is not None:
+                attrs = process.as_dict(attrs=_VOLATILE_ATTRS, ad_value=None)
+                memory_info = attrs['memory_info']
+                return replace(
+                    cached,
+                    status=attrs['status'],
+                    memory_usage=memory_info.rss if memory_info else None,
+                    cpu_percent=attrs['cpu_percent']
+                )
             
-            return process_info
+            # 一次批量读取所需属性，无权限读取的属性置为None
+            attrs = process.as_dict(attrs=_PROCESS_ATTRS, ad_value=None)
+            process_info = self._build_process_info(pid, attrs)
+            
+            if len(self._proc_cache) >= _PROCESS_CACHE_SWEEP_SIZE:
+                self._sweep_process_cache()
+            self._proc_cache[key] = process_info
+            return replace(process_info)
             
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess) as e:
             self.logger.debug(f"获取进程信息失败 (PID: {pid}): {e}")
@@ -73,6 +200,289 @@ class ProcessManager:
             self.logger.error(f"获取进程信息时发生错误 (PID: {pid}): {e}")
             return None
     
+    def _sweep_process_cache(self):
+        """清理缓存中已退出进程的信息"""
+        for key in list(self._proc_cache):
+            if not psutil.pid_exists(key[0]):
+                self._proc_cache.pop(key, None)
+    
+    @staticmethod
+    def _build_process_info(pid: int, attrs: Dict[str, Any]) -> ProcessInfo:
+        """根据批量读取的进程属性创建进程信息对象
+        
+        Args:
+            pid: 进程ID
+            attrs: 进程属性字典（psutil的as_dict或process_iter的info）
+            
+        Returns:
+            进程信息对象
+        """
+        cmdline = attrs.get('cmdline')
+        memory_info = attrs.get('memory_info')
+        
+        return ProcessInfo(
+            pid=pid,
+            name=attrs.get('name'),
+            executable=attrs.get('exe'),
+            command_line=' '.join(cmdline) if cmdline else None,
+            status=attrs.get('status'),
+            create_time=attrs.get('create_time'),
+            memory_usage=memory_info.rss if memory_info else None,
+            cpu_percent=attrs.get('cpu_percent')
+        )
+    
+    def _connections_by_port(self, kind: str, max_age: float) -> Dict[int, list]:
+        """获取指定类型的网络连接，按本地端口分组
+        
+        快照未超过有效期时直接复用，不重新解析/proc/net文件。
+        
+        Args:
+            kind: psutil连接类型
+            max_age: 快照最长有效期（秒）
+            
+        Returns:
+            {端口: [连接对象]}字典
+        """
+        snapshot = self._conn_snapshot.get(kind)
+        now = time.monotonic()
+        if snapshot is not None and now - snapshot[0] <= max_age:
+            return snapshot[1]
+        
+        by_port = None
+        if _IS_LINUX and kind in _PROC_NET_FILES:
+            try:
+                by_port = self._fast_linux_ports(kind, max_age)
+            except OSError as e:
+                self.logger.debug(f"读取/proc/net失败，改用psutil: {e}")
+        
+        if by_port is None:
+            by_port = {}
+            for conn in psutil.net_connections(kind=kind):
+                if conn.laddr:
+                    by_port.setdefault(conn.laddr.port, []).append(conn)
+        
+        self._conn_snapshot[kind] = (now, by_port)
+        return by_port
+    
+    def _fast_linux_ports(self, kind: str, max_age: float) -> Dict[int, list]:
+        """直接解析/proc/net/tcp(6)，按本地端口分组TCP连接
+        
+        只提取端口、地址、状态和inode，不为每个连接创建psutil的命名元组。
+        
+        Args:
+            kind: psutil连接类型（tcp4或tcp6）
+            max_age: inode到PID映射的最长有效期（秒）
+            
+        Returns:
+            {端口: [连接对象]}字典
+            
+        Raises:
+            OSError: 无法读取/proc/net文件
+        """
+        path, family = _PROC_NET_FILES[kind]
+        with open(path, 'r', encoding='ascii') as f:
+            content = f.read()
+        
+        inode_pids = self._inode_pid_map(max_age)
+        by_port = {}
+        for local_ip, local_port, remote_ip, remote_port, state, inode in \
+                _PROC_NET_LINE_RE.findall(content):
+            port = int(local_port, 16)
+            by_port.setdefault(port, []).append(_ProcNetConnection(
+                port, inode_pids.get(int(inode)), _TCP_STATES.get(state, 'NONE'),
+                local_ip, (remote_ip, int(remote_port, 16)), family
+            ))
+        return by_port
+    
+    def _inode_pid_map(self, max_age: float) -> Dict[int, int]:
+        """获取socket inode到PID的映射
+        
+        遍历/proc/*/fd读取符号链接目标，不对文件描述符执行stat()。
+        无权限读取的进程会被跳过，其连接的PID为None。
+        
+        Args:
+            max_age: 映射最长有效期（秒）
+            
+        Returns:
+            {inode: PID}字典
+        """
+        snapshot = self._inode_snapshot
+        now = time.monotonic()
+        if snapshot is not None and now - snapshot[0] <= max_age:
+            return snapshot[1]
+        
+        inode_pids = {}
+        with os.scandir('/proc') as proc_entries:
+            for proc_entry in proc_entries:
+                if not proc_entry.name.isdigit():
+                    continue
+                pid = int(proc_entry.name)
+                try:
+                    with os.scandir(f'/proc/{pid}/fd') as fd_entries:
+                        for fd_entry in fd_entries:
+                            try:
+                                target = os.readlink(fd_entry.path)
+                            except OSError:
+                                continue
+                            if target.startswith('socket:['):
+                                inode_pids[int(target[8:-1])] = pid
+                except OSError:
+                    continue
+        
+        self._inode_snapshot = (now, inode_pids)
+        return inode_pids
+    
+    def _iter_connection_groups(self, protocols: List[Protocol], include_ipv6: bool,
+                                max_age: float):
+        """按协议获取按端口分组的网络连接
+        
+        Args:
+            protocols: 协议类型列表
+            include_ipv6: 是否包含IPv6连接
+            max_age: 快照最长有效期（秒）
+            
+        Yields:
+            (协议类型, {端口: [连接对象]})
+        """
+        for protocol in protocols:
+            kinds = _CONNECTION_KINDS[protocol]
+            if not include_ipv6:
+                kinds = kinds[:1]
+            for kind in kinds:
+                yield protocol, self._connections_by_port(kind, max_age)
+    
+    def get_all_port_usage(self, protocols: Optional[List[Protocol]] = None,
+                           include_ipv6: bool = True,
+                           max_age: float = CONNECTION_SNAPSHOT_TTL) -> Dict[Tuple[int, Protocol], Dict[str, Any]]:
+        """获取所有端口的使用情况
+        
+        Args:
+            protocols: 要查询的协议类型列表，为None时查询TCP和UDP
+            include_ipv6: 是否包含IPv6连接
+            max_age: 可复用的网络连接快照最长有效期（秒），为0时总是重新获取
+            
+        Returns:
+            端口使用信息字典，键为(端口, 协议)元组
+        """
+        if psutil is None:
+            self.logger.error("psutil模块未安装")
+            return {}
+        
+        port_usage = {}
+        try:
+            groups = self._iter_connection_groups(
+                protocols or list(_CONNECTION_KINDS), include_ipv6, max_age
+            )
+            for protocol, by_port in groups:
+                for port, conns in by_port.items():
+                    conn = conns[-1]
+                    port_usage[(port, protocol)] = {
+                        'local_address': f"{conn.laddr.ip}:{conn.laddr.port}",
+                        'remote_address': f"{conn.raddr.ip}:{conn.raddr.port}" if conn.raddr else '',
+                        'pid': conn.pid,
+                        'status': conn.status
+                    }
+        except psutil.AccessDenied:
+            self.logger.warning("没有权限获取网络连接信息")
+        except Exception as e:
+            self.logger.error(f"获取端口使用情况失败: {e}")
+        
+        return port_usage
+    
+    def get_processes_by_port(self, port: int, protocol: Protocol = Protocol.TCP,
+                              include_ipv6: bool = True,
+                              max_age: float = CONNECTION_SNAPSHOT_TTL) -> List[ProcessInfo]:
+        """获取占用指定端口的进程列表
+        
+        Args:
+            port: 端口号
+            protocol: 协议类型
+            include_ipv6: 是否包含IPv6连接
+            max_age: 可复用的网络连接快照最长有效期（秒），为0时总是重新获取
+            
+        Returns:
+            进程信息列表
+        """
+        if psutil is None:
+            self.logger.error("psutil模块未安装")
+            return []
+        
+        try:
+            # 同一进程可能有多个连接使用该端口，按PID去重并保持顺序
+            pids = {}
+            for _, by_port in self._iter_connection_groups([protocol], include_ipv6, max_age):
+                for conn in by_port.get(port, ()):
+                    if conn.pid:
+                        pids[conn.pid] = None
+        except psutil.AccessDenied:
+            self.logger.warning("没有权限获取网络连接信息")
+            return []
+        except Exception as e:
+            self.logger.error(f"获取端口 {port} 的进程失败: {e}")
+            return []
+        
+        processes = []
+        for pid in pids:
+            process_info = self.get_process_info(pid)
+            if process_info:
+                processes.append(process_info)
+        return processes
+    
+    def find_processes_by_name(self, name: str) -> List[ProcessInfo]:
+        """根据进程名称查找进程
+        
+        Args:
+            name: 进程名称
+            
+        Returns:
+            进程信息列表
+        """
+        if psutil is None:
+            self.logger.error("psutil模块未安装")
+            return []
+        
+        # 遍历时只读取名称，匹配的进程再读取完整信息
+        processes = []
+        for process in psutil.process_iter(['name']):
+            if process.info.get('name') != name:
+                continue
+            process_info = self.get_process_info(process.pid)
+            if process_info:
+                processes.append(process_info)
+        return processes
+    
+    def get_all_processes(self) -> List[ProcessInfo]:
+        """获取所有进程列表
+        
+        Returns:
+            进程信息列表
+        """
+        if psutil is None:
+            self.logger.error("psutil模块未安装")
+            return []
+        
+        # process_iter指定属性时会在oneshot()中批量读取
+        return [
+            self._build_process_info(process.pid, process.info)
+            for process in psutil.process_iter(_PROCESS_ATTRS, ad_value=None)
+        ]
+    
+    def is_protected_process(self, pid: int) -> bool:
+        """检查进程是否为受保护的系统进程
+        
+        Args:
+            pid: 进程ID
+            
+        Returns:
+            是否受保护
+        """
+        # 系统核心进程直接按PID判断，不需要读取进程信息
+        if pid in self._protected_pids:
+            return True
+        
+        process_info = self.get_process_info(pid)
+        return process_info is not None and process_info.name in self._protected_names
+    
     def terminate_process(self, pid: int, force: bool = False) -> Tuple[bool, str]:
         """终止进程
         
@@ -86,6 +496,9 @@ class ProcessManager:
         if psutil is None:
             return False, "psutil模块未安装"
         
+        if self.is_protected_process(pid):
+            return False, f"进程 {pid} 是受保护的系统进程，不能终止"
+        
         try:
             process = psutil.Process(pid)
             process_name = process.name()
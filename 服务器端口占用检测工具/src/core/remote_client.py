@@ -395,7 +395,7 @@ class RemoteClient:
             if conn_info.get('pid'):
                 process_info = self._get_remote_process_info(conn_info['pid'])
             
-            return PortInfo(
+            return PortInfo.from_enums(
                 port=port,
                 status=PortStatus.LISTEN,
                 protocol=protocol,
@@ -6,11 +6,12 @@
 负责本地和远程端口扫描功能，支持TCP和UDP协议，多线程扫描提高效率。
 """
 
+import asyncio
 import socket
+import sys
 import threading
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Optional, Tuple, Union
+from typing import Iterable, List, Optional, Set, Tuple, Union
 from datetime import datetime
 
 import psutil
@@ -22,6 +23,42 @@ from ..models.data_models import (
 from ..utils.logger import get_logger
 from ..utils.config import get_config
 
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# io_uring批量连接探测（可选，仅Linux）
+liburing = None
+if sys.platform == 'linux':
+    try:
+        import liburing
+    except ImportError:
+        pass
+
+# 同时进行中的TCP连接探测数量上限
+MAX_INFLIGHT_CONNECTS = 1024
+
+
+def _max_inflight_connects() -> int:
+    """
+    获取同时进行的连接探测数量上限，不超过进程文件描述符软限制的一半
+    
+    Returns:
+        int: 并发连接数上限
+    """
+    if resource is None:
+        return MAX_INFLIGHT_CONNECTS
+    
+    try:
+        soft_limit, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    except (OSError, ValueError):
+        return MAX_INFLIGHT_CONNECTS
+    
+    if soft_limit == resource.RLIM_INFINITY:
+        return MAX_INFLIGHT_CONNECTS
+    return max(1, min(MAX_INFLIGHT_CONNECTS, soft_limit // 2))
+
 
 class PortScanner:
     """端口扫描器"""
@@ -118,38 +155,36 @@ class PortScanner:
         # 获取系统网络连接信息
         connections = self._get_system_connections()
         
-        # 使用线程池进行并发扫描
-        with ThreadPoolExecutor(max_workers=config.max_threads) as executor:
-            # 提交扫描任务
-            future_to_port = {}
-            
-            for port in config.port_range:
-                if self._stop_scan:
-                    break
-                
-                for protocol in config.protocols:
-                    future = executor.submit(
-                        self._scan_single_port,
-                        "localhost",
-                        port,
-                        protocol,
-                        config.timeout,
-                        connections
-                    )
-                    future_to_port[future] = (port, protocol)
+        # 系统连接中没有的TCP端口才需要实际连接探测
+        open_ports = set()
+        if Protocol.TCP in config.protocols:
+            probe_ports = [port for port in config.port_range
+                           if (port, Protocol.TCP) not in connections]
+            open_ports = self._probe_tcp_ports("localhost", probe_ports, config.timeout)
+        
+        for port in config.port_range:
+            if self._stop_scan:
+                break
             
-            # 收集结果
-            for future in as_completed(future_to_port):
-                if self._stop_scan:
-                    break
+            for protocol in config.protocols:
+                if protocol == Protocol.TCP:
+                    if (port, protocol) in connections:
+                        port_info = self._scan_tcp_port("localhost", port, config.timeout, connections)
+                    elif port in open_ports:
+                        # 端口开放，但没有在系统连接中找到，可能是外部服务
+                        port_info = PortInfo.from_enums(
+                            port=port,
+                            status=PortStatus.ESTABLISHED,
+                            protocol=Protocol.TCP,
+                            local_address=f"localhost:{port}"
+                        )
+                    else:
+                        port_info = None
+                else:
+                    port_info = self._scan_udp_port("localhost", port, config.timeout, connections)
                 
-                try:
-                    port_info = future.result()
-                    if port_info:
-                        port_info_list.append(port_info)
-                except Exception as e:
-                    port, protocol = future_to_port[future]
-                    self.logger.debug(f"扫描端口 {port}/{protocol.value} 失败: {e}")
+                if port_info:
+                    port_info_list.append(port_info)
         
         return port_info_list
     
@@ -165,39 +200,175 @@ class PortScanner:
         """
         # 远程扫描需要通过SSH连接执行
         # 这里先实现基本的网络连通性检测
-        port_info_list = []
+        if Protocol.TCP not in config.protocols:
+            return []
         
-        with ThreadPoolExecutor(max_workers=config.max_threads) as executor:
-            future_to_port = {}
-            
-            for port in config.port_range:
+        host = config.remote_config.host
+        open_ports = self._probe_tcp_ports(host, config.port_range, config.timeout)
+        
+        return [
+            PortInfo.from_enums(
+                port=port,
+                status=PortStatus.ESTABLISHED,
+                protocol=Protocol.TCP,
+                local_address=f"{host}:{port}"
+            )
+            for port in config.port_range
+            if port in open_ports
+        ]
+    
+    def _probe_tcp_ports(self, host: str, ports: Iterable[int], timeout: float) -> Set[int]:
+        """
+        并发探测TCP端口是否可以连接
+        
+        所有连接在同一个事件循环中以非阻塞方式进行，不再为每个端口占用一个线程。
+        
+        Args:
+            host: 主机地址
+            ports: 端口号列表
+            timeout: 单个端口的连接超时时间
+        
+        Returns:
+            Set[int]: 可以连接的端口集合
+        """
+        ports = list(ports)
+        if not ports:
+            return set()
+        
+        # 预先解析一次地址，避免每次连接都在线程池中解析主机名
+        try:
+            address = socket.gethostbyname(host)
+        except OSError as e:
+            self.logger.error(f"解析主机 {host} 失败: {e}")
+            return set()
+        
+        if liburing is not None:
+            try:
+                return self._probe_tcp_ports_uring(address, ports, timeout)
+            except OSError as e:
+                # 内核不支持或禁用了io_uring时回退到事件循环
+                self.logger.debug(f"io_uring探测不可用，改用asyncio: {e}")
+        
+        return asyncio.run(self._probe_tcp_ports_async(address, ports, timeout))
+    
+    def _probe_tcp_ports_uring(self, address: str, ports: List[int],
+                               timeout: float) -> Set[int]:
+        """
+        使用io_uring批量探测TCP端口
+        
+        每批端口的连接请求通过一次提交交给内核，每个连接后链接一个超时请求，
+        完成事件通过io_uring_peek_batch_cqe批量收取（由liburing处理完成队列的
+        环形回绕），避免逐个端口的connect系统调用。
+        
+        Args:
+            address: 主机IPv4地址
+            ports: 端口号列表
+            timeout: 单个端口的连接超时时间
+        
+        Returns:
+            Set[int]: 可以连接的端口集合
+        """
+        batch_size = min(_max_inflight_connects(), len(ports))
+        
+        # 每个端口产生连接和超时两个完成事件
+        ring = liburing.Ring()
+        liburing.io_uring_queue_init(batch_size * 2, ring)
+        
+        cqe = liburing.Cqe()
+        cqes = liburing.Cqe(batch_size * 2)
+        ts = liburing.timespec(timeout)
+        open_ports = set()
+        
+        try:
+            for start in range(0, len(ports), batch_size):
                 if self._stop_scan:
                     break
                 
-                for protocol in config.protocols:
-                    future = executor.submit(
-                        self._scan_remote_single_port,
-                        config.remote_config.host,
-                        port,
-                        protocol,
-                        config.timeout
-                    )
-                    future_to_port[future] = (port, protocol)
-            
-            # 收集结果
-            for future in as_completed(future_to_port):
+                # 套接字和地址对象在请求完成前必须保持引用
+                pending = []
+                try:
+                    for port in ports[start:start + batch_size]:
+                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                        addr = liburing.Sockaddr(socket.AF_INET, address, port)
+                        pending.append((sock, addr))
+                        
+                        sqe = liburing.io_uring_get_sqe(ring)
+                        liburing.io_uring_prep_connect(sqe, sock.fileno(), addr)
+                        liburing.io_uring_sqe_set_data64(sqe, port)
+                        liburing.io_uring_sqe_set_flags(sqe, liburing.IOSQE_IO_LINK)
+                        
+                        sqe = liburing.io_uring_get_sqe(ring)
+                        liburing.io_uring_prep_link_timeout(sqe, ts, 0)
+                        liburing.io_uring_sqe_set_data64(sqe, 0)
+                    
+                    liburing.io_uring_submit(ring)
+                    
+                    remaining = len(pending) * 2
+                    while remaining:
+                        # 等待至少一个完成事件，再按环形队列的顺序批量取出
+                        liburing.io_uring_wait_cqe(ring, cqe)
+                        ready = liburing.io_uring_peek_batch_cqe(ring, cqes, remaining)
+                        for index in range(ready):
+                            entry = cqes[index]
+                            port = entry.user_data
+                            if not port:
+                                continue
+                            try:
+                                # 连接失败时读取结果会抛出对应errno的OSError
+                                if entry.res == 0:
+                                    open_ports.add(port)
+                            except OSError:
+                                pass
+                        liburing.io_uring_cq_advance(ring, ready)
+                        remaining -= ready
+                finally:
+                    for sock, _ in pending:
+                        sock.close()
+        finally:
+            liburing.io_uring_queue_exit(ring)
+        
+        return open_ports
+    
+    async def _probe_tcp_ports_async(self, address: str, ports: List[int],
+                                     timeout: float) -> Set[int]:
+        """
+        在事件循环中并发探测TCP端口
+        
+        Args:
+            address: 主机IP地址
+            ports: 端口号列表
+            timeout: 单个端口的连接超时时间
+        
+        Returns:
+            Set[int]: 可以连接的端口集合
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(min(_max_inflight_connects(), len(ports)))
+        
+        async def probe(port: int) -> Optional[int]:
+            async with semaphore:
                 if self._stop_scan:
-                    break
+                    return None
                 
+                sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sock.setblocking(False)
                 try:
-                    port_info = future.result()
-                    if port_info:
-                        port_info_list.append(port_info)
-                except Exception as e:
-                    port, protocol = future_to_port[future]
-                    self.logger.debug(f"扫描远程端口 {port}/{protocol.value} 失败: {e}")
+                    await asyncio.wait_for(loop.sock_connect(sock, (address, port)), timeout)
+                    return port
+                except (OSError, asyncio.TimeoutError):
+                    return None
+                finally:
+                    sock.close()
         
-        return port_info_list
+        results = await asyncio.gather(*(probe(port) for port in ports), return_exceptions=True)
+        
+        open_ports = set()
+        for port, result in zip(ports, results):
+            if isinstance(result, BaseException):
+                self.logger.debug(f"扫描端口 {port}/tcp 失败: {result}")
+            elif result is not None:
+                open_ports.add(result)
+        return open_ports
     
     def _scan_single_port(self, host: str, port: int, protocol: Protocol, 
                          timeout: float, connections: dict) -> Optional[PortInfo]:
@@ -242,7 +413,7 @@ class PortScanner:
         connection_key = (port, Protocol.TCP)
         if connection_key in connections:
             conn_info = connections[connection_key]
-            return PortInfo(
+            return PortInfo.from_enums(
                 port=port,
                 status=PortStatus.LISTEN,
                 protocol=Protocol.TCP,
@@ -262,7 +433,7 @@ class PortScanner:
             
             if result == 0:
                 # 端口开放，但没有在系统连接中找到，可能是外部服务
-                return PortInfo(
+                return PortInfo.from_enums(
                     port=port,
                     status=PortStatus.ESTABLISHED,
                     protocol=Protocol.TCP,
@@ -294,7 +465,7 @@ class PortScanner:
         connection_key = (port, Protocol.UDP)
         if connection_key in connections:
             conn_info = connections[connection_key]
-            return PortInfo(
+            return PortInfo.from_enums(
                 port=port,
                 status=PortStatus.LISTEN,
                 protocol=Protocol.UDP,
@@ -328,7 +499,7 @@ class PortScanner:
                 result = sock.connect_ex((host, port))
                 
                 if result == 0:
-                    return PortInfo(
+                    return PortInfo.from_enums(
                         port=port,
                         status=PortStatus.ESTABLISHED,
                         protocol=Protocol.TCP,
@@ -342,10 +513,13 @@ class PortScanner:
         
         return None
     
-    def _get_system_connections(self) -> dict:
+    def _get_system_connections(self, target_port: Optional[int] = None) -> dict:
         """
         获取系统网络连接信息
         
+        Args:
+            target_port: 只获取该端口的连接，为None时获取所有连接
+        
         Returns:
             dict: 连接信息字典，键为(端口, 协议)元组
         """
@@ -354,7 +528,8 @@ class PortScanner:
         try:
             # 获取所有网络连接
             for conn in psutil.net_connections(kind='inet'):
-                if conn.laddr:
+                # 先按端口过滤，避免为无关连接读取进程信息
+                if conn.laddr and (target_port is None or conn.laddr.port == target_port):
                     port = conn.laddr.port
                     protocol = Protocol.TCP if conn.type == socket.SOCK_STREAM else Protocol.UDP
                     
@@ -410,7 +585,7 @@ class PortScanner:
             Optional[PortInfo]: 端口信息
         """
         if host in ['localhost', '127.0.0.1', '0.0.0.0']:
-            connections = self._get_system_connections()
+            connections = self._get_system_connections(port)
             return self._scan_single_port(host, port, protocol, timeout, connections)
         else:
             return self._scan_remote_single_port(host, port, protocol, timeout)
@@ -9,6 +9,8 @@
 import sys
 import os
 import argparse
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # 添加项目根目录到Python路径
@@ -17,40 +19,99 @@ sys.path.insert(0, str(project_root))
 
 from src.utils.logger import get_logger
 from src.utils.config import get_config_manager
-from src.models.data_models import ScanConfig, ScanType, Protocol, RemoteConfig
-from src.core.scanner import PortScanner
-from src.core.process_manager import ProcessManager
-from src.cli.command_line import CommandLineInterface
 
+# 缓存的日志管理器实例，首次使用时创建
+_logger = None
 
-def check_dependencies(gui_mode: bool = False):
+# 需要探测的依赖库
+DEPENDENCIES = ("psutil", "tkinter", "paramiko")
+
+# 快速解析支持的选项: 选项 -> (参数属性名, 类型转换函数)，转换函数为None表示开关选项
+FAST_OPTIONS = {
+    '--gui': ('gui', None),
+    '--cli': ('cli', None),
+    '--port': ('port', int),
+    '-p': ('port', int),
+    '--range': ('range', str),
+    '-r': ('range', str),
+    '--ports': ('ports', str),
+    '--kill': ('kill', int),
+    '-k': ('kill', int),
+    '--remote': ('remote', str),
+    '--user': ('user', str),
+    '-u': ('user', str),
+    '--password': ('password', str),
+    '--key': ('key', str),
+    '--ssh-port': ('ssh_port', int),
+    '--protocol': ('protocol', str),
+    '--timeout': ('timeout', float),
+    '--threads': ('threads', int),
+    '--format': ('format', str),
+    '--output': ('output', str),
+    '-o': ('output', str),
+    '--verbose': ('verbose', None),
+    '-v': ('verbose', None),
+    '--quiet': ('quiet', None),
+    '-q': ('quiet', None),
+    '--config': ('config', str)
+}
+
+# 快速解析时需要校验的可选值
+FAST_CHOICES = {
+    'protocol': ('tcp', 'udp', 'both'),
+    'format': ('table', 'json', 'csv')
+}
+
+# 互斥的参数组
+EXCLUSIVE_GROUPS = (
+    ('gui', 'cli'),
+    ('port', 'range', 'ports')
+)
+
+
+def probe_dependencies() -> dict:
+    """并发探测依赖库是否可用
+    
+    Returns:
+        dict: 依赖库名称到是否可用的映射
+    """
+    with ThreadPoolExecutor(max_workers=len(DEPENDENCIES)) as executor:
+        futures = {
+            name: executor.submit(importlib.util.find_spec, name)
+            for name in DEPENDENCIES
+        }
+        return {name: future.result() is not None for name, future in futures.items()}
+
+
+def check_dependencies(gui_mode: bool = False, remote_mode: bool = False,
+                       available: dict = None):
     """检查必要的依赖库
     
+    只通过find_spec查找模块是否存在，不执行模块导入，避免启动时加载重量级依赖。
+    
     Args:
         gui_mode: 是否为GUI模式
+        remote_mode: 是否需要远程连接功能
+        available: 预先探测的依赖可用性，为None时立即探测
     
     Returns:
         bool: 如果所有依赖都可用返回True
     """
+    if available is None:
+        available = probe_dependencies()
+    
     missing_deps = []
     
     # 检查psutil
-    try:
-        import psutil
-    except ImportError:
+    if not available["psutil"]:
         missing_deps.append("psutil")
     
     # 只在GUI模式下检查tkinter
-    if gui_mode:
-        try:
-            import tkinter
-        except ImportError:
-            missing_deps.append("tkinter")
+    if gui_mode and not available["tkinter"]:
+        missing_deps.append("tkinter")
     
-    # 检查paramiko（远程连接需要）
-    try:
-        import paramiko
-    except ImportError:
+    # 检查paramiko（只有远程连接需要）
+    if remote_mode and not available["paramiko"]:
         missing_deps.append("paramiko")
     
     if missing_deps:
@@ -67,11 +128,24 @@ def check_dependencies(gui_mode: bool = False):
     return True
 
 
+def _get_logger():
+    """
+    获取缓存的日志管理器实例
+    
+    Returns:
+        LogManager: 日志管理器实例
+    """
+    global _logger
+    if _logger is None:
+        _logger = get_logger()
+    return _logger
+
+
 def setup_logging():
     """
     设置日志系统
     """
-    logger = get_logger()
+    logger = _get_logger()
     logger.info("服务器端口占用检测工具启动")
     return logger
 
@@ -234,6 +308,90 @@ def parse_arguments():
     return parser.parse_args()
 
 
+def default_arguments(gui: bool = False):
+    """
+    构建与parse_arguments默认值一致的参数对象
+    
+    用于无参数或仅有--gui参数的常见启动方式，跳过argparse解析器的构建。
+    
+    Args:
+        gui: 是否明确指定了GUI模式
+    
+    Returns:
+        argparse.Namespace: 默认参数
+    """
+    return argparse.Namespace(
+        gui=gui,
+        cli=False,
+        port=None,
+        range=None,
+        ports=None,
+        kill=None,
+        remote=None,
+        user=None,
+        password=None,
+        key=None,
+        ssh_port=22,
+        protocol='both',
+        timeout=1.0,
+        threads=50,
+        format='table',
+        output=None,
+        verbose=False,
+        quiet=False,
+        config=None
+    )
+
+
+def fast_parse_arguments(argv):
+    """
+    快速解析常见的命令行参数
+    
+    单次遍历参数列表并查表处理选项，不构建argparse解析器。遇到未知选项、
+    帮助/版本选项、参数值无效或互斥冲突时返回None，由parse_arguments
+    负责完整解析和错误提示。
+    
+    Args:
+        argv: 命令行参数列表（不含程序名）
+    
+    Returns:
+        Optional[argparse.Namespace]: 解析后的参数，无法快速解析时返回None
+    """
+    args = default_arguments()
+    seen = set()
+    
+    index = 0
+    while index < len(argv):
+        option = FAST_OPTIONS.get(argv[index])
+        if option is None:
+            return None
+        
+        dest, convert = option
+        if convert is None:
+            setattr(args, dest, True)
+        else:
+            index += 1
+            if index >= len(argv) or argv[index].startswith('-'):
+                return None
+            try:
+                setattr(args, dest, convert(argv[index]))
+            except ValueError:
+                return None
+        
+        seen.add(dest)
+        index += 1
+    
+    for dest, choices in FAST_CHOICES.items():
+        if getattr(args, dest) not in choices:
+            return None
+    
+    for group in EXCLUSIVE_GROUPS:
+        if len(seen.intersection(group)) > 1:
+            return None
+    
+    return args
+
+
 def should_use_gui(args):
     """
     判断是否应该使用GUI模式
@@ -279,7 +437,7 @@ def run_gui_mode(args):
     try:
         from src.gui.main_window import MainWindow
         
-        logger = get_logger()
+        logger = _get_logger()
         logger.info("启动GUI模式")
         
         app = MainWindow()
@@ -290,7 +448,7 @@ def run_gui_mode(args):
         print("请检查tkinter是否正确安装")
         sys.exit(1)
     except Exception as e:
-        logger = get_logger()
+        logger = _get_logger()
         logger.error(f"GUI模式运行失败: {e}")
         print(f"GUI模式启动失败: {e}")
         sys.exit(1)
@@ -304,7 +462,9 @@ def run_cli_mode(args):
         args: 命令行参数
     """
     try:
-        logger = get_logger()
+        from src.cli.command_line import CommandLineInterface
+        
+        logger = _get_logger()
         logger.info("启动命令行模式")
         
         cli = CommandLineInterface()
@@ -312,7 +472,7 @@ def run_cli_mode(args):
         sys.exit(exit_code)
         
     except Exception as e:
-        logger = get_logger()
+        logger = _get_logger()
         logger.error(f"命令行模式运行失败: {e}")
         print(f"命令行模式运行失败: {e}")
         sys.exit(1)
@@ -323,14 +483,25 @@ def main():
     主函数
     """
     try:
-        # 解析命令行参数
-        args = parse_arguments()
+        # 解析命令行参数（常见参数形式无需构建完整的argparse解析器）
+        args = fast_parse_arguments(sys.argv[1:])
+        if args is None:
+            args = parse_arguments()
         
-        # 判断运行模式
-        gui_mode = should_use_gui(args)
+        # 依赖探测和配置文件检查在后台线程进行，与主线程上的图形界面探测重叠
+        # （Tk窗口只能在主线程创建，因此图形界面探测不放入线程池）
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            deps_future = executor.submit(probe_dependencies)
+            config_future = executor.submit(os.path.exists, args.config) if args.config else None
+            
+            # 判断运行模式
+            gui_mode = should_use_gui(args)
+            available = deps_future.result()
+            config_exists = config_future.result() if config_future else False
         
-        # 检查依赖
-        if not check_dependencies(gui_mode):
+        # 检查依赖（GUI中包含远程扫描功能，同样需要paramiko）
+        remote_mode = gui_mode or args.remote is not None
+        if not check_dependencies(gui_mode, remote_mode, available):
             sys.exit(1)
         
         # 设置日志
@@ -345,7 +516,7 @@ def main():
         # 加载自定义配置文件
         if args.config:
             config_manager = get_config_manager()
-            if os.path.exists(args.config):
+            if config_exists:
                 logger.info(f"加载配置文件: {args.config}")
                 # 这里可以添加自定义配置文件加载逻辑
             else:
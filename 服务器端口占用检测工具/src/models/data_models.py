@@ -6,12 +6,23 @@
 定义了端口扫描工具中使用的所有数据结构，包括端口信息、远程配置、扫描结果等。
 """
 
+import re
+import sys
+import time
 from dataclasses import dataclass
-from typing import Optional, List
+from itertools import compress
+from typing import Optional, List, Union
 from datetime import datetime
 from enum import Enum
 
 
+# 大量创建的数据类使用__slots__减少内存占用（Python 3.10起支持）
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# 端口字符串中逗号分隔的单个端口或端口范围，格式不正确的部分不会被匹配
+_PORT_SPEC_RE = re.compile(r'(?:^|,)\s*(\d+)(?:\s*-\s*(\d+))?\s*(?=,|$)')
+
+
 class PortStatus(Enum):
     """端口状态枚举"""
     LISTEN = "LISTEN"          # 监听状态
@@ -21,6 +32,13 @@ class PortStatus(Enum):
     UNKNOWN = "UNKNOWN"        # 未知状态
 
 
+# 视为占用的端口状态
+_OCCUPIED_STATUSES = frozenset((PortStatus.LISTEN, PortStatus.ESTABLISHED))
+
+# 占用标记列取反用的转换表
+_INVERT_MASK = bytes.maketrans(b'\x00\x01', b'\x01\x00')
+
+
 class Protocol(Enum):
     """协议类型枚举"""
     TCP = "TCP"
@@ -33,7 +51,7 @@ class ScanType(Enum):
     REMOTE = "remote"  # 远程扫描
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class ProcessInfo:
     """进程信息数据类"""
     pid: int
@@ -53,15 +71,15 @@ class ProcessInfo:
             return self.command_line.split()
         return None
     
-    def __post_init__(self):
-        """初始化后处理"""
+    @property
+    def runtime_seconds(self) -> Optional[float]:
+        """运行时间（秒）"""
         if self.create_time:
-            # 计算运行时间
-            import time
-            self.runtime_seconds = time.time() - self.create_time
+            return time.time() - self.create_time
+        return None
 
 
-@dataclass
+@dataclass(frozen=True, **_SLOTS)
 class PortInfo:
     """端口信息数据类"""
     port: int                           # 端口号
@@ -78,21 +96,47 @@ class PortInfo:
         # 确保状态是PortStatus枚举类型
         if isinstance(self.status, str):
             try:
-                self.status = PortStatus(self.status)
+                status = PortStatus(self.status)
             except ValueError:
-                self.status = PortStatus.UNKNOWN
+                status = PortStatus.UNKNOWN
+            object.__setattr__(self, 'status', status)
         
         # 确保协议是Protocol枚举类型
         if isinstance(self.protocol, str):
             try:
-                self.protocol = Protocol(self.protocol.upper())
+                protocol = Protocol(self.protocol.upper())
             except ValueError:
-                self.protocol = Protocol.TCP
+                protocol = Protocol.TCP
+            object.__setattr__(self, 'protocol', protocol)
+
+    @classmethod
+    def from_enums(cls, port: int, status: PortStatus, protocol: Protocol,
+                   local_address: str, remote_address: str = "",
+                   pid: Optional[int] = None, process_name: Optional[str] = None,
+                   process_info: Optional[ProcessInfo] = None) -> 'PortInfo':
+        """使用已是枚举类型的状态和协议快速创建端口信息
+        
+        跳过__post_init__中的类型转换，供扫描器等已持有枚举值的调用方使用。
+        
+        Returns:
+            PortInfo: 端口信息对象
+        """
+        obj = cls.__new__(cls)
+        setattr_ = object.__setattr__
+        setattr_(obj, 'port', port)
+        setattr_(obj, 'status', status)
+        setattr_(obj, 'protocol', protocol)
+        setattr_(obj, 'local_address', local_address)
+        setattr_(obj, 'remote_address', remote_address)
+        setattr_(obj, 'pid', pid)
+        setattr_(obj, 'process_name', process_name)
+        setattr_(obj, 'process_info', process_info)
+        return obj
 
     @property
     def is_occupied(self) -> bool:
         """判断端口是否被占用"""
-        return self.status in [PortStatus.LISTEN, PortStatus.ESTABLISHED]
+        return self.status in _OCCUPIED_STATUSES
 
     @property
     def display_status(self) -> str:
@@ -163,9 +207,24 @@ class ScanResult:
             except ValueError:
                 self.scan_type = ScanType.LOCAL
         
+        # 按列保存每个端口是否被占用（1为占用），统计和筛选都基于该列完成
+        self._mask_source = None
+        occupied_mask = self._get_occupied_mask()
+        
         # 计算统计信息
-        self.total_ports = len(self.port_info_list)
-        self.occupied_ports = sum(1 for port in self.port_info_list if port.is_occupied)
+        self.total_ports = len(occupied_mask)
+        self.occupied_ports = occupied_mask.count(1)
+
+    def _get_occupied_mask(self) -> bytes:
+        """获取端口占用列，端口列表被替换或长度变化后重新计算"""
+        port_info_list = self.port_info_list
+        if (self._mask_source is not port_info_list
+                or len(self._occupied_mask) != len(port_info_list)):
+            self._occupied_mask = bytes(
+                port.status in _OCCUPIED_STATUSES for port in port_info_list
+            )
+            self._mask_source = port_info_list
+        return self._occupied_mask
 
     @property
     def free_ports(self) -> int:
@@ -181,17 +240,21 @@ class ScanResult:
 
     def get_occupied_ports(self) -> List[PortInfo]:
         """获取被占用的端口列表"""
-        return [port for port in self.port_info_list if port.is_occupied]
+        return list(compress(self.port_info_list, self._get_occupied_mask()))
 
     def get_free_ports(self) -> List[PortInfo]:
         """获取空闲的端口列表"""
-        return [port for port in self.port_info_list if not port.is_occupied]
+        free_mask = self._get_occupied_mask().translate(_INVERT_MASK)
+        return list(compress(self.port_info_list, free_mask))
 
 
-@dataclass
+@dataclass(frozen=True)
 class ScanConfig:
-    """扫描配置数据类"""
-    port_range: List[int]           # 端口范围列表
+    """扫描配置数据类
+    
+    创建后不可修改，端口数量和验证结果在初始化时计算并缓存。
+    """
+    port_range: Union[List[int], range]  # 端口范围列表，连续端口可使用range
     scan_type: ScanType = ScanType.LOCAL  # 扫描类型
     timeout: float = 1.0            # 单个端口扫描超时时间
     max_threads: int = 50           # 最大线程数
@@ -201,24 +264,31 @@ class ScanConfig:
     def __post_init__(self):
         """初始化后处理"""
         if self.protocols is None:
-            self.protocols = [Protocol.TCP, Protocol.UDP]
+            object.__setattr__(self, 'protocols', [Protocol.TCP, Protocol.UDP])
         
         # 验证端口范围
-        valid_ports = []
-        for port in self.port_range:
-            if 1 <= port <= 65535:
-                valid_ports.append(port)
-        self.port_range = sorted(list(set(valid_ports)))  # 去重并排序
+        port_range = self.port_range
+        if isinstance(port_range, range) and port_range.step == 1:
+            # 连续端口保持range对象，只裁剪到有效端口，不展开为列表
+            port_range = range(max(port_range.start, 1), min(port_range.stop, 65536))
+        else:
+            # 去重并排序
+            port_range = sorted({port for port in port_range if 1 <= port <= 65535})
+        object.__setattr__(self, 'port_range', port_range)
         
         # 验证线程数
         if self.max_threads <= 0:
-            self.max_threads = 50
+            object.__setattr__(self, 'max_threads', 50)
         elif self.max_threads > 200:
-            self.max_threads = 200
+            object.__setattr__(self, 'max_threads', 200)
         
         # 验证超时时间
         if self.timeout <= 0:
-            self.timeout = 1.0
+            object.__setattr__(self, 'timeout', 1.0)
+        
+        # 缓存端口数量和验证结果
+        object.__setattr__(self, '_port_count', len(self.port_range))
+        object.__setattr__(self, '_validation', self._compute_validation())
 
     @classmethod
     def from_port_string(cls, port_string: str, **kwargs) -> 'ScanConfig':
@@ -234,38 +304,43 @@ class ScanConfig:
         Returns:
             ScanConfig: 扫描配置对象
         """
-        ports = []
+        spans = []
         
-        # 分割逗号分隔的部分
-        parts = [part.strip() for part in port_string.split(',')]
+        # 一次正则扫描取出所有端口和端口范围，跳过格式不正确的部分
+        for match in _PORT_SPEC_RE.finditer(port_string):
+            start = int(match.group(1))
+            end = int(match.group(2) or start)
+            # 先裁剪到有效端口范围，避免为超出范围的端口生成列表
+            start = max(start, 1)
+            end = min(end, 65535)
+            if start <= end:
+                spans.append(range(start, end + 1))
         
-        for part in parts:
-            if '-' in part:
-                # 处理端口范围
-                try:
-                    start, end = map(int, part.split('-', 1))
-                    if start <= end:
-                        ports.extend(range(start, end + 1))
-                except ValueError:
-                    continue
-            else:
-                # 处理单个端口
-                try:
-                    port = int(part)
-                    ports.append(port)
-                except ValueError:
-                    continue
+        # 只有一个连续范围时直接使用range对象，不展开为列表
+        if len(spans) == 1:
+            return cls(port_range=spans[0], **kwargs)
         
+        ports = []
+        for span in spans:
+            ports.extend(span)
         return cls(port_range=ports, **kwargs)
 
     @property
     def port_count(self) -> int:
         """获取端口总数"""
-        return len(self.port_range)
+        return self._port_count
 
     def validate(self) -> tuple[bool, str]:
         """验证配置是否有效
         
+        Returns:
+            tuple: (是否有效, 错误信息)
+        """
+        return self._validation
+
+    def _compute_validation(self) -> tuple[bool, str]:
+        """计算配置验证结果
+        
         Returns:
             tuple: (是否有效, 错误信息)
         """
@@ -6,14 +6,52 @@
 负责应用程序配置文件的读取、写入和管理，支持默认配置和用户自定义配置。
 """
 
+import atexit
 import json
 import os
+import threading
+import time
+import weakref
+from collections import ChainMap
 from pathlib import Path
-from typing import Dict, Any, Optional, List
-from dataclasses import asdict
+from types import MappingProxyType
+from typing import Dict, Any, Optional, List, Tuple
 
 from ..models.data_models import RemoteConfig
 
+# 配置缓存未命中标记
+_MISSING = object()
+
+# 配置修改后延迟写入文件的时间（秒），连续修改只写入一次
+_FLUSH_DELAY = 0.5
+
+# 所有配置管理器实例（弱引用），进程退出时统一写入尚未保存的修改
+_LIVE_MANAGERS: "weakref.WeakSet[ConfigManager]" = weakref.WeakSet()
+
+# 默认配置（只读，需要修改时复制一份）
+_DEFAULT_CONFIG = MappingProxyType({
+    "scan_timeout": 5,
+    "max_port_range": 1000,
+    "log_level": "INFO",
+    "thread_count": 50,
+    "auto_save_results": True,
+    "default_protocols": ["TCP", "UDP"],
+    "window_width": 900,
+    "window_height": 700,
+    "theme": "default",
+    "font_size": 12,
+    "auto_refresh": False,
+    "refresh_interval": 30,
+    "connection_timeout": 10,
+    "command_timeout": 30,
+    "max_retries": 3,
+    "retry_delay": 1,
+    "log_file": "logs/port_scanner.log",
+    "max_file_size": 10485760,
+    "backup_count": 5,
+    "console_output": True
+})
+
 
 class ConfigManager:
     """配置管理器"""
@@ -31,12 +69,41 @@ class ConfigManager:
             project_root = Path(__file__).parent.parent.parent
             self.config_dir = project_root / "config"
         
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+        os.makedirs(self.config_dir, exist_ok=True)
         self.config_file = self.config_dir / "settings.json"
         self.remote_config_file = self.config_dir / "remote_servers.json"
         
+        # 缓存配置文件是否存在，避免重复stat，写入文件后更新
+        self._config_exists = os.path.isfile(self.config_file)
+        self._remote_exists = os.path.isfile(self.remote_config_file)
+        
+        # 点号分隔键的拆分结果缓存和已解析配置值缓存
+        self._key_cache: Dict[str, tuple] = {}
+        self._value_cache: Dict[str, Any] = {}
+        
+        # 用户配置只保存与默认配置不同的覆盖项，查找时回退到默认配置
+        self._user_overrides: Dict[str, Any] = {}
+        self._config = ChainMap(self._user_overrides, _DEFAULT_CONFIG)
+        
+        # 远程配置列表及按(主机, 用户名)建立的索引，首次增删时从文件加载
+        self._remote_configs: Optional[List[RemoteConfig]] = None
+        self._remote_index: Dict[Tuple[str, str], RemoteConfig] = {}
+        
+        # 未写入文件的修改标记、写入截止时间和后台写入线程
+        self._dirty = False
+        self._flush_deadline: Optional[float] = None
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._flush_wake = threading.Event()
+        
+        # 实例被回收时唤醒写入线程，使其发现弱引用失效后退出
+        weakref.finalize(self, self._flush_wake.set)
+        
         # 加载配置
         self._load_config()
+        
+        # 进程退出时写入尚未保存的修改
+        _LIVE_MANAGERS.add(self)
     
     def get_default_config(self) -> Dict[str, Any]:
         """获取默认配置
@@ -44,65 +111,76 @@ class ConfigManager:
         Returns:
             默认配置字典
         """
-        return {
-            "scan_timeout": 5,
-            "max_port_range": 1000,
-            "log_level": "INFO",
-            "thread_count": 50,
-            "auto_save_results": True,
-            "default_protocols": ["TCP", "UDP"],
-            "window_width": 900,
-            "window_height": 700,
-            "theme": "default",
-            "font_size": 12,
-            "auto_refresh": False,
-            "refresh_interval": 30,
-            "connection_timeout": 10,
-            "command_timeout": 30,
-            "max_retries": 3,
-            "retry_delay": 1,
-            "log_file": "logs/port_scanner.log",
-            "max_file_size": 10485760,
-            "backup_count": 5,
-            "console_output": True
-        }
+        return dict(_DEFAULT_CONFIG)
     
     def _load_config(self) -> None:
         """加载配置文件"""
+        self._invalidate_cache()
+        self._user_overrides.clear()
         try:
-            if self.config_file.exists():
+            # 配置文件不存在时使用默认配置，首次修改配置后才创建文件
+            if self._config_exists:
                 with open(self.config_file, 'r', encoding='utf-8') as f:
-                    self._config = json.load(f)
+                    self._user_overrides.update(json.load(f))
                 print(f"配置文件加载成功: {self.config_file}")
-            else:
-                # 如果配置文件不存在，创建默认配置
-                self._config = self.get_default_config()
-                self._save_config(self._config)
-                print(f"创建默认配置文件: {self.config_file}")
         except Exception as e:
             print(f"加载配置文件失败: {e}，使用默认配置")
-            self._config = self.get_default_config()
+            self._user_overrides.clear()
+    
+    def _mark_dirty(self) -> None:
+        """标记配置已修改，并在停止修改一段时间后由后台线程写入文件"""
+        with self._flush_lock:
+            self._dirty = True
+            self._flush_deadline = time.monotonic() + _FLUSH_DELAY
+            
+            # 整个实例只使用一个写入线程，连续修改只推迟截止时间
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=_flush_loop,
+                    args=(weakref.ref(self), self._flush_wake),
+                    name="ConfigFlusher",
+                    daemon=True
+                )
+                self._flusher.start()
+            else:
+                self._flush_wake.set()
     
-    def _merge_config(self, default: Dict[str, Any], user: Dict[str, Any]) -> Dict[str, Any]:
+    def _flush_delay(self) -> Optional[float]:
         """
-        合并默认配置和用户配置
-        
-        Args:
-            default: 默认配置
-            user: 用户配置
+        距离延迟写入截止时间的秒数（在写入线程中调用）
         
         Returns:
-            Dict[str, Any]: 合并后的配置
+            Optional[float]: 剩余秒数，没有待写入的修改时返回None
+        """
+        deadline = self._flush_deadline
+        if deadline is None:
+            return None
+        return deadline - time.monotonic()
+    
+    def flush(self) -> bool:
         """
-        result = default.copy()
+        将尚未保存的配置修改写入文件
         
-        for key, value in user.items():
-            if key in result and isinstance(result[key], dict) and isinstance(value, dict):
-                result[key] = self._merge_config(result[key], value)
-            else:
-                result[key] = value
+        写入失败时保留修改标记，下次修改配置或进程退出时重试。
         
-        return result
+        Returns:
+            bool: 是否保存成功
+        """
+        with self._flush_lock:
+            self._flush_deadline = None
+            
+            if not self._dirty:
+                return True
+            
+            if not self._save_config(self._user_overrides):
+                return False
+            
+            self._dirty = False
+            return True
+    
+    def _invalidate_cache(self) -> None:
+        """配置内容变化后清空已解析的配置值缓存"""
+        self._value_cache.clear()
     
     def _save_config(self, config: Dict[str, Any]) -> bool:
         """
@@ -115,10 +193,14 @@ class ConfigManager:
             bool: 是否保存成功
         """
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2, ensure_ascii=False)
+            # 一次性编码为UTF-8后以二进制写入，避免文本模式逐段编码
+            content = json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8')
+            with open(self.config_file, 'wb') as f:
+                f.write(content)
+            self._config_exists = True
             return True
-        except IOError as e:
+        except (OSError, TypeError, ValueError) as e:
+            # TypeError/ValueError: 配置中包含无法序列化为JSON的值
             print(f"保存配置文件失败: {e}")
             return False
     
@@ -133,15 +215,27 @@ class ConfigManager:
         Returns:
             Any: 配置值
         """
-        keys = key.split('.')
+        # 平铺键直接查找
+        if '.' not in key:
+            return self._config.get(key, default)
+        
+        value = self._value_cache.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        
+        keys = self._key_cache.get(key)
+        if keys is None:
+            keys = self._key_cache[key] = tuple(key.split('.'))
         value = self._config
         
         try:
             for k in keys:
                 value = value[k]
-            return value
         except (KeyError, TypeError):
             return default
+        
+        self._value_cache[key] = value
+        return value
     
     def set(self, key: str, value: Any) -> bool:
         """
@@ -155,19 +249,24 @@ class ConfigManager:
             bool: 是否设置成功
         """
         keys = key.split('.')
-        config = self._config
-        
-        # 导航到目标位置
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
         
-        # 设置值
-        config[keys[-1]] = value
+        # 修改与flush写入文件互斥，避免序列化到一半的配置被修改
+        with self._flush_lock:
+            config = self._user_overrides
+            
+            # 导航到目标位置
+            for k in keys[:-1]:
+                if k not in config:
+                    config[k] = {}
+                config = config[k]
+            
+            # 设置值
+            config[keys[-1]] = value
+            self._invalidate_cache()
         
-        # 保存配置
-        return self._save_config(self._config)
+        # 延迟保存配置
+        self._mark_dirty()
+        return True
     
     def get_section(self, section: str) -> Dict[str, Any]:
         """
@@ -192,11 +291,13 @@ class ConfigManager:
         Returns:
             bool: 是否更新成功
         """
-        if section not in self._config:
-            self._config[section] = {}
-        
-        self._config[section].update(values)
-        return self._save_config(self._config)
+        with self._flush_lock:
+            section_values = dict(self._config.get(section, {}))
+            section_values.update(values)
+            self._user_overrides[section] = section_values
+            self._invalidate_cache()
+        self._mark_dirty()
+        return True
     
     def reset_to_default(self) -> bool:
         """
@@ -205,8 +306,11 @@ class ConfigManager:
         Returns:
             bool: 是否重置成功
         """
-        self._config = self._default_config.copy()
-        return self._save_config(self._config)
+        with self._flush_lock:
+            self._user_overrides.clear()
+            self._invalidate_cache()
+        self._mark_dirty()
+        return True
     
     def load_remote_configs(self) -> List[RemoteConfig]:
         """
@@ -216,7 +320,7 @@ class ConfigManager:
             List[RemoteConfig]: 远程配置列表
         """
         try:
-            if self.remote_config_file.exists():
+            if self._remote_exists:
                 with open(self.remote_config_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 
@@ -250,15 +354,29 @@ class ConfigManager:
             # 转换为字典列表，但不保存密码
             config_dicts = []
             for config in configs:
-                config_dict = asdict(config)
+                # RemoteConfig只包含基础类型字段，直接构建字典避免asdict的递归深拷贝
                 # 出于安全考虑，不保存密码到配置文件
-                config_dict['password'] = ''
+                config_dict = {
+                    'host': config.host,
+                    'username': config.username,
+                    'password': '',
+                    'private_key_path': config.private_key_path,
+                    'port': config.port,
+                    'timeout': config.timeout,
+                    'name': config.name
+                }
                 config_dicts.append(config_dict)
             
             data = {'remote_servers': config_dicts}
             
-            with open(self.remote_config_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            content = json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+            with open(self.remote_config_file, 'wb') as f:
+                f.write(content)
+            self._remote_exists = True
+            
+            # 外部保存的列表与索引不一致，下次增删时重新加载
+            if configs is not self._remote_configs:
+                self._remote_configs = None
             
             return True
         except IOError as e:
@@ -275,21 +393,23 @@ class ConfigManager:
         Returns:
             bool: 是否添加成功
         """
-        configs = self.load_remote_configs()
+        configs = self._get_remote_configs()
         
         # 检查是否已存在相同的配置
-        for existing in configs:
-            if existing.host == config.host and existing.username == config.username:
-                # 更新现有配置
-                existing.password = config.password
-                existing.private_key_path = config.private_key_path
-                existing.port = config.port
-                existing.timeout = config.timeout
-                existing.name = config.name
-                return self.save_remote_configs(configs)
-        
-        # 添加新配置
-        configs.append(config)
+        key = (config.host, config.username)
+        existing = self._remote_index.get(key)
+        if existing is not None:
+            # 更新现有配置
+            existing.password = config.password
+            existing.private_key_path = config.private_key_path
+            existing.port = config.port
+            existing.timeout = config.timeout
+            existing.name = config.name
+        else:
+            # 添加新配置
+            configs.append(config)
+            self._remote_index[key] = config
+        
         return self.save_remote_configs(configs)
     
     def remove_remote_config(self, host: str, username: str) -> bool:
@@ -303,15 +423,29 @@ class ConfigManager:
         Returns:
             bool: 是否删除成功
         """
-        configs = self.load_remote_configs()
+        configs = self._get_remote_configs()
         
         # 查找并删除匹配的配置
-        for i, config in enumerate(configs):
-            if config.host == host and config.username == username:
-                configs.pop(i)
-                return self.save_remote_configs(configs)
+        existing = self._remote_index.pop((host, username), None)
+        if existing is None:
+            return False
+        
+        configs[:] = [config for config in configs if config is not existing]
+        return self.save_remote_configs(configs)
+    
+    def _get_remote_configs(self) -> List[RemoteConfig]:
+        """
+        获取缓存的远程配置列表，必要时从文件加载并重建索引
         
-        return False
+        Returns:
+            List[RemoteConfig]: 远程配置列表
+        """
+        if self._remote_configs is None:
+            self._remote_configs = self.load_remote_configs()
+            self._remote_index = {}
+            for config in self._remote_configs:
+                self._remote_index.setdefault((config.host, config.username), config)
+        return self._remote_configs
     
     @property
     def config_file_path(self) -> str:
@@ -325,6 +459,42 @@ class ConfigManager:
 
 
 # 全局配置管理器实例
+def _flush_loop(manager_ref: "weakref.ReferenceType[ConfigManager]",
+                wake: threading.Event) -> None:
+    """
+    配置延迟写入线程主循环
+    
+    没有待写入的修改时一直等待，有修改时等到截止时间再写入；等待期间不持有
+    配置管理器的强引用，实例被回收后线程退出。
+    
+    Args:
+        manager_ref: 配置管理器的弱引用
+        wake: 唤醒事件
+    """
+    while True:
+        wake.clear()
+        manager = manager_ref()
+        if manager is None:
+            return
+        
+        delay = manager._flush_delay()
+        if delay is not None and delay <= 0:
+            if not manager.flush():
+                print(f"延迟保存配置失败，修改将在下次保存时重试: {manager.config_file}")
+            continue
+        
+        del manager
+        wake.wait(delay)
+
+
+def _flush_all_managers() -> None:
+    """进程退出时写入所有配置管理器中尚未保存的修改"""
+    for manager in list(_LIVE_MANAGERS):
+        manager.flush()
+
+
+atexit.register(_flush_all_managers)
+
 _config_manager = None
 
 
@@ -6,16 +6,28 @@
 提供统一的日志记录功能，支持文件日志和控制台日志，包含日志轮转和格式化。
 """
 
+import atexit
+import functools
 import logging
 import logging.handlers
 import os
+import queue
 import sys
+import threading
+import time
+from collections import deque
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 from datetime import datetime
 
 from .config import get_config
 
+# 项目根目录，相对路径的日志文件基于此目录
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+# 已创建过的日志目录，重新加载配置时不再重复创建
+_ENSURED_DIRS: set = set()
+
 
 class ColoredFormatter(logging.Formatter):
     """带颜色的日志格式化器（用于控制台输出）"""
@@ -30,16 +42,233 @@ class ColoredFormatter(logging.Formatter):
         'RESET': '\033[0m'      # 重置
     }
     
+    def __init__(self, *args, use_color: bool = True, **kwargs):
+        """
+        初始化格式化器
+        
+        Args:
+            use_color: 是否添加颜色，输出不是终端时应关闭
+        """
+        super().__init__(*args, **kwargs)
+        self._use_color = use_color
+        self._reset = self.COLORS['RESET']
+        
+        # 按 levelno // 10 索引的颜色前缀（NOTSET, DEBUG, INFO, WARNING, ERROR, CRITICAL）
+        self._colors_by_levelno = ('',) + tuple(
+            self.COLORS[level] for level in ('DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL')
+        )
+    
     def format(self, record):
         """格式化日志记录"""
         # 获取原始格式化结果
         log_message = super().format(record)
+        if not self._use_color:
+            return log_message
         
         # 添加颜色
-        color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-        reset = self.COLORS['RESET']
+        index = record.levelno // 10
+        prefix = self._colors_by_levelno[index] if 0 < index < 6 else ''
+        return prefix + log_message + self._reset if prefix else log_message
+
+
+class _FastLogQueue:
+    """日志队列
+    
+    多个线程写入、队列监听器单线程读取的轻量队列，用deque加一个锁和事件实现，
+    提供QueueHandler/QueueListener所需的put_nowait/get接口，比queue.Queue的
+    锁加条件变量开销更小。
+    
+    监听器阻塞等待新记录时，队列空闲超过idle_timeout秒会在监听器线程中调用一次
+    on_idle，用于把处理器缓冲区中的日志写入文件。
+    """
+    
+    __slots__ = ('_buf', '_event', '_lock', '_on_idle', '_idle_timeout')
+    
+    def __init__(self, maxsize: Optional[int] = None,
+                 on_idle: Optional[Callable[[], None]] = None,
+                 idle_timeout: float = 0.2):
+        """
+        初始化日志队列
+        
+        Args:
+            maxsize: 最大长度，超出时丢弃最早的记录；为None时不限制
+            on_idle: 队列空闲时的回调
+            idle_timeout: 触发空闲回调前等待的时间（秒）
+        """
+        self._buf = deque(maxlen=maxsize)
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._on_idle = on_idle
+        self._idle_timeout = idle_timeout
+    
+    def put_nowait(self, item):
+        """放入一条记录"""
+        with self._lock:
+            self._buf.append(item)
+            self._event.set()
+    
+    def put(self, item, block=True, timeout=None):
+        """放入一条记录（不会阻塞）"""
+        self.put_nowait(item)
+    
+    def get(self, block=True, timeout=None):
+        """
+        取出一条记录
+        
+        Raises:
+            queue.Empty: 非阻塞或等待超时时队列为空
+        """
+        # 每次取记录最多触发一次空闲回调，之后一直等待到有新记录
+        idle_pending = self._on_idle is not None
+        while True:
+            with self._lock:
+                if self._buf:
+                    item = self._buf.popleft()
+                    if not self._buf:
+                        self._event.clear()
+                    return item
+                self._event.clear()
+            
+            if not block:
+                raise queue.Empty
+            
+            if idle_pending and timeout is None:
+                if not self._event.wait(self._idle_timeout):
+                    idle_pending = False
+                    self._on_idle()
+                continue
+            
+            if not self._event.wait(timeout):
+                raise queue.Empty
+    
+    def get_nowait(self):
+        """非阻塞取出一条记录"""
+        return self.get(block=False)
+    
+    def empty(self) -> bool:
+        """队列是否为空"""
+        return not self._buf
+
+
+class _RawFileStream:
+    """只暴露文件描述符的最小文件流，写入由处理器直接通过os.write完成"""
+    
+    __slots__ = ('_fd',)
+    
+    def __init__(self, fd: int):
+        self._fd = fd
+    
+    def fileno(self) -> int:
+        """获取文件描述符"""
+        return self._fd
+    
+    def flush(self):
+        """数据已直接写入文件描述符，无需刷新"""
+    
+    def close(self):
+        """关闭文件描述符"""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class BufferedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """带写缓冲的轮转文件处理器
+    
+    将格式化后的日志编码后暂存在内存中，缓冲区达到大小阈值、距上次写入超过时间
+    阈值或遇到ERROR及以上级别的日志时，再通过os.write一次性写入文件描述符，
+    减少小块写入的系统调用并跳过Python文件对象的多层缓冲和加锁。
+    时间阈值只在有新记录时检查，没有新记录时由日志队列的空闲回调调用flush，
+    因此缓冲的日志最迟在队列空闲FLUSH_INTERVAL秒后写入文件。
+    处理器只应由队列监听器这一个线程写入。
+    """
+    
+    # 缓冲区大小阈值（字节）
+    BUFFER_SIZE = 64 * 1024
+    # 写入时间间隔阈值（秒）
+    FLUSH_INTERVAL = 0.2
+    
+    def __init__(self, *args, **kwargs):
+        """初始化处理器，参数与RotatingFileHandler相同"""
+        self._buffer = bytearray()
+        self._last_flush = time.monotonic()
+        self._written = 0
+        super().__init__(*args, **kwargs)
+        
+        if self.encoding and self.encoding != 'locale':
+            self._encoding = self.encoding
+        else:
+            self._encoding = 'utf-8'
+        
+        # 记录当前文件已写入的大小，轮转判断不再重复格式化日志记录
+        if os.path.isfile(self.baseFilename):
+            self._written = os.path.getsize(self.baseFilename)
+    
+    def _open(self):
+        """以追加方式打开日志文件的原始文件描述符"""
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        return _RawFileStream(os.open(self.baseFilename, flags, 0o644))
+    
+    def shouldRollover(self, record):
+        """根据已写入（含缓冲区中）的大小判断是否需要轮转"""
+        return self.maxBytes > 0 and self._written >= self.maxBytes
+    
+    def doRollover(self):
+        """执行日志轮转并重置已写入大小"""
+        super().doRollover()
+        self._written = 0
+    
+    def emit(self, record):
+        """将日志记录写入缓冲区，必要时写入文件"""
+        try:
+            if self.shouldRollover(record):
+                self._write_buffer()
+                self.doRollover()
+            
+            data = (self.format(record) + self.terminator).encode(self._encoding)
+            self._buffer += data
+            self._written += len(data)
+            
+            if (len(self._buffer) >= self.BUFFER_SIZE
+                    or record.levelno >= logging.ERROR
+                    or time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+                self._write_buffer()
+        except Exception:
+            self.handleError(record)
+    
+    def flush(self):
+        """将缓冲区中的日志写入文件"""
+        self.acquire()
+        try:
+            self._write_buffer()
+        finally:
+            self.release()
+    
+    def close(self):
+        """写入缓冲区中剩余的日志后关闭文件（延迟打开时文件可能尚未打开）"""
+        self.flush()
+        super().close()
+    
+    def _write_buffer(self):
+        """一次性写入缓冲区内容（调用方需持有处理器锁）"""
+        if self._buffer:
+            if self.stream is None:
+                self.stream = self._open()
+            
+            fd = self.stream.fileno()
+            view = memoryview(self._buffer)
+            while view:
+                view = view[os.write(fd, view):]
+            view.release()
+            self._buffer.clear()
         
-        return f"{color}{log_message}{reset}"
+        self._last_flush = time.monotonic()
+
+
+def _flush_handlers(handlers: tuple):
+    """刷新处理器的缓冲区（由队列监听器线程调用）"""
+    for handler in handlers:
+        handler.flush()
 
 
 class LogManager:
@@ -56,6 +285,18 @@ class LogManager:
         self.logger = logging.getLogger(name)
         self._initialized = False
         
+        # 日志队列监听器，在独立线程中执行文件和控制台输出
+        self._listener: Optional[logging.handlers.QueueListener] = None
+        
+        # 监听器实际输出的处理器快照
+        self._handlers: tuple = ()
+        
+        # 当前生效的日志配置，用于判断重新加载时配置是否变化
+        self._config_fingerprint: Optional[tuple] = None
+        
+        # 退出时输出队列中剩余的日志；重新加载配置会重建监听器，只在这里注册一次
+        atexit.register(self._stop_listener)
+        
         # 初始化日志配置
         self._setup_logger()
     
@@ -66,15 +307,13 @@ class LogManager:
         if self._initialized:
             return
         
-        # 清除现有的处理器
+        # 停止现有的监听器并清除现有的处理器
+        self._stop_listener()
         self.logger.handlers.clear()
         
         # 获取配置
-        log_level = get_config('logging.log_level', 'INFO')
-        log_file = get_config('logging.log_file', 'logs/port_scanner.log')
-        max_file_size = get_config('logging.max_file_size', 10485760)  # 10MB
-        backup_count = get_config('logging.backup_count', 5)
-        console_output = get_config('logging.console_output', True)
+        fingerprint = self._read_log_config()
+        log_level, log_file, max_file_size, backup_count, console_output = fingerprint
         
         # 设置日志级别
         level = getattr(logging, log_level.upper(), logging.INFO)
@@ -84,10 +323,11 @@ class LogManager:
         log_path = Path(log_file)
         if not log_path.is_absolute():
             # 相对路径，基于项目根目录
-            project_root = Path(__file__).parent.parent.parent
-            log_path = project_root / log_file
+            log_path = _PROJECT_ROOT / log_file
         
-        log_path.parent.mkdir(parents=True, exist_ok=True)
+        if log_path.parent not in _ENSURED_DIRS:
+            log_path.parent.mkdir(parents=True, exist_ok=True)
+            _ENSURED_DIRS.add(log_path.parent)
         
         # 文件日志格式
         file_formatter = logging.Formatter(
@@ -98,12 +338,16 @@ class LogManager:
         # 控制台日志格式
         console_formatter = ColoredFormatter(
             fmt='%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%H:%M:%S'
+            datefmt='%H:%M:%S',
+            use_color=getattr(sys.stdout, 'isatty', lambda: False)()
         )
         
+        # 实际输出的处理器由队列监听器在后台线程中调用
+        handlers = []
+        
         # 添加文件处理器（带轮转）
         try:
-            file_handler = logging.handlers.RotatingFileHandler(
+            file_handler = BufferedRotatingFileHandler(
                 filename=str(log_path),
                 maxBytes=max_file_size,
                 backupCount=backup_count,
@@ -111,7 +355,7 @@ class LogManager:
             )
             file_handler.setFormatter(file_formatter)
             file_handler.setLevel(level)
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
         except (OSError, IOError) as e:
             print(f"创建文件日志处理器失败: {e}")
         
@@ -120,13 +364,58 @@ class LogManager:
             console_handler = logging.StreamHandler(sys.stdout)
             console_handler.setFormatter(console_formatter)
             console_handler.setLevel(level)
-            self.logger.addHandler(console_handler)
+            handlers.append(console_handler)
+        
+        # 日志器只挂载队列处理器，记录日志时只需入队，不阻塞在文件I/O上；
+        # 队列空闲时由监听器线程写出处理器缓冲区中的日志
+        log_queue = _FastLogQueue(
+            on_idle=functools.partial(_flush_handlers, tuple(handlers)),
+            idle_timeout=BufferedRotatingFileHandler.FLUSH_INTERVAL
+        )
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        self._handlers = tuple(handlers)
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
         
         # 防止日志传播到根日志器
         self.logger.propagate = False
         
+        self._config_fingerprint = fingerprint
         self._initialized = True
     
+    @staticmethod
+    def _read_log_config() -> tuple:
+        """
+        读取生效的日志配置（一次取出整个logging配置节）
+        
+        Returns:
+            tuple: (日志级别, 日志文件, 文件大小上限, 备份数量, 是否输出到控制台)
+        """
+        log_config = get_config('logging', {}) or {}
+        return (
+            log_config.get('log_level', 'INFO'),
+            log_config.get('log_file', 'logs/port_scanner.log'),
+            log_config.get('max_file_size', 10485760),  # 10MB
+            log_config.get('backup_count', 5),
+            log_config.get('console_output', True)
+        )
+    
+    def _stop_listener(self):
+        """
+        停止队列监听器，输出队列中剩余的日志并关闭处理器
+        """
+        listener = self._listener
+        if listener is None:
+            return
+        
+        self._listener = None
+        self._handlers = ()
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+    
     def get_logger(self) -> logging.Logger:
         """
         获取日志器实例
@@ -169,7 +458,9 @@ class LogManager:
             port_count: 端口数量
             target: 扫描目标
         """
-        self.info(f"开始{scan_type}扫描 - 目标: {target}, 端口数量: {port_count}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info("开始%s扫描 - 目标: %s, 端口数量: %d", scan_type, target, port_count)
     
     def log_scan_result(self, scan_type: str, total_ports: int, occupied_ports: int, 
                        duration: float, target: str = "localhost"):
@@ -183,10 +474,11 @@ class LogManager:
             duration: 扫描耗时
             target: 扫描目标
         """
-        self.info(
-            f"{scan_type}扫描完成 - 目标: {target}, "
-            f"总端口: {total_ports}, 占用: {occupied_ports}, "
-            f"耗时: {duration:.2f}秒"
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info(
+            "%s扫描完成 - 目标: %s, 总端口: %d, 占用: %d, 耗时: %.2f秒",
+            scan_type, target, total_ports, occupied_ports, duration
         )
     
     def log_process_kill(self, pid: int, port: int, success: bool, process_name: str = ""):
@@ -199,9 +491,13 @@ class LogManager:
             success: 是否成功
             process_name: 进程名称
         """
-        status = "成功" if success else "失败"
-        process_info = f"({process_name})" if process_name else ""
-        self.info(f"终止进程{status} - PID: {pid}, 端口: {port} {process_info}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info(
+            "终止进程%s - PID: %s, 端口: %s %s",
+            "成功" if success else "失败", pid, port,
+            "(%s)" % process_name if process_name else ""
+        )
     
     def log_remote_connection(self, host: str, username: str, success: bool, error: str = ""):
         """
@@ -214,9 +510,10 @@ class LogManager:
             error: 错误信息
         """
         if success:
-            self.info(f"远程连接成功 - {username}@{host}")
-        else:
-            self.error(f"远程连接失败 - {username}@{host}: {error}")
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info("远程连接成功 - %s@%s", username, host)
+        elif self.logger.isEnabledFor(logging.ERROR):
+            self.logger.error("远程连接失败 - %s@%s: %s", username, host, error)
     
     def log_config_change(self, key: str, old_value: str, new_value: str):
         """
@@ -227,7 +524,9 @@ class LogManager:
             old_value: 旧值
             new_value: 新值
         """
-        self.info(f"配置变更 - {key}: {old_value} -> {new_value}")
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        self.logger.info("配置变更 - %s: %s -> %s", key, old_value, new_value)
     
     def set_level(self, level: str):
         """
@@ -237,10 +536,13 @@ class LogManager:
             level: 日志级别字符串
         """
         log_level = getattr(logging, level.upper(), logging.INFO)
+        if log_level == self.logger.level:
+            return
+        
         self.logger.setLevel(log_level)
         
         # 更新所有处理器的级别
-        for handler in self.logger.handlers:
+        for handler in self._handlers:
             handler.setLevel(log_level)
         
         self.info(f"日志级别已设置为: {level.upper()}")
@@ -248,7 +550,18 @@ class LogManager:
     def reload_config(self):
         """
         重新加载日志配置
+        
+        配置未变化且日志级别未被临时修改时不重建处理器。
         """
+        fingerprint = self._read_log_config()
+        if self._initialized and fingerprint == self._config_fingerprint:
+            level = getattr(logging, fingerprint[0].upper(), logging.INFO)
+            if self.logger.level == level:
+                return
+        
+        global _cached_logger
+        _cached_logger = None
+        
         self._initialized = False
         self._setup_logger()
         self.info("日志配置已重新加载")
@@ -257,6 +570,9 @@ class LogManager:
 # 全局日志管理器实例
 _log_manager = None
 
+# 便捷函数使用的日志器缓存
+_cached_logger: Optional[logging.Logger] = None
+
 
 def get_logger(name: Optional[str] = None) -> LogManager:
     """
@@ -268,38 +584,52 @@ def get_logger(name: Optional[str] = None) -> LogManager:
     Returns:
         LogManager: 日志管理器实例
     """
-    global _log_manager
+    global _log_manager, _cached_logger
     if _log_manager is None or (name and name != _log_manager.logger_name):
         _log_manager = LogManager(name or "port_scanner")
+        _cached_logger = None
     return _log_manager
 
 
+def _get_cached() -> logging.Logger:
+    """
+    获取便捷函数使用的日志器，首次调用时缓存
+    
+    Returns:
+        logging.Logger: 日志器实例
+    """
+    global _cached_logger
+    if _cached_logger is None:
+        _cached_logger = get_logger().get_logger()
+    return _cached_logger
+
+
 # 便捷函数
 def debug(message: str, *args, **kwargs):
     """记录调试日志的便捷函数"""
-    get_logger().debug(message, *args, **kwargs)
+    (_cached_logger or _get_cached()).debug(message, *args, **kwargs)
 
 
 def info(message: str, *args, **kwargs):
     """记录信息日志的便捷函数"""
-    get_logger().info(message, *args, **kwargs)
+    (_cached_logger or _get_cached()).info(message, *args, **kwargs)
 
 
 def warning(message: str, *args, **kwargs):
     """记录警告日志的便捷函数"""
-    get_logger().warning(message, *args, **kwargs)
+    (_cached_logger or _get_cached()).warning(message, *args, **kwargs)
 
 
 def error(message: str, *args, **kwargs):
     """记录错误日志的便捷函数"""
-    get_logger().error(message, *args, **kwargs)
+    (_cached_logger or _get_cached()).error(message, *args, **kwargs)
 
 
 def critical(message: str, *args, **kwargs):
     """记录严重错误日志的便捷函数"""
-    get_logger().critical(message, *args, **kwargs)
+    (_cached_logger or _get_cached()).critical(message, *args, **kwargs)
 
 
 def exception(message: str, *args, **kwargs):
     """记录异常日志的便捷函数"""
-    get_logger().exception(message, *args, **kwargs)
\ No newline at end of file
+    (_cached_logger or _get_cached()).exception(message, *args, **kwargs)
\ No newline at end of file
@@ -8,6 +8,10 @@
 
 import sys
 import os
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
 
 # 添加项目根目录到Python路径
@@ -41,9 +45,18 @@ def test_project_structure():
         'Makefile'
     ]
     
+    # 一次遍历目录收集现有文件，避免逐个文件stat
+    present_files = set()
+    for top_dir in ('src', 'tests'):
+        for dir_path, _, file_names in os.walk(top_dir):
+            for file_name in file_names:
+                present_files.add(os.path.join(dir_path, file_name).replace(os.sep, '/'))
+    with os.scandir('.') as entries:
+        present_files.update(entry.name for entry in entries if entry.is_file())
+    
     missing_files = []
     for file_path in required_files:
-        if not Path(file_path).exists():
+        if file_path not in present_files:
             missing_files.append(file_path)
         else:
             print(f"✓ {file_path}")
@@ -140,8 +153,12 @@ def test_config_manager():
         print(f"✗ 配置管理器测试失败: {e}")
         return False
 
-def test_imports():
-    """测试模块导入"""
+def test_imports(deep: bool = False):
+    """测试模块导入
+    
+    Args:
+        deep: 是否实际导入模块，否则只查找模块是否存在
+    """
     print("\n测试模块导入...")
     
     modules_to_test = [
@@ -154,15 +171,34 @@ def test_imports():
     ]
     
     success_count = 0
-    for module_name, description in modules_to_test:
-        try:
-            __import__(module_name)
-            print(f"✓ {description} ({module_name})")
-            success_count += 1
-        except ImportError as e:
-            print(f"✗ {description} ({module_name}): {e}")
-        except Exception as e:
-            print(f"⚠ {description} ({module_name}): {e}")
+    if not deep:
+        # 只查找模块文件，不执行导入（不加载psutil、paramiko等依赖）
+        for module_name, description in modules_to_test:
+            if importlib.util.find_spec(module_name) is None:
+                print(f"✗ {description} ({module_name}): 模块不存在")
+            else:
+                print(f"✓ {description} ({module_name})")
+                success_count += 1
+        
+        print(f"\n模块查找结果: {success_count}/{len(modules_to_test)} 成功（使用 --deep 实际导入模块）")
+        return success_count == len(modules_to_test)
+    
+    # 并发导入各模块，按原顺序输出结果
+    with ThreadPoolExecutor(max_workers=len(modules_to_test)) as executor:
+        futures = [
+            (executor.submit(importlib.import_module, module_name), module_name, description)
+            for module_name, description in modules_to_test
+        ]
+        
+        for future, module_name, description in futures:
+            try:
+                future.result()
+                print(f"✓ {description} ({module_name})")
+                success_count += 1
+            except ImportError as e:
+                print(f"✗ {description} ({module_name}): {e}")
+            except Exception as e:
+                print(f"⚠ {description} ({module_name}): {e}")
     
     print(f"\n模块导入结果: {success_count}/{len(modules_to_test)} 成功")
     return success_count == len(modules_to_test)
@@ -189,8 +225,12 @@ def test_file_permissions():
     
     return True
 
-def main():
-    """主测试函数"""
+def main(deep: bool = False):
+    """主测试函数
+    
+    Args:
+        deep: 是否实际导入各模块进行测试
+    """
     print("="*60)
     print("服务器端口占用检测工具 - 基础功能测试")
     print("="*60)
@@ -199,7 +239,7 @@ def main():
         ('项目结构', test_project_structure),
         ('数据模型', test_data_models),
         ('配置管理', test_config_manager),
-        ('模块导入', test_imports),
+        ('模块导入', partial(test_imports, deep=deep)),
         ('文件权限', test_file_permissions)
     ]
     
@@ -239,5 +279,5 @@ def main():
     return success_rate == 100
 
 if __name__ == '__main__':
-    success = main()
+    success = main(deep='--deep' in sys.argv[1:])
     sys.exit(0 if success else 1)
\ No newline at end of file
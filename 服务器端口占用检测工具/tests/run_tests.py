@@ -9,12 +9,73 @@
 import unittest
 import sys
 import os
+import io
+import importlib.util
+import multiprocessing
 from pathlib import Path
 
 # 添加项目根目录到Python路径
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# 测试输出缓冲达到该大小时写出一次，兼顾系统调用次数和进度反馈
+OUTPUT_FLUSH_SIZE = 64 * 1024
+
+
+def _iter_tests(suite):
+    """递归展开测试套件中的所有测试用例
+    
+    无法加载的模块由unittest生成占位用例，其错误已记录在loader.errors中，这里跳过。
+    """
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            yield from _iter_tests(test)
+        elif (isinstance(test, unittest.TestCase)
+                and type(test).__module__.partition('.')[0] != 'unittest'):
+            yield test
+
+
+def _split_shards(test_suite, shard_count):
+    """按测试类把测试用例分片
+    
+    同一测试类的用例放在同一分片中按原顺序执行，避免共用端口等资源的用例在
+    不同进程中相互干扰。
+    
+    Returns:
+        list: 每个分片的测试用例ID列表
+    """
+    groups = {}
+    for test in _iter_tests(test_suite):
+        groups.setdefault(type(test), []).append(test.id())
+    
+    shards = [[] for _ in range(min(shard_count, len(groups)) or 1)]
+    for index, test_ids in enumerate(groups.values()):
+        shards[index % len(shards)].extend(test_ids)
+    return shards
+
+
+def _run_shard(test_ids):
+    """在子进程中运行一个分片的测试，返回可序列化的结果摘要"""
+    loader = unittest.TestLoader()
+    suite = unittest.TestSuite(loader.loadTestsFromName(test_id) for test_id in test_ids)
+    
+    stream = io.StringIO()
+    runner = unittest.TextTestRunner(
+        verbosity=2,
+        stream=stream,
+        descriptions=True,
+        failfast=False
+    )
+    result = runner.run(suite)
+    
+    return {
+        'tests_run': result.testsRun,
+        'failures': [(str(test), traceback) for test, traceback in result.failures],
+        'errors': [(str(test), traceback) for test, traceback in result.errors],
+        'skipped': len(result.skipped),
+        'output': stream.getvalue()
+    }
+
 
 def run_all_tests():
     """运行所有测试用例"""
@@ -26,47 +87,53 @@ def run_all_tests():
     test_dir = Path(__file__).parent
     loader = unittest.TestLoader()
     
-    # 加载所有测试模块
-    test_suite = unittest.TestSuite()
-    
-    # 手动添加测试模块
-    test_modules = [
-        'test_scanner',
-        'test_process_manager'
-    ]
+    # 一次遍历测试目录，发现并加载所有测试模块
+    test_suite = loader.discover(
+        start_dir=str(test_dir),
+        pattern='test_*.py',
+        top_level_dir=str(project_root)
+    )
     
-    for module_name in test_modules:
-        try:
-            module = __import__(module_name)
-            suite = loader.loadTestsFromModule(module)
-            test_suite.addTest(suite)
-            print(f"✓ 加载测试模块: {module_name}")
-        except ImportError as e:
-            print(f"✗ 无法加载测试模块 {module_name}: {e}")
+    loaded_modules = sorted({type(test).__module__ for test in _iter_tests(test_suite)})
+    for module_name in loaded_modules:
+        print(f"✓ 加载测试模块: {module_name}")
+    for error in loader.errors:
+        print(f"✗ 无法加载测试模块: {error.strip().splitlines()[-1]}")
     
     print("\n" + "-"*60)
     print("开始运行测试...")
     print("-"*60)
     
-    # 运行测试
-    runner = unittest.TextTestRunner(
-        verbosity=2,
-        stream=sys.stdout,
-        descriptions=True,
-        failfast=False
-    )
+    # 按测试类分片，在多个进程中并行运行
+    shards = _split_shards(test_suite, os.cpu_count() or 1)
+    with multiprocessing.Pool(processes=len(shards)) as pool:
+        shard_results = pool.map(_run_shard, shards)
     
-    result = runner.run(test_suite)
+    # 合并各分片的结果，输出先写入缓冲区再批量写到标准输出
+    failure_list = []
+    error_list = [('加载测试模块', error) for error in loader.errors]
+    total_tests = 0
+    skipped = 0
+    output = io.StringIO()
+    for shard_result in shard_results:
+        output.write(shard_result['output'])
+        if output.tell() >= OUTPUT_FLUSH_SIZE:
+            sys.stdout.write(output.getvalue())
+            output = io.StringIO()
+        total_tests += shard_result['tests_run']
+        failure_list.extend(shard_result['failures'])
+        error_list.extend(shard_result['errors'])
+        skipped += shard_result['skipped']
+    sys.stdout.write(output.getvalue())
+    sys.stdout.flush()
     
     # 输出测试结果摘要
     print("\n" + "="*60)
     print("测试结果摘要")
     print("="*60)
     
-    total_tests = result.testsRun
-    failures = len(result.failures)
-    errors = len(result.errors)
-    skipped = len(result.skipped) if hasattr(result, 'skipped') else 0
+    failures = len(failure_list)
+    errors = len(error_list)
     success = total_tests - failures - errors - skipped
     
     print(f"总测试数: {total_tests}")
@@ -77,13 +144,15 @@ def run_all_tests():
     
     if failures > 0:
         print("\n失败的测试:")
-        for test, traceback in result.failures:
-            print(f"  - {test}: {traceback.split('\n')[-2] if traceback else 'Unknown'}")
+        for test, traceback in failure_list:
+            reason = traceback.strip().splitlines()[-1] if traceback else 'Unknown'
+            print(f"  - {test}: {reason}")
     
     if errors > 0:
         print("\n错误的测试:")
-        for test, traceback in result.errors:
-            print(f"  - {test}: {traceback.split('\n')[-2] if traceback else 'Unknown'}")
+        for test, traceback in error_list:
+            reason = traceback.strip().splitlines()[-1] if traceback else 'Unknown'
+            print(f"  - {test}: {reason}")
     
     # 计算成功率
     if total_tests > 0:
@@ -99,7 +168,7 @@ def run_all_tests():
     
     print("="*60)
     
-    return result.wasSuccessful()
+    return failures == 0 and errors == 0
 
 
 def run_specific_test(test_name):
@@ -129,13 +198,13 @@ def check_dependencies():
     required_modules = ['psutil', 'paramiko']
     missing_modules = []
     
+    # 只查找模块是否存在，不执行导入
     for module in required_modules:
-        try:
-            __import__(module)
-            print(f"✓ {module}")
-        except ImportError:
+        if importlib.util.find_spec(module) is None:
             print(f"✗ {module} (缺失)")
             missing_modules.append(module)
+        else:
+            print(f"✓ {module}")
     
     if missing_modules:
         print(f"\n⚠️  缺少依赖模块: {', '.join(missing_modules)}")
@@ -10,7 +10,8 @@ import unittest
 import os
 import time
 import subprocess
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch, MagicMock, mock_open
 
 import sys
 from pathlib import Path
@@ -23,32 +24,55 @@ from src.models.data_models import ProcessInfo, Protocol
 from src.core.process_manager import ProcessManager
 
 
+def fake_proc(pid, **info):
+    """创建process_iter返回的进程桩对象，info为预读取的进程属性"""
+    return SimpleNamespace(pid=pid, info=info)
+
+
+def fake_conn(port, pid, ip='0.0.0.0', status='LISTEN'):
+    """创建net_connections返回的连接桩对象"""
+    return SimpleNamespace(laddr=SimpleNamespace(ip=ip, port=port), raddr=(),
+                           pid=pid, status=status)
+
+
 class TestProcessManager(unittest.TestCase):
     """进程管理器测试类"""
     
+    @classmethod
+    def setUpClass(cls):
+        """创建所有测试共用的进程管理器"""
+        cls.process_manager = ProcessManager()
+    
     def setUp(self):
         """测试前准备"""
-        self.process_manager = ProcessManager()
+        # 清空缓存，避免前一个测试的快照影响当前测试
+        self.process_manager._proc_cache.clear()
+        self.process_manager._conn_snapshot.clear()
     
     def tearDown(self):
         """测试后清理"""
         pass
     
-    @patch('src.core.process_manager.psutil.process_iter')
-    def test_get_process_info_by_pid(self, mock_process_iter):
+    @patch('src.core.process_manager.psutil.Process')
+    def test_get_process_info_by_pid(self, mock_process_class):
         """测试根据PID获取进程信息"""
         # 模拟进程对象
+        mock_memory_info = MagicMock()
+        mock_memory_info.rss = 1024 * 1024  # 1MB
+        
         mock_process = MagicMock()
         mock_process.pid = 1234
-        mock_process.name.return_value = "test_process"
-        mock_process.exe.return_value = "/usr/bin/test_process"
-        mock_process.cmdline.return_value = ["test_process", "--arg1", "--arg2"]
-        mock_process.status.return_value = "running"
-        mock_process.create_time.return_value = time.time() - 3600  # 1小时前创建
-        mock_process.memory_info.return_value.rss = 1024 * 1024  # 1MB
-        mock_process.cpu_percent.return_value = 5.5
+        mock_process.as_dict.return_value = {
+            'name': "test_process",
+            'exe': "/usr/bin/test_process",
+            'cmdline': ["test_process", "--arg1", "--arg2"],
+            'status': "running",
+            'create_time': time.time() - 3600,  # 1小时前创建
+            'memory_info': mock_memory_info,
+            'cpu_percent': 5.5
+        }
         
-        mock_process_iter.return_value = [mock_process]
+        mock_process_class.return_value = mock_process
         
         # 测试获取进程信息
         process_info = self.process_manager.get_process_info(1234)
@@ -58,26 +82,60 @@ class TestProcessManager(unittest.TestCase):
         self.assertEqual(process_info.name, "test_process")
         self.assertEqual(process_info.executable, "/usr/bin/test_process")
         self.assertEqual(process_info.status, "running")
+        self.assertEqual(process_info.command_line, "test_process --arg1 --arg2")
+        self.assertEqual(process_info.memory_usage, 1024 * 1024)
+        mock_process_class.assert_called_once_with(1234)
     
-    @patch('src.core.process_manager.psutil.process_iter')
-    def test_get_process_info_not_found(self, mock_process_iter):
+    @patch('src.core.process_manager.psutil.Process')
+    def test_get_process_info_cached(self, mock_process_class):
+        """测试重复获取进程信息时复用不变的属性"""
+        mock_process = MagicMock()
+        mock_process.create_time.return_value = 1000.0
+        mock_process.as_dict.return_value = {
+            'name': "test_process",
+            'exe': "/usr/bin/test_process",
+            'cmdline': ["test_process"],
+            'status': "running",
+            'create_time': 1000.0,
+            'memory_info': None,
+            'cpu_percent': 1.0
+        }
+        mock_process_class.return_value = mock_process
+        
+        first = self.process_manager.get_process_info(1234)
+        
+        mock_process.as_dict.return_value = {
+            'status': "sleeping",
+            'memory_info': None,
+            'cpu_percent': 2.0
+        }
+        second = self.process_manager.get_process_info(1234)
+        
+        # 第二次只读取会变化的属性
+        self.assertEqual(mock_process.as_dict.call_args.kwargs['attrs'],
+                         ['status', 'memory_info', 'cpu_percent'])
+        self.assertEqual(second.name, "test_process")
+        self.assertEqual(second.executable, "/usr/bin/test_process")
+        self.assertEqual(second.status, "sleeping")
+        self.assertEqual(second.cpu_percent, 2.0)
+        self.assertEqual(first.status, "running")
+    
+    @patch('src.core.process_manager.psutil.Process')
+    def test_get_process_info_not_found(self, mock_process_class):
         """测试获取不存在的进程信息"""
-        mock_process_iter.return_value = []
+        from psutil import NoSuchProcess
+        mock_process_class.side_effect = NoSuchProcess(99999)
         
         # 测试获取不存在的进程
         process_info = self.process_manager.get_process_info(99999)
         self.assertIsNone(process_info)
     
+    @patch('src.core.process_manager._IS_LINUX', False)
     @patch('src.core.process_manager.psutil.net_connections')
     def test_get_processes_by_port(self, mock_net_connections):
         """测试根据端口获取进程列表"""
         # 模拟网络连接
-        mock_connection = MagicMock()
-        mock_connection.laddr.port = 80
-        mock_connection.pid = 1234
-        mock_connection.type = 1  # SOCK_STREAM
-        
-        mock_net_connections.return_value = [mock_connection]
+        mock_net_connections.return_value = [fake_conn(80, 1234)]
         
         # 模拟进程信息
         with patch.object(self.process_manager, 'get_process_info') as mock_get_process:
@@ -104,19 +162,11 @@ class TestProcessManager(unittest.TestCase):
     def test_find_processes_by_name(self, mock_process_iter):
         """测试根据名称查找进程"""
         # 模拟多个进程
-        mock_process1 = MagicMock()
-        mock_process1.pid = 1234
-        mock_process1.name.return_value = "nginx"
-        
-        mock_process2 = MagicMock()
-        mock_process2.pid = 1235
-        mock_process2.name.return_value = "nginx"
-        
-        mock_process3 = MagicMock()
-        mock_process3.pid = 1236
-        mock_process3.name.return_value = "apache2"
-        
-        mock_process_iter.return_value = [mock_process1, mock_process2, mock_process3]
+        mock_process_iter.return_value = [
+            fake_proc(1234, name="nginx"),
+            fake_proc(1235, name="nginx"),
+            fake_proc(1236, name="apache2"),
+        ]
         
         # 模拟get_process_info方法
         def mock_get_process_info(pid):
@@ -208,31 +258,34 @@ class TestProcessManager(unittest.TestCase):
             self.assertIn("成功", message)
             mock_process.kill.assert_called_once()
     
+    @patch('src.core.process_manager._IS_LINUX', False)
     @patch('src.core.process_manager.psutil.net_connections')
     def test_get_all_port_usage(self, mock_net_connections):
         """测试获取所有端口使用情况"""
-        # 模拟网络连接
-        mock_connection1 = MagicMock()
-        mock_connection1.laddr.port = 80
-        mock_connection1.laddr.ip = '0.0.0.0'
-        mock_connection1.pid = 1234
-        mock_connection1.type = 1  # SOCK_STREAM
-        mock_connection1.status = 'LISTEN'
-        
-        mock_connection2 = MagicMock()
-        mock_connection2.laddr.port = 443
-        mock_connection2.laddr.ip = '0.0.0.0'
-        mock_connection2.pid = 1235
-        mock_connection2.type = 1  # SOCK_STREAM
-        mock_connection2.status = 'LISTEN'
-        
-        mock_net_connections.return_value = [mock_connection1, mock_connection2]
+        # 模拟网络连接，只有IPv4 TCP连接
+        connections = [fake_conn(80, 1234), fake_conn(443, 1235)]
+        mock_net_connections.side_effect = lambda kind: (
+            connections if kind == 'tcp4' else []
+        )
         
         # 测试获取端口使用情况
         port_usage = self.process_manager.get_all_port_usage()
         
         self.assertIn((80, Protocol.TCP), port_usage)
         self.assertIn((443, Protocol.TCP), port_usage)
+        self.assertNotIn((80, Protocol.UDP), port_usage)
+        
+        # 只查询TCP时不解析UDP连接
+        mock_net_connections.reset_mock()
+        self.process_manager.get_all_port_usage([Protocol.TCP], include_ipv6=False, max_age=0)
+        mock_net_connections.assert_called_once_with(kind='tcp4')
+        
+        # 快照有效期内再次查询复用已解析的连接
+        mock_net_connections.reset_mock()
+        self.process_manager.get_all_port_usage([Protocol.TCP], include_ipv6=False)
+        with patch.object(self.process_manager, 'get_process_info', return_value=None):
+            self.process_manager.get_processes_by_port(80, Protocol.TCP, include_ipv6=False)
+        mock_net_connections.assert_not_called()
         
         # 验证端口信息
         port_80_info = port_usage[(80, Protocol.TCP)]
@@ -240,36 +293,56 @@ class TestProcessManager(unittest.TestCase):
         self.assertEqual(port_80_info['local_address'], '0.0.0.0:80')
         self.assertEqual(port_80_info['status'], 'LISTEN')
     
+    @patch('src.core.process_manager._IS_LINUX', True)
+    @patch('src.core.process_manager.psutil.net_connections')
+    def test_get_all_port_usage_proc_net(self, mock_net_connections):
+        """测试Linux下直接解析/proc/net/tcp获取端口使用情况"""
+        proc_net_tcp = (
+            "  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt"
+            "   uid  timeout inode\n"
+            "   0: 00000000:0050 00000000:0000 0A 00000000:00000000 00:00000000 00000000"
+            "     0        0 1001 1 0000000000000000 100 0 0 10 0\n"
+            "   1: 0100007F:01BB 0100007F:D431 01 00000000:00000000 00:00000000 00000000"
+            "  1000        0 1002 1 0000000000000000 20 4 30 10 -1\n"
+        )
+        
+        with patch('builtins.open', mock_open(read_data=proc_net_tcp)), \
+                patch.object(self.process_manager, '_inode_pid_map', return_value={1001: 1234}):
+            port_usage = self.process_manager.get_all_port_usage(
+                [Protocol.TCP], include_ipv6=False, max_age=0
+            )
+        
+        mock_net_connections.assert_not_called()
+        self.assertEqual(port_usage[(80, Protocol.TCP)], {
+            'local_address': '0.0.0.0:80',
+            'remote_address': '',
+            'pid': 1234,
+            'status': 'LISTEN'
+        })
+        self.assertEqual(port_usage[(443, Protocol.TCP)], {
+            'local_address': '127.0.0.1:443',
+            'remote_address': '127.0.0.1:54321',
+            'pid': None,
+            'status': 'ESTABLISHED'
+        })
+    
     @patch('src.core.process_manager.psutil.process_iter')
     def test_get_all_processes(self, mock_process_iter):
         """测试获取所有进程列表"""
         # 模拟进程
-        mock_process1 = MagicMock()
-        mock_process1.pid = 1234
-        mock_process1.name.return_value = "nginx"
+        mock_process_iter.return_value = [
+            fake_proc(1234, name="nginx", exe="/usr/sbin/nginx"),
+            fake_proc(1235, name="apache2", exe="/usr/sbin/apache2"),
+        ]
         
-        mock_process2 = MagicMock()
-        mock_process2.pid = 1235
-        mock_process2.name.return_value = "apache2"
+        # 测试获取所有进程（进程属性由process_iter批量读取）
+        processes = self.process_manager.get_all_processes()
         
-        mock_process_iter.return_value = [mock_process1, mock_process2]
-        
-        # 模拟get_process_info方法
-        def mock_get_process_info(pid):
-            if pid == 1234:
-                return ProcessInfo(pid=1234, name="nginx", executable="/usr/sbin/nginx")
-            elif pid == 1235:
-                return ProcessInfo(pid=1235, name="apache2", executable="/usr/sbin/apache2")
-            return None
-        
-        with patch.object(self.process_manager, 'get_process_info', side_effect=mock_get_process_info):
-            # 测试获取所有进程
-            processes = self.process_manager.get_all_processes()
-            
-            self.assertEqual(len(processes), 2)
-            process_names = [p.name for p in processes]
-            self.assertIn("nginx", process_names)
-            self.assertIn("apache2", process_names)
+        self.assertEqual(len(processes), 2)
+        process_names = [p.name for p in processes]
+        self.assertIn("nginx", process_names)
+        self.assertIn("apache2", process_names)
+        self.assertEqual(processes[0].executable, "/usr/sbin/nginx")
     
     def test_has_permission(self):
         """测试权限检查"""
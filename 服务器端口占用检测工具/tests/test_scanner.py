@@ -20,16 +20,22 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from src.models.data_models import ScanConfig, ScanType, Protocol, PortInfo
+from src.core import scanner as scanner_module
 from src.core.scanner import PortScanner
 
 
 class TestPortScanner(unittest.TestCase):
     """端口扫描器测试类"""
     
+    @classmethod
+    def setUpClass(cls):
+        """创建所有测试共用的端口扫描器"""
+        cls.scanner = PortScanner()
+        cls.test_port = 18888  # 使用一个不常用的端口进行测试
+    
     def setUp(self):
         """测试前准备"""
-        self.scanner = PortScanner()
-        self.test_port = 18888  # 使用一个不常用的端口进行测试
+        self.scanner._stop_scan = False
     
     def tearDown(self):
         """测试后清理"""
@@ -57,7 +63,7 @@ class TestPortScanner(unittest.TestCase):
         """测试从字符串创建扫描配置"""
         # 测试单个端口
         config = ScanConfig.from_port_string("80")
-        self.assertEqual(config.port_range, [80])
+        self.assertEqual(list(config.port_range), [80])
         
         # 测试端口列表
         config = ScanConfig.from_port_string("80,443,8080")
@@ -65,7 +71,8 @@ class TestPortScanner(unittest.TestCase):
         
         # 测试端口范围
         config = ScanConfig.from_port_string("8000-8002")
-        self.assertEqual(config.port_range, [8000, 8001, 8002])
+        self.assertEqual(list(config.port_range), [8000, 8001, 8002])
+        self.assertIsInstance(config.port_range, range)
         
         # 测试混合格式
         config = ScanConfig.from_port_string("80,443,8000-8002")
@@ -81,11 +88,19 @@ class TestPortScanner(unittest.TestCase):
         self.assertIn("端口范围不能为空", error_msg)
         
         # 测试端口数量过多
-        large_range = list(range(1, 10002))  # 10001个端口
+        large_range = range(1, 10002)  # 10001个端口
         config = ScanConfig(port_range=large_range)
         is_valid, error_msg = config.validate()
         self.assertFalse(is_valid)
         self.assertIn("端口数量过多", error_msg)
+        
+        # 端口列表同样检查数量
+        config = ScanConfig(port_range=list(large_range))
+        self.assertIn("端口数量过多", config.validate()[1])
+        
+        # 连续端口范围裁剪到有效端口
+        config = ScanConfig(port_range=range(0, 70000))
+        self.assertEqual(config.port_range, range(1, 65536))
     
     def test_check_port_status_closed(self):
         """测试检查关闭端口状态"""
@@ -224,6 +239,29 @@ class TestPortScanner(unittest.TestCase):
         self.assertFalse(port_info_closed.is_occupied)
         self.assertEqual(port_info_closed.display_status, "空闲")
 
+    def test_port_info_from_enums(self):
+        """测试使用枚举值快速创建端口信息"""
+        from src.models.data_models import PortStatus
+
+        port_info = PortInfo.from_enums(
+            port=80,
+            status=PortStatus.LISTEN,
+            protocol=Protocol.TCP,
+            local_address="0.0.0.0:80",
+            pid=1234
+        )
+
+        # 与常规构造方式创建的对象一致
+        expected = PortInfo(
+            port=80,
+            status="LISTEN",
+            protocol="tcp",
+            local_address="0.0.0.0:80",
+            pid=1234
+        )
+        self.assertEqual(port_info, expected)
+        self.assertTrue(port_info.is_occupied)
+
 
 class TestScanResult(unittest.TestCase):
     """扫描结果测试类"""
@@ -276,6 +314,63 @@ class TestScanResult(unittest.TestCase):
         # 测试获取空闲端口
         free_ports = result.get_free_ports()
         self.assertEqual(len(free_ports), 1)
+        
+        # 端口列表变化后筛选结果随之更新
+        result.port_info_list.append(PortInfo(
+            port=22,
+            status=PortStatus.LISTEN,
+            protocol=Protocol.TCP,
+            local_address="0.0.0.0:22"
+        ))
+        self.assertEqual(len(result.get_occupied_ports()), 3)
+        
+        result.port_info_list = port_info_list[2:3]
+        self.assertEqual(result.get_occupied_ports(), [])
+        self.assertEqual(len(result.get_free_ports()), 1)
+
+
+@unittest.skipIf(scanner_module.liburing is None, "未安装liburing")
+class TestUringProbe(unittest.TestCase):
+    """io_uring批量探测测试类"""
+    
+    def setUp(self):
+        """启动若干监听端口，并找出若干未监听的端口"""
+        self.scanner = PortScanner()
+        self.listeners = []
+        for _ in range(5):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.bind(('127.0.0.1', 0))
+            sock.listen(16)
+            self.listeners.append(sock)
+        self.open_ports = {sock.getsockname()[1] for sock in self.listeners}
+        
+        closed_ports = []
+        for _ in range(11):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+                sock.bind(('127.0.0.1', 0))
+                closed_ports.append(sock.getsockname()[1])
+        self.ports = sorted(self.open_ports | set(closed_ports))
+    
+    def tearDown(self):
+        """关闭监听端口"""
+        for sock in self.listeners:
+            sock.close()
+    
+    def test_uring_matches_asyncio_over_batches(self):
+        """测试多批次io_uring探测结果与asyncio一致"""
+        import asyncio
+        
+        # 每批4个端口，完成队列在多批之间发生回绕
+        with patch.object(scanner_module, '_max_inflight_connects', return_value=4):
+            uring_ports = self.scanner._probe_tcp_ports_uring(
+                '127.0.0.1', self.ports, 1.0
+            )
+            async_ports = asyncio.run(self.scanner._probe_tcp_ports_async(
+                '127.0.0.1', self.ports, 1.0
+            ))
+        
+        self.assertEqual(async_ports, self.open_ports)
+        self.assertEqual(uring_ports, async_ports)
 
 
 if __name__ == '__main__':
@@ -14,6 +14,7 @@ APP_AUTHOR = "开发团队"
 # 文件扩展名
 DATA_FILE_EXTENSION = ".enc"
 BACKUP_FILE_EXTENSION = ".enc"
+ENCRYPTED_BACKUP_EXTENSION = ".pmb"  # 必须与BACKUP_FILE_EXTENSION不同
 CONFIG_FILE_EXTENSION = ".json"
 LOG_FILE_EXTENSION = ".log"
 
@@ -65,6 +66,7 @@ MAX_USERNAME_LENGTH = 100
 MAX_NOTES_LENGTH = 500
 MAX_LOGIN_ATTEMPTS = 3
 MAX_BACKUP_FILES = 10
+MAX_BACKUP_SIZE_MB = 100  # 创建备份前要求的最小可用磁盘空间
 
 # 时间常量
 SECONDS_PER_MINUTE = 60
@@ -82,6 +84,14 @@ LOG_MAX_FILE_SIZE = 10 * MB
 LOG_BACKUP_COUNT = 5
 TEMP_FILE_CLEANUP_HOURS = 24
 BACKUP_CLEANUP_DAYS = 30
+BACKUP_RETENTION_DAYS = BACKUP_CLEANUP_DAYS
+
+# 文件管理
+MAX_FILE_SIZE_MB = 50  # 单个文件大小上限
+ALLOWED_FILE_EXTENSIONS = frozenset({
+    ".enc", ".json", ".txt", ".csv", ".log", ".bak", ".tmp"
+})
+TEMP_FILE_RETENTION_HOURS = TEMP_FILE_CLEANUP_HOURS
 
 # UI常量
 AVAILABLE_THEMES = ["default", "dark", "light"]
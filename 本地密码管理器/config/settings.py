@@ -6,10 +6,22 @@
 管理应用程序的配置信息和常量
 """
 
+import functools
 import os
+import sys
 from pathlib import Path
 from typing import Optional
 
+# 运行平台（运行期间不会变化，导入时确定一次）
+_IS_WIN = os.name == 'nt'
+_IS_MAC = sys.platform.startswith('darwin')
+_IS_POSIX = os.name == 'posix'
+
+# 用户主目录和数据目录相关的环境变量，导入时读取一次
+_HOME = Path.home()
+_APPDATA = os.environ.get('APPDATA')
+_XDG_DATA_HOME = os.environ.get('XDG_DATA_HOME')
+
 
 class AppConfig:
     """
@@ -18,6 +30,9 @@ class AppConfig:
     管理应用程序的配置信息
     """
     
+    # 已创建过的目录，多次实例化时不再重复创建
+    _dirs_created: set = set()
+    
     def __init__(self):
         """
         初始化应用配置
@@ -69,24 +84,28 @@ class AppConfig:
         self.log_file_max_size = 10 * 1024 * 1024  # 10MB
         self.log_file_backup_count = 5
     
-    def _get_app_data_dir(self) -> Path:
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _get_app_data_dir() -> Path:
         """
-        获取应用数据目录
+        获取应用数据目录（结果在进程内缓存）
         
         Returns:
             Path: 应用数据目录路径
         """
         # 根据操作系统确定数据目录
-        if os.name == 'nt':  # Windows
-            base_dir = Path(os.environ.get('APPDATA', Path.home() / 'AppData' / 'Roaming'))
-        elif os.name == 'posix':  # macOS/Linux
-            if 'darwin' in os.sys.platform:  # macOS
-                base_dir = Path.home() / 'Library' / 'Application Support'
-            else:  # Linux
-                base_dir = Path(os.environ.get('XDG_DATA_HOME', Path.home() / '.local' / 'share'))
+        if _IS_WIN:  # Windows
+            base_dir = Path(_APPDATA) if _APPDATA else _HOME / 'AppData' / 'Roaming'
+        elif _IS_MAC:  # macOS
+            base_dir = _HOME / 'Library' / 'Application Support'
+        elif _IS_POSIX:  # Linux
+            if _XDG_DATA_HOME:
+                base_dir = Path(_XDG_DATA_HOME)
+            else:
+                base_dir = _HOME / '.local' / 'share'
         else:
             # 默认使用用户主目录
-            base_dir = Path.home()
+            base_dir = _HOME
         
         return base_dir / 'PasswordManager'
     
@@ -94,15 +113,21 @@ class AppConfig:
         """
         创建必要的目录
         """
-        directories = [
-            self.app_data_dir,
-            self.app_data_dir / "backup",
-            self.app_data_dir / "temp",
-            self.app_data_dir / "logs"
-        ]
+        root = self.app_data_dir
+        if root in AppConfig._dirs_created:
+            return
+        
+        root.mkdir(parents=True, exist_ok=True)
+        
+        # 一次列出数据目录，只创建缺失的子目录
+        with os.scandir(root) as entries:
+            existing = {entry.name for entry in entries if entry.is_dir()}
+        
+        for name in ("backup", "temp", "logs"):
+            if name not in existing:
+                (root / name).mkdir(exist_ok=True)
         
-        for directory in directories:
-            directory.mkdir(parents=True, exist_ok=True)
+        AppConfig._dirs_created.add(root)
     
     def get_backup_dir(self) -> Path:
         """
@@ -6,17 +6,35 @@
 提供主密码验证和登录状态管理功能
 """
 
+import hashlib
+import hmac
+import os
 import time
-from datetime import datetime, timedelta
-from typing import Optional, Callable, Dict, Any
-from threading import Timer
+import weakref
+from collections import deque
+from datetime import datetime
+from typing import Optional, Callable
+from threading import Event, RLock, Thread
 
+from core.models import AuthResult, SessionInfo
 from data.repository import DataRepository
+from security.crypto import CryptoManager
 from security.validator import DataValidator
 from utils.logger import log_security_event, log_user_action
 from config.constants import MAX_LOGIN_ATTEMPTS, DEFAULT_AUTO_LOCK_TIMEOUT
 
 
+# 数据库是否存在的检查结果缓存时间（纳秒）
+DB_EXISTS_CACHE_TTL_NS = 1_000_000_000
+
+# 验证频率限制：时间窗口内的尝试次数达到上限时直接拒绝，不执行KDF
+RATE_LIMIT_WINDOW_NS = 10 * 1_000_000_000
+RATE_LIMIT_MAX_ATTEMPTS = 10
+
+# 账户锁定的安全事件详情（常量，无需每次格式化）
+_LOCKOUT_DETAILS = f"连续失败{MAX_LOGIN_ATTEMPTS}次，锁定5分钟"
+
+
 class AuthenticationService:
     """
     身份验证服务类
@@ -36,15 +54,31 @@ class AuthenticationService:
         
         # 登录状态
         self._is_authenticated = False
+        # 计时使用单调时钟纳秒数，不受系统时间调整影响；登录时刻另存一份用于显示
         self._login_time: Optional[datetime] = None
-        self._last_activity_time: Optional[datetime] = None
+        self._login_time_ns: Optional[int] = None
+        self._last_activity_ns: Optional[int] = None
         
-        # 安全控制
+        # 安全控制，登录状态和失败计数由_state_lock保护（自动锁定在工作线程中执行）
+        self._state_lock = RLock()
         self._failed_attempts = 0
-        self._lockout_until: Optional[datetime] = None
-        self._auto_lock_timer: Optional[Timer] = None
+        self._lockout_until_ns: Optional[int] = None
+        self._attempt_times = deque(maxlen=2 * RATE_LIMIT_MAX_ATTEMPTS)
+        self._auto_lock_worker: Optional[Thread] = None
+        self._auto_lock_wake = Event()
+        
+        # 服务对象被回收时唤醒工作线程，使其发现弱引用失效后退出
+        weakref.finalize(self, self._auto_lock_wake.set)
         self._auto_lock_timeout = DEFAULT_AUTO_LOCK_TIMEOUT
         
+        # 上次验证成功的主密码的快速校验值，已登录时再次验证不必重新执行KDF
+        self._fast_salt = os.urandom(16)
+        self._fast_verifier: Optional[bytes] = None
+        
+        # 数据库是否存在的缓存结果及其检查时间
+        self._db_exists_cache: Optional[bool] = None
+        self._db_exists_cache_ns = 0
+        
         # 回调函数
         self._on_logout_callback: Optional[Callable] = None
         self._on_auto_lock_callback: Optional[Callable] = None
@@ -56,7 +90,14 @@ class AuthenticationService:
         Returns:
             bool: 数据库是否存在
         """
-        return self.repository.is_database_exists()
+        now = time.monotonic_ns()
+        if (self._db_exists_cache is not None
+                and now - self._db_exists_cache_ns < DB_EXISTS_CACHE_TTL_NS):
+            return self._db_exists_cache
+        
+        self._db_exists_cache = self.repository.is_database_exists()
+        self._db_exists_cache_ns = now
+        return self._db_exists_cache
     
     def is_locked_out(self) -> bool:
         """
@@ -65,14 +106,18 @@ class AuthenticationService:
         Returns:
             bool: 是否被锁定
         """
-        if self._lockout_until is None:
+        if self._lockout_until_ns is None:
             return False
         
-        if datetime.now() >= self._lockout_until:
-            # 锁定时间已过，清除锁定状态
-            self._lockout_until = None
-            self._failed_attempts = 0
-            return False
+        with self._state_lock:
+            if self._lockout_until_ns is None:
+                return False
+            
+            if time.monotonic_ns() >= self._lockout_until_ns:
+                # 锁定时间已过，清除锁定状态
+                self._lockout_until_ns = None
+                self._failed_attempts = 0
+                return False
         
         return True
     
@@ -86,10 +131,9 @@ class AuthenticationService:
         if not self.is_locked_out():
             return None
         
-        remaining = self._lockout_until - datetime.now()
-        return max(0, int(remaining.total_seconds()))
+        return max(0, (self._lockout_until_ns - time.monotonic_ns()) // 1_000_000_000)
     
-    def create_master_password(self, password: str) -> Dict[str, Any]:
+    def create_master_password(self, password: str) -> AuthResult:
         """
         创建主密码（首次设置）
         
@@ -97,37 +141,38 @@ class AuthenticationService:
             password (str): 主密码
             
         Returns:
-            Dict[str, Any]: 创建结果
+            AuthResult: 创建结果
         """
         # 验证主密码强度
         validation_result = self.validator.validate_master_password(password)
         
         if not validation_result['is_valid']:
-            return {
-                'success': False,
-                'message': '主密码不符合要求',
-                'errors': validation_result['errors'],
-                'warnings': validation_result.get('warnings', [])
-            }
+            return AuthResult(
+                success=False,
+                message='主密码不符合要求',
+                errors=tuple(validation_result['errors']),
+                warnings=tuple(validation_result.get('warnings', []))
+            )
         
         # 初始化数据库
+        self._db_exists_cache = None
         success = self.repository.initialize_new_database(password)
         
         if success:
             log_security_event("主密码创建", "用户创建了新的主密码")
-            return {
-                'success': True,
-                'message': '主密码创建成功',
-                'warnings': validation_result.get('warnings', [])
-            }
+            return AuthResult(
+                success=True,
+                message='主密码创建成功',
+                warnings=tuple(validation_result.get('warnings', []))
+            )
         else:
             log_security_event("主密码创建失败", "数据库初始化失败")
-            return {
-                'success': False,
-                'message': '主密码创建失败，请重试'
-            }
+            return AuthResult(
+                success=False,
+                message='主密码创建失败，请重试'
+            )
     
-    def authenticate(self, password: str) -> Dict[str, Any]:
+    def authenticate(self, password: str) -> AuthResult:
         """
         验证主密码并登录
         
@@ -135,89 +180,137 @@ class AuthenticationService:
             password (str): 主密码
             
         Returns:
-            Dict[str, Any]: 验证结果
-        """
-        # 检查是否被锁定
-        if self.is_locked_out():
-            remaining_time = self.get_lockout_remaining_time()
-            log_security_event("登录尝试被拒绝", f"账户被锁定，剩余时间: {remaining_time}秒")
-            return {
-                'success': False,
-                'message': f'账户已被锁定，请等待 {remaining_time} 秒后重试',
-                'locked_out': True,
-                'remaining_time': remaining_time
-            }
-        
-        # 验证密码格式
-        if not password:
-            return {
-                'success': False,
-                'message': '请输入主密码'
-            }
-        
-        # 尝试加载数据库
-        success = self.repository.load_database(password)
-        
-        if success:
-            # 登录成功
-            self._is_authenticated = True
-            self._login_time = datetime.now()
-            self._last_activity_time = datetime.now()
-            self._failed_attempts = 0
-            self._lockout_until = None
+            AuthResult: 验证结果
+        """
+        # 失败计数和锁定状态的读改写需要串行执行，并发重试时也不会重复执行KDF
+        with self._state_lock:
+            # 检查验证频率，窗口内尝试过多时在执行KDF之前拒绝
+            now_ns = time.monotonic_ns()
+            attempt_times = self._attempt_times
+            while attempt_times and now_ns - attempt_times[0] > RATE_LIMIT_WINDOW_NS:
+                attempt_times.popleft()
+            rate_limited = len(attempt_times) >= RATE_LIMIT_MAX_ATTEMPTS
+            attempt_times.append(now_ns)
             
-            # 启动自动锁定定时器
-            self._start_auto_lock_timer()
+            if rate_limited:
+                log_security_event("登录尝试被限流", "%d秒内尝试次数过多",
+                                   RATE_LIMIT_WINDOW_NS // 1_000_000_000)
+                return AuthResult(
+                    success=False,
+                    message='尝试过于频繁，请稍后重试',
+                    rate_limited=True
+                )
             
-            log_user_action("用户登录", "主密码验证成功")
+            # 检查是否被锁定
+            if self.is_locked_out():
+                remaining_time = self.get_lockout_remaining_time()
+                log_security_event("登录尝试被拒绝", "账户被锁定，剩余时间: %d秒", remaining_time)
+                return AuthResult(
+                    success=False,
+                    message=f'账户已被锁定，请等待 {remaining_time} 秒后重试',
+                    locked_out=True,
+                    remaining_time=remaining_time
+                )
             
-            return {
-                'success': True,
-                'message': '登录成功'
-            }
-        else:
-            # 登录失败
-            self._failed_attempts += 1
+            # 先计算摘要并完成常量时间比较，再判断是否为空密码，
+            # 避免空密码和不同长度的密码走出耗时不同的分支
+            password = password or ''
+            digest = self._fast_digest(password)
+            matched = self._fast_verify(digest)
             
-            log_security_event("登录失败", f"主密码验证失败，失败次数: {self._failed_attempts}")
+            # 验证密码格式
+            if len(password) == 0:
+                return AuthResult(
+                    success=False,
+                    message='请输入主密码'
+                )
             
-            # 检查是否需要锁定账户
-            if self._failed_attempts >= MAX_LOGIN_ATTEMPTS:
-                # 锁定账户5分钟
-                lockout_duration = 5 * 60  # 5分钟
-                self._lockout_until = datetime.now() + timedelta(seconds=lockout_duration)
+            # 已登录时先用快速校验值验证，匹配则不必重新加载数据库
+            if matched:
+                success = True
+            else:
+                success = self.repository.load_database(password)
+            
+            if success:
+                # 登录成功
+                self._is_authenticated = True
+                self._login_time = datetime.now()
+                self._login_time_ns = self._last_activity_ns = time.monotonic_ns()
+                self._failed_attempts = 0
+                self._lockout_until_ns = None
+                self._fast_verifier = digest
+                
+                # 启动自动锁定工作线程
+                self._start_auto_lock_worker()
                 
-                log_security_event("账户锁定", f"连续失败{MAX_LOGIN_ATTEMPTS}次，锁定5分钟")
+                log_user_action("用户登录", "主密码验证成功")
                 
-                return {
-                    'success': False,
-                    'message': f'密码错误次数过多，账户已被锁定 {lockout_duration // 60} 分钟',
-                    'locked_out': True,
-                    'remaining_time': lockout_duration
-                }
+                return AuthResult(
+                    success=True,
+                    message='登录成功'
+                )
             else:
-                remaining_attempts = MAX_LOGIN_ATTEMPTS - self._failed_attempts
-                return {
-                    'success': False,
-                    'message': f'主密码错误，还有 {remaining_attempts} 次尝试机会',
-                    'remaining_attempts': remaining_attempts
-                }
+                # 登录失败
+                self._failed_attempts += 1
+                
+                log_security_event("登录失败", "主密码验证失败，失败次数: %d", self._failed_attempts)
+                
+                # 检查是否需要锁定账户
+                if self._failed_attempts >= MAX_LOGIN_ATTEMPTS:
+                    # 锁定账户5分钟
+                    lockout_duration = 5 * 60  # 5分钟
+                    self._lockout_until_ns = (
+                        time.monotonic_ns() + lockout_duration * 1_000_000_000
+                    )
+                    
+                    log_security_event("账户锁定", _LOCKOUT_DETAILS)
+                    
+                    return AuthResult(
+                        success=False,
+                        message=f'密码错误次数过多，账户已被锁定 {lockout_duration // 60} 分钟',
+                        locked_out=True,
+                        remaining_time=lockout_duration
+                    )
+                else:
+                    remaining_attempts = MAX_LOGIN_ATTEMPTS - self._failed_attempts
+                    return AuthResult(
+                        success=False,
+                        message=f'主密码错误，还有 {remaining_attempts} 次尝试机会',
+                        remaining_attempts=remaining_attempts
+                    )
     
     def logout(self):
         """
         注销登录
         """
-        if self._is_authenticated:
-            log_user_action("用户注销", "用户主动注销")
+        with self._state_lock:
+            if self._is_authenticated:
+                log_user_action("用户注销", "用户主动注销")
+            
+            self._end_session()
         
+        self._run_logout_callback()
+    
+    def _end_session(self):
+        """
+        清除登录状态（调用方需持有状态锁）
+        """
         self._is_authenticated = False
         self._login_time = None
-        self._last_activity_time = None
+        self._login_time_ns = None
+        self._last_activity_ns = None
+        self._fast_verifier = None
         
-        # 停止自动锁定定时器
-        self._stop_auto_lock_timer()
+        # 清除备份密钥缓存
+        CryptoManager.clear_key_cache()
         
-        # 执行注销回调
+        # 停止自动锁定工作线程
+        self._stop_auto_lock_worker()
+    
+    def _run_logout_callback(self):
+        """
+        执行注销回调（不能在持有状态锁时调用）
+        """
         if self._on_logout_callback:
             try:
                 self._on_logout_callback()
@@ -238,40 +331,39 @@ class AuthenticationService:
         更新最后活动时间
         """
         if self._is_authenticated:
-            self._last_activity_time = datetime.now()
-            
-            # 重启自动锁定定时器
-            self._start_auto_lock_timer()
+            # 只记录时间，工作线程到期时按该时间检查是否真正超时
+            self._last_activity_ns = time.monotonic_ns()
     
-    def get_session_info(self) -> Dict[str, Any]:
+    def get_session_info(self) -> SessionInfo:
         """
         获取会话信息
         
         Returns:
-            Dict[str, Any]: 会话信息
+            SessionInfo: 会话信息
         """
         if not self._is_authenticated:
-            return {
-                'authenticated': False
-            }
+            return SessionInfo(authenticated=False)
+        
+        now_ns = time.monotonic_ns()
         
         session_duration = None
-        if self._login_time:
-            session_duration = int((datetime.now() - self._login_time).total_seconds())
+        if self._login_time_ns is not None:
+            session_duration = (now_ns - self._login_time_ns) // 1_000_000_000
         
         last_activity = None
-        if self._last_activity_time:
-            last_activity = int((datetime.now() - self._last_activity_time).total_seconds())
-        
-        return {
-            'authenticated': True,
-            'login_time': self._login_time,
-            'session_duration': session_duration,
-            'last_activity': last_activity,
-            'auto_lock_timeout': self._auto_lock_timeout
-        }
+        if self._last_activity_ns is not None:
+            last_activity = (now_ns - self._last_activity_ns) // 1_000_000_000
+        
+        return SessionInfo(
+            authenticated=True,
+            login_time=self._login_time,
+            session_duration=session_duration,
+            last_activity=last_activity,
+            auto_lock_timeout=self._auto_lock_timeout
+        )
     
-    def change_master_password(self, old_password: str, new_password: str) -> Dict[str, Any]:
+    def change_master_password(self, old_password: str,
+                               new_password: str) -> AuthResult:
         """
         修改主密码
         
@@ -280,41 +372,43 @@ class AuthenticationService:
             new_password (str): 新密码
             
         Returns:
-            Dict[str, Any]: 修改结果
+            AuthResult: 修改结果
         """
         if not self._is_authenticated:
-            return {
-                'success': False,
-                'message': '请先登录'
-            }
+            return AuthResult(
+                success=False,
+                message='请先登录'
+            )
         
         # 验证新密码强度
         validation_result = self.validator.validate_master_password(new_password)
         
         if not validation_result['is_valid']:
-            return {
-                'success': False,
-                'message': '新密码不符合要求',
-                'errors': validation_result['errors'],
-                'warnings': validation_result.get('warnings', [])
-            }
-        
-        # 修改密码
+            return AuthResult(
+                success=False,
+                message='新密码不符合要求',
+                errors=tuple(validation_result['errors']),
+                warnings=tuple(validation_result.get('warnings', []))
+            )
+        
+        # 修改密码，旧密码的快速校验值随之失效
+        self._fast_verifier = None
+        self._db_exists_cache = None
         success = self.repository.change_master_password(old_password, new_password)
         
         if success:
             log_security_event("主密码修改", "用户成功修改主密码")
-            return {
-                'success': True,
-                'message': '主密码修改成功',
-                'warnings': validation_result.get('warnings', [])
-            }
+            return AuthResult(
+                success=True,
+                message='主密码修改成功',
+                warnings=tuple(validation_result.get('warnings', []))
+            )
         else:
             log_security_event("主密码修改失败", "旧密码验证失败或系统错误")
-            return {
-                'success': False,
-                'message': '主密码修改失败，请检查旧密码是否正确'
-            }
+            return AuthResult(
+                success=False,
+                message='主密码修改失败，请检查旧密码是否正确'
+            )
     
     def set_auto_lock_timeout(self, timeout_seconds: int):
         """
@@ -326,9 +420,9 @@ class AuthenticationService:
         if timeout_seconds > 0:
             self._auto_lock_timeout = timeout_seconds
             
-            # 重启定时器
+            # 唤醒工作线程按新的超时时间重新计时
             if self._is_authenticated:
-                self._start_auto_lock_timer()
+                self._start_auto_lock_worker()
     
     def set_logout_callback(self, callback: Callable):
         """
@@ -348,44 +442,124 @@ class AuthenticationService:
         """
         self._on_auto_lock_callback = callback
     
-    def _start_auto_lock_timer(self):
+    def _start_auto_lock_worker(self):
+        """
+        启动自动锁定工作线程，线程已在运行时唤醒它重新计算剩余时间
+        """
+        with self._state_lock:
+            if self._auto_lock_worker is None:
+                # 线程只持有弱引用，服务对象可以被正常回收
+                self._auto_lock_worker = Thread(
+                    target=_auto_lock_loop,
+                    args=(weakref.ref(self), self._auto_lock_wake),
+                    name="AutoLockWorker",
+                    daemon=True
+                )
+                self._auto_lock_worker.start()
+            else:
+                self._auto_lock_wake.set()
+    
+    def _stop_auto_lock_worker(self):
         """
-        启动自动锁定定时器
+        唤醒自动锁定工作线程，未登录时线程会自行退出
         """
-        # 停止现有定时器
-        self._stop_auto_lock_timer()
-        
-        if self._auto_lock_timeout > 0:
-            self._auto_lock_timer = Timer(
-                self._auto_lock_timeout,
-                self._auto_lock
-            )
-            self._auto_lock_timer.start()
+        self._auto_lock_wake.set()
     
-    def _stop_auto_lock_timer(self):
+    def _auto_lock_tick(self) -> Optional[float]:
         """
-        停止自动锁定定时器
+        检查空闲时间，超时则自动锁定（在工作线程中调用）
+        
+        Returns:
+            Optional[float]: 距离自动锁定的剩余秒数，工作线程应退出时返回None
         """
-        if self._auto_lock_timer and self._auto_lock_timer.is_alive():
-            self._auto_lock_timer.cancel()
-            self._auto_lock_timer = None
+        with self._state_lock:
+            if not self._is_authenticated:
+                self._auto_lock_worker = None
+                return None
+            
+            remaining = self._auto_lock_timeout
+            if self._last_activity_ns is not None:
+                idle_ns = time.monotonic_ns() - self._last_activity_ns
+                remaining -= idle_ns / 1_000_000_000
+            
+            if remaining > 0:
+                return remaining
+            
+            self._auto_lock_worker = None
+            locked = self._auto_lock_session()
+        
+        if locked:
+            self._run_auto_lock_callbacks()
+        return None
     
     def _auto_lock(self):
         """
         自动锁定（内部方法）
         """
-        if self._is_authenticated:
-            log_security_event("自动锁定", f"超时{self._auto_lock_timeout}秒未活动")
+        with self._state_lock:
+            locked = self._auto_lock_session()
+        
+        if locked:
+            self._run_auto_lock_callbacks()
+    
+    def _auto_lock_session(self) -> bool:
+        """
+        在状态锁内清除快速校验值并注销登录
+        
+        Returns:
+            bool: 是否从已登录状态锁定，是则调用方应在释放锁后执行回调
+        """
+        self._fast_verifier = None
+        if not self._is_authenticated:
+            return False
+        
+        log_security_event("自动锁定", "超时%d秒未活动", self._auto_lock_timeout)
+        self._end_session()
+        return True
+    
+    def _run_auto_lock_callbacks(self):
+        """
+        执行自动锁定和注销回调
+        
+        回调可能把工作交给界面主线程并等待，必须在释放状态锁后调用，
+        否则主线程调用authenticate()、logout()等方法时会互相等待。
+        """
+        if self._on_auto_lock_callback:
+            try:
+                self._on_auto_lock_callback()
+            except Exception as e:
+                print(f"自动锁定回调执行失败: {e}")
+        
+        self._run_logout_callback()
+    
+    def _fast_digest(self, password: str) -> bytes:
+        """
+        计算主密码的快速校验值
+        
+        Args:
+            password (str): 主密码
             
-            # 执行自动锁定回调
-            if self._on_auto_lock_callback:
-                try:
-                    self._on_auto_lock_callback()
-                except Exception as e:
-                    print(f"自动锁定回调执行失败: {e}")
+        Returns:
+            bytes: 加盐SHA-256摘要
+        """
+        return hashlib.sha256(self._fast_salt + password.encode('utf-8')).digest()
+    
+    def _fast_verify(self, digest: bytes) -> bool:
+        """
+        使用快速校验值验证主密码（仅在已登录且数据库已加载时有效）
+        
+        无论快速校验值是否存在都会执行一次常量时间比较。
+        
+        Args:
+            digest (bytes): 待验证主密码的快速校验值
             
-            # 注销登录
-            self.logout()
+        Returns:
+            bool: 是否与上次验证成功的主密码一致
+        """
+        verifier = self._fast_verifier
+        expected = verifier if verifier is not None else bytes(len(digest))
+        matched = hmac.compare_digest(digest, expected)
+        return verifier is not None and matched and self.repository.is_loaded()
     
     def get_failed_attempts(self) -> int:
         """
@@ -400,12 +574,33 @@ class AuthenticationService:
         """
         重置失败尝试次数（管理员功能）
         """
-        self._failed_attempts = 0
-        self._lockout_until = None
+        with self._state_lock:
+            self._failed_attempts = 0
+            self._lockout_until_ns = None
         log_security_event("重置失败次数", "管理员重置了失败尝试次数")
+
+
+def _auto_lock_loop(service_ref: "weakref.ReferenceType[AuthenticationService]",
+                    wake: Event):
+    """
+    自动锁定工作线程主循环
     
-    def __del__(self):
-        """
-        析构函数，确保清理定时器
-        """
-        self._stop_auto_lock_timer()
\ No newline at end of file
+    登录期间只使用一个线程，按最后活动时间计算剩余时间后等待，
+    到期时空闲时间仍超过超时时间则自动锁定。等待期间不持有服务对象的强引用。
+    
+    Args:
+        service_ref: 身份验证服务的弱引用
+        wake (Event): 唤醒事件
+    """
+    while True:
+        service = service_ref()
+        if service is None:
+            return
+        
+        remaining = service._auto_lock_tick()
+        del service
+        if remaining is None:
+            return
+        
+        wake.wait(remaining)
+        wake.clear()
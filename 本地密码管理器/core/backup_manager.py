@@ -6,14 +6,28 @@
 提供数据备份和恢复功能
 """
 
+import io
 import os
+import hashlib
+import hmac
 import json
+import mmap
 import shutil
 import zipfile
+import zlib
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+from operator import attrgetter
 from pathlib import Path
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from core.models import _SLOTS
 from data.repository import DataRepository
 from security.crypto import CryptoManager
 from utils.helpers import (
@@ -27,6 +41,94 @@ from config.constants import (
 )
 
 
+# 流式加密备份时每次加密的数据块大小
+ENCRYPT_CHUNK_SIZE = 64 * 1024
+
+# 压缩加密备份的文件头标识（版本1：zlib压缩后加密）
+COMPRESSED_BACKUP_MAGIC = b'PMB\x01'
+
+# 带校验值的加密备份文件头标识（版本2：在版本1的基础上，标识后紧跟其余内容的SHA-256）
+CHECKSUM_BACKUP_MAGIC = b'PMB\x02'
+BACKUP_CHECKSUM_LENGTH = 32
+
+# 明文备份压缩包中的数据文件名
+PLAIN_BACKUP_MEMBER = 'backup.json'
+
+# 备份文件后缀，用于str.endswith一次匹配两种备份
+BACKUP_SUFFIXES = (ENCRYPTED_BACKUP_EXTENSION, BACKUP_FILE_EXTENSION)
+
+# 备份数据和备份条目的必需字段
+BACKUP_REQUIRED_FIELDS = ('version', 'created_at', 'entries')
+ENTRY_REQUIRED_FIELDS = ('platform', 'username')
+_ENTRY_REQUIRED_SET = frozenset(ENTRY_REQUIRED_FIELDS)
+
+# 条目中的密码字段：新格式保存密文，旧格式（1.0）保存明文
+ENTRY_PASSWORD_FIELDS = ('encrypted_password', 'password')
+
+# 备份数据格式版本
+BACKUP_FORMAT_VERSION = '2.0'
+
+# 写备份文件时的缓冲区大小，小块写入在缓冲区内合并后再提交，减少write系统调用
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+
+def _json_default(obj: Any) -> str:
+    """
+    标准库json序列化datetime的回调，输出与orjson一致的ISO格式字符串
+    """
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+@dataclass(frozen=True, **_SLOTS)
+class BackupInfo:
+    """
+    备份文件信息
+    
+    只保存文件状态中的原始数值，时间和大小的显示格式在访问时才计算，
+    列出大量备份时不必为每个文件构造datetime对象。
+    """
+    filename: str
+    file_path: str
+    file_size: int
+    created_timestamp: float
+    modified_timestamp: float
+    is_encrypted: bool
+    
+    @property
+    def file_size_formatted(self) -> str:
+        """格式化的文件大小"""
+        return format_file_size(self.file_size)
+    
+    @property
+    def created_at(self) -> datetime:
+        """创建时间"""
+        return datetime.fromtimestamp(self.created_timestamp)
+    
+    @property
+    def modified_at(self) -> datetime:
+        """修改时间"""
+        return datetime.fromtimestamp(self.modified_timestamp)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典格式
+        
+        Returns:
+            Dict[str, Any]: 字典格式的数据
+        """
+        return {
+            'filename': self.filename,
+            'file_path': self.file_path,
+            'file_size': self.file_size,
+            'file_size_formatted': self.file_size_formatted,
+            'created_at': self.created_at,
+            'modified_at': self.modified_at,
+            'is_encrypted': self.is_encrypted
+        }
+
+
 class BackupManager:
     """
     备份管理器
@@ -46,6 +148,12 @@ class BackupManager:
         self.backup_dir = Path(backup_dir)
         self.crypto_manager = CryptoManager()
         
+        # 加密备份使用紧凑格式序列化（不缩进），减少需要加密和写入的数据量
+        self._json_encoder = json.JSONEncoder(ensure_ascii=False, default=_json_default)
+        
+        # 备份列表缓存：(备份目录修改时间, 备份列表)
+        self._list_cache: Optional[Tuple[int, List[BackupInfo]]] = None
+        
         # 确保备份目录存在
         ensure_directory_exists(str(self.backup_dir))
     
@@ -96,6 +204,9 @@ class BackupManager:
                 
                 log_user_action("创建备份", f"文件: {backup_filename}, 大小: {format_file_size(file_size)}")
                 
+                # 新增了备份文件，使备份列表缓存失效
+                self._list_cache = None
+                
                 # 清理旧备份
                 self._cleanup_old_backups()
                 
@@ -121,9 +232,10 @@ class BackupManager:
                 'message': f'备份创建失败: {str(e)}'
             }
     
-    def restore_backup(self, backup_file: str, 
-                      backup_password: Optional[str] = None,
-                      overwrite_existing: bool = False) -> Dict[str, Any]:
+    def restore_backup(self, backup_file: str,
+                       backup_password: Optional[str] = None,
+                       overwrite_existing: bool = False,
+                       backup_master_password: Optional[str] = None) -> Dict[str, Any]:
         """
         从备份文件恢复数据
         
@@ -131,6 +243,8 @@ class BackupManager:
             backup_file (str): 备份文件名
             backup_password (Optional[str]): 备份文件密码
             overwrite_existing (bool): 是否覆盖现有数据
+            backup_master_password (Optional[str]): 创建备份时的主密码，
+                备份之后修改过主密码时用于将条目重新加密为当前主密码
             
         Returns:
             Dict[str, Any]: 恢复结果
@@ -169,7 +283,9 @@ class BackupManager:
                 }
             
             # 执行恢复操作
-            restore_result = self._restore_data(backup_data, overwrite_existing)
+            restore_result = self._restore_data(
+                backup_data, overwrite_existing, backup_master_password
+            )
             
             if restore_result['success']:
                 log_user_action("恢复备份", f"文件: {backup_file}, 恢复条目: {restore_result['restored_entries']}")
@@ -191,25 +307,35 @@ class BackupManager:
                 'message': f'数据恢复失败: {str(e)}'
             }
     
-    def list_backups(self) -> List[Dict[str, Any]]:
+    def list_backups(self) -> List[BackupInfo]:
         """
         列出所有备份文件
         
         Returns:
-            List[Dict[str, Any]]: 备份文件列表
+            List[BackupInfo]: 备份文件列表
         """
         backups = []
         
         try:
-            # 扫描备份目录
-            for file_path in self.backup_dir.glob(f"*{BACKUP_FILE_EXTENSION}"):
-                backups.append(self._get_backup_info(file_path, False))
-            
-            for file_path in self.backup_dir.glob(f"*{ENCRYPTED_BACKUP_EXTENSION}"):
-                backups.append(self._get_backup_info(file_path, True))
-            
-            # 按创建时间排序（最新的在前）
-            backups.sort(key=lambda x: x['created_at'], reverse=True)
+            # 目录中的文件没有增删时直接返回缓存的列表
+            dir_mtime = os.stat(self.backup_dir).st_mtime_ns
+            if self._list_cache is not None and self._list_cache[0] == dir_mtime:
+                return list(self._list_cache[1])
+            
+            # 一次扫描备份目录，复用目录项缓存的stat结果
+            with os.scandir(self.backup_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(BACKUP_SUFFIXES) or not entry.is_file():
+                        continue
+                    is_encrypted = entry.name.endswith(ENCRYPTED_BACKUP_EXTENSION)
+                    backups.append(self._get_backup_info(
+                        Path(entry.path), is_encrypted, entry.stat()
+                    ))
+            
+            # 按创建时间排序（最新的在前），直接比较原始时间戳
+            backups.sort(key=attrgetter('created_timestamp'), reverse=True)
+            self._list_cache = (dir_mtime, backups)
+            backups = list(backups)
             
         except Exception as e:
             log_system_event("备份列表获取错误", f"错误: {str(e)}")
@@ -237,6 +363,7 @@ class BackupManager:
             
             # 删除文件
             os.remove(backup_path)
+            self._list_cache = None
             
             log_user_action("删除备份", f"文件: {backup_file}")
             
@@ -252,7 +379,7 @@ class BackupManager:
                 'message': f'备份文件删除失败: {str(e)}'
             }
     
-    def get_backup_info(self, backup_file: str) -> Optional[Dict[str, Any]]:
+    def get_backup_info(self, backup_file: str) -> Optional[BackupInfo]:
         """
         获取备份文件详细信息
         
@@ -260,7 +387,7 @@ class BackupManager:
             backup_file (str): 备份文件名
             
         Returns:
-            Optional[Dict[str, Any]]: 备份文件信息
+            Optional[BackupInfo]: 备份文件信息
         """
         backup_path = self.backup_dir / backup_file
         
@@ -281,28 +408,28 @@ class BackupManager:
             Dict[str, Any]: 备份数据
         """
         backup_data = {
-            'version': '1.0',
-            'created_at': datetime.now().isoformat(),
+            'version': BACKUP_FORMAT_VERSION,
+            'created_at': datetime.now(),
+            'master_password': self.repository.get_master_password_hash(),
             'entries': [],
             'settings': None
         }
         
-        # 获取所有密码条目
-        entries = self.repository.get_password_entries()
-        for entry in entries:
-            # 解密密码用于备份
-            decrypted_password = self.repository.decrypt_password(entry)
-            
-            backup_data['entries'].append({
+        # 直接备份用主密码加密的密文，不解密也不在内存中产生明文密码
+        # 时间字段保留datetime对象，序列化时统一转换为ISO格式字符串
+        backup_data['entries'] = [
+            {
                 'id': entry.id,
                 'platform': entry.platform,
                 'username': entry.username,
-                'password': decrypted_password,  # 明文密码，稍后会重新加密
+                'encrypted_password': entry.encrypted_password,
                 'notes': entry.notes,
-                'created_at': entry.created_at.isoformat() if entry.created_at else None,
-                'updated_at': entry.updated_at.isoformat() if entry.updated_at else None,
-                'expires_at': entry.expires_at.isoformat() if entry.expires_at else None
-            })
+                'created_at': entry.created_at,
+                'updated_at': entry.updated_at,
+                'expires_at': entry.expires_at
+            }
+            for entry in self.repository.get_password_entries()
+        ]
         
         # 包含应用设置
         if include_settings:
@@ -326,21 +453,44 @@ class BackupManager:
             bool: 是否成功
         """
         try:
-            # 序列化数据
-            json_data = json.dumps(backup_data, ensure_ascii=False, indent=2)
-            
-            # 使用提供的密码或生成随机密码
+            # 使用提供的密码或生成随机密码，盐值写在文件头部
+            salt = self.crypto_manager.generate_salt()
             if password:
-                encryption_key = self.crypto_manager.derive_key_from_password(password)
+                encryption_key = self.crypto_manager.derive_key_from_password(
+                    password, salt
+                )
             else:
                 encryption_key = self.crypto_manager.generate_key()
             
-            # 加密数据
-            encrypted_data = self.crypto_manager.encrypt_data(json_data.encode('utf-8'), encryption_key)
-            
-            # 写入文件
-            with open(backup_path, 'wb') as f:
-                f.write(encrypted_data)
+            nonce, encryptor = self.crypto_manager.create_encryptor(encryption_key)
+            
+            # 分块压缩加密写入（zlib + AES-256-GCM）
+            # JSON重复的键名压缩率很高，压缩后需要加密和写入的数据量大幅减少
+            # 写入的同时计算SHA-256，不需要再读一遍文件；读取时不用密码即可发现文件损坏
+            # 文件格式：标识 || SHA-256 || 盐值 || nonce || 密文 || 认证标签
+            compressor = zlib.compressobj()
+            checksum = hashlib.sha256()
+            # 文件权限限制为仅所有者可读写
+            fd = os.open(backup_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+                def write(data: bytes):
+                    checksum.update(data)
+                    f.write(data)
+                
+                f.write(CHECKSUM_BACKUP_MAGIC)
+                f.write(bytes(BACKUP_CHECKSUM_LENGTH))  # 校验值占位，写完后回填
+                write(salt)
+                write(nonce)
+                
+                for chunk in self._iter_json_chunks(backup_data):
+                    compressed = compressor.compress(chunk)
+                    if compressed:
+                        write(encryptor.encrypt(compressed))
+                write(encryptor.encrypt(compressor.flush()))
+                write(encryptor.digest())
+                
+                f.seek(len(CHECKSUM_BACKUP_MAGIC))
+                f.write(checksum.digest())
             
             return True
             
@@ -360,8 +510,19 @@ class BackupManager:
             bool: 是否成功
         """
         try:
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+            # 写入只含一个JSON文件的压缩包
+            if ORJSON_AVAILABLE:
+                json_bytes = orjson.dumps(backup_data, option=orjson.OPT_INDENT_2)
+            else:
+                json_bytes = json.dumps(backup_data, ensure_ascii=False, indent=2,
+                                        default=_json_default).encode('utf-8')
+            
+            # 在内存中生成压缩包，再一次性写入文件
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+                zf.writestr(PLAIN_BACKUP_MEMBER, json_bytes)
+            
+            self._write_file(backup_path, archive.getbuffer())
             
             return True
             
@@ -369,6 +530,25 @@ class BackupManager:
             log_system_event("明文备份创建错误", f"错误: {str(e)}")
             return False
     
+    def _write_file(self, file_path: Path, data: bytes):
+        """
+        将数据一次性写入文件
+        
+        备份内容已完整地在内存中，直接用os.write写出，文件权限限制为仅所有者可读写
+        
+        Args:
+            file_path (Path): 文件路径
+            data (bytes): 文件内容
+        """
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+    
     def _read_encrypted_backup(self, backup_path: Path, 
                              password: Optional[str]) -> Optional[Dict[str, Any]]:
         """
@@ -385,26 +565,97 @@ class BackupManager:
             if not password:
                 return None
             
-            # 读取加密数据
-            with open(backup_path, 'rb') as f:
-                encrypted_data = f.read()
-            
-            # 派生解密密钥
-            decryption_key = self.crypto_manager.derive_key_from_password(password)
+            # 内存映射读取加密数据，解密时直接使用映射的内容，不再复制一份密文
+            with open(backup_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                # 带标识的备份在加密前经过压缩，没有标识的是未压缩的旧格式
+                magic = mm[:len(CHECKSUM_BACKUP_MAGIC)]
+                if magic == CHECKSUM_BACKUP_MAGIC:
+                    compressed = True
+                    header_length = len(CHECKSUM_BACKUP_MAGIC) + BACKUP_CHECKSUM_LENGTH
+                    
+                    # 先校验文件内容，损坏的文件不必再执行耗时的密钥派生
+                    stored_checksum = mm[len(CHECKSUM_BACKUP_MAGIC):header_length]
+                    with memoryview(mm) as view:
+                        actual_checksum = hashlib.sha256(view[header_length:]).digest()
+                    if not hmac.compare_digest(stored_checksum, actual_checksum):
+                        log_system_event("加密备份读取错误", f"文件校验失败: {backup_path.name}")
+                        return None
+                else:
+                    compressed = magic == COMPRESSED_BACKUP_MAGIC
+                    header_length = len(COMPRESSED_BACKUP_MAGIC) if compressed else 0
+                
+                # 使用文件头部的盐值派生解密密钥
+                salt_end = header_length + self.crypto_manager.salt_length
+                salt = mm[header_length:salt_end]
+                decryption_key = self.crypto_manager.derive_key_from_password(
+                    password, salt
+                )
+                
+                # 解密数据，认证标签校验失败时返回None
+                with memoryview(mm) as view:
+                    decrypted_data = self.crypto_manager.decrypt_data(
+                        view[salt_end:], decryption_key
+                    )
             
-            # 解密数据
-            decrypted_data = self.crypto_manager.decrypt_data(encrypted_data, decryption_key)
             if not decrypted_data:
                 return None
             
+            if compressed:
+                decrypted_data = zlib.decompress(decrypted_data)
+            
             # 解析JSON
-            json_data = decrypted_data.decode('utf-8')
-            return json.loads(json_data)
+            return self._loads_json(decrypted_data)
             
         except Exception as e:
             log_system_event("加密备份读取错误", f"错误: {str(e)}")
             return None
     
+    def _iter_json_chunks(self, backup_data: Dict[str, Any]):
+        """
+        将备份数据序列化为UTF-8编码的JSON，按块依次产出
+        
+        Args:
+            backup_data (Dict[str, Any]): 备份数据
+            
+        Yields:
+            bytes: JSON数据块
+        """
+        # orjson一次性序列化的速度远高于标准库，结果按块切分后再压缩加密
+        if ORJSON_AVAILABLE:
+            json_bytes = memoryview(orjson.dumps(backup_data))
+            for start in range(0, len(json_bytes), ENCRYPT_CHUNK_SIZE):
+                yield json_bytes[start:start + ENCRYPT_CHUNK_SIZE]
+            return
+        
+        # 标准库边序列化边产出，不在内存中生成完整的JSON字符串
+        buffer = []
+        buffered = 0
+        for chunk in self._json_encoder.iterencode(backup_data):
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= ENCRYPT_CHUNK_SIZE:
+                yield ''.join(buffer).encode('utf-8')
+                buffer.clear()
+                buffered = 0
+        
+        if buffer:
+            yield ''.join(buffer).encode('utf-8')
+    
+    def _loads_json(self, data: bytes) -> Dict[str, Any]:
+        """
+        解析UTF-8编码的JSON数据
+        
+        Args:
+            data (bytes): JSON数据
+            
+        Returns:
+            Dict[str, Any]: 解析结果
+        """
+        if ORJSON_AVAILABLE:
+            return orjson.loads(data)
+        return json.loads(data)
+    
     def _read_plain_backup(self, backup_path: Path) -> Optional[Dict[str, Any]]:
         """
         读取明文备份文件
@@ -416,9 +667,15 @@ class BackupManager:
             Optional[Dict[str, Any]]: 备份数据
         """
         try:
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-                
+            # 压缩包格式的备份，读取其中的JSON文件
+            if zipfile.is_zipfile(backup_path):
+                with zipfile.ZipFile(backup_path, 'r') as zf:
+                    return self._loads_json(zf.read(PLAIN_BACKUP_MEMBER))
+
+            # 兼容未压缩的旧格式备份
+            with open(backup_path, 'rb') as f:
+                return self._loads_json(f.read())
+
         except Exception as e:
             log_system_event("明文备份读取错误", f"错误: {str(e)}")
             return None
@@ -435,8 +692,7 @@ class BackupManager:
         """
         try:
             # 检查必需字段
-            required_fields = ['version', 'created_at', 'entries']
-            for field in required_fields:
+            for field in BACKUP_REQUIRED_FIELDS:
                 if field not in backup_data:
                     return {
                         'is_valid': False,
@@ -450,15 +706,17 @@ class BackupManager:
                     'error': '条目数据格式错误'
                 }
             
-            # 检查每个条目的必需字段
-            entry_required_fields = ['platform', 'username', 'password']
+            # 检查每个条目的必需字段，每个条目只做一次集合差运算
             for i, entry in enumerate(backup_data['entries']):
-                for field in entry_required_fields:
-                    if field not in entry:
-                        return {
-                            'is_valid': False,
-                            'error': f'条目{i+1}缺少必需字段: {field}'
-                        }
+                missing = _ENTRY_REQUIRED_SET - entry.keys()
+                if missing or entry.keys().isdisjoint(ENTRY_PASSWORD_FIELDS):
+                    field = next(
+                        (f for f in ENTRY_REQUIRED_FIELDS if f in missing), 'password'
+                    )
+                    return {
+                        'is_valid': False,
+                        'error': f'条目{i+1}缺少必需字段: {field}'
+                    }
             
             return {'is_valid': True}
             
@@ -468,14 +726,16 @@ class BackupManager:
                 'error': f'数据验证错误: {str(e)}'
             }
     
-    def _restore_data(self, backup_data: Dict[str, Any], 
-                     overwrite_existing: bool) -> Dict[str, Any]:
+    def _restore_data(self, backup_data: Dict[str, Any],
+                      overwrite_existing: bool,
+                      backup_master_password: Optional[str] = None) -> Dict[str, Any]:
         """
         执行数据恢复
         
         Args:
             backup_data (Dict[str, Any]): 备份数据
             overwrite_existing (bool): 是否覆盖现有数据
+            backup_master_password (Optional[str]): 创建备份时的主密码
             
         Returns:
             Dict[str, Any]: 恢复结果
@@ -484,19 +744,45 @@ class BackupManager:
         skipped_entries = 0
         
         try:
+            entries = backup_data['entries']
+            
+            # 密文条目只能直接恢复到使用同一主密码的数据库中，
+            # 主密码不同时（如备份后修改过主密码）用备份时的主密码解密后重新加密
+            master_password = backup_data.get('master_password')
+            if (master_password
+                    and not self.repository.matches_master_password(master_password)):
+                if not backup_master_password:
+                    return {
+                        'success': False,
+                        'message': '备份使用的主密码与当前主密码不同，请提供创建备份时的主密码'
+                    }
+                
+                entries = self._decrypt_backup_entries(
+                    entries, master_password, backup_master_password
+                )
+                if entries is None:
+                    return {
+                        'success': False,
+                        'message': '创建备份时的主密码错误，无法恢复'
+                    }
+            
+            # 一次性建立现有条目的(平台, 用户名)索引，恢复时按键查找
+            existing = {
+                (e.platform, e.username): e.id
+                for e in self.repository.get_password_entries()
+            }
+            
             # 恢复密码条目
-            for entry_data in backup_data['entries']:
+            for entry_data in entries:
                 platform = entry_data['platform']
                 username = entry_data['username']
-                password = entry_data['password']
+                encrypted_password = entry_data.get('encrypted_password')
+                password = entry_data.get('password')
                 notes = entry_data.get('notes', '')
+                key = (platform, username)
                 
                 # 检查是否已存在
-                existing_entries = self.repository.get_password_entries(f"{platform} {username}")
-                entry_exists = any(
-                    e.platform == platform and e.username == username 
-                    for e in existing_entries
-                )
+                entry_exists = key in existing
                 
                 if entry_exists and not overwrite_existing:
                     skipped_entries += 1
@@ -504,19 +790,37 @@ class BackupManager:
                 
                 # 添加或更新条目
                 if entry_exists and overwrite_existing:
-                    # 找到现有条目并更新
-                    for existing_entry in existing_entries:
-                        if existing_entry.platform == platform and existing_entry.username == username:
-                            success = self.repository.update_password_entry(
-                                existing_entry.id, platform, username, password, notes
-                            )
-                            if success:
-                                restored_entries += 1
-                            break
+                    entry_id = existing[key]
+                    if entry_id is None:
+                        # 本次恢复中新添加的条目，查找其ID
+                        entry_id = next(
+                            e.id for e in self.repository.get_password_entries(platform)
+                            if e.platform == platform and e.username == username
+                        )
+                        existing[key] = entry_id
+                    
+                    if encrypted_password is not None:
+                        success = self.repository.update_password_entry_raw(
+                            entry_id, platform, username, encrypted_password, notes
+                        )
+                    else:
+                        success = self.repository.update_password_entry(
+                            entry_id, platform, username, password, notes
+                        )
+                    if success:
+                        restored_entries += 1
                 else:
-                    # 添加新条目
-                    success = self.repository.add_password_entry(platform, username, password, notes)
+                    # 添加新条目，备份中重复的条目之后按已存在处理
+                    if encrypted_password is not None:
+                        success = self.repository.add_password_entry_raw(
+                            platform, username, encrypted_password, notes
+                        )
+                    else:
+                        success = self.repository.add_password_entry(
+                            platform, username, password, notes
+                        )
                     if success:
+                        existing[key] = None
                         restored_entries += 1
             
             # 恢复应用设置
@@ -538,51 +842,107 @@ class BackupManager:
                 'message': f'数据恢复失败: {str(e)}'
             }
     
-    def _get_backup_info(self, file_path: Path, is_encrypted: bool) -> Dict[str, Any]:
+    def _decrypt_backup_entries(self, entries: List[Dict[str, Any]],
+                                hash_info: Dict[str, str],
+                                master_password: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        用创建备份时的主密码解密备份条目中的密文
+        
+        Args:
+            entries (List[Dict[str, Any]]): 备份条目
+            hash_info (Dict[str, str]): 备份中保存的主密码哈希和盐值
+            master_password (str): 创建备份时的主密码
+            
+        Returns:
+            Optional[List[Dict[str, Any]]]: 密码字段为明文的条目，主密码错误或解密失败时返回None
+        """
+        crypto_service = self.repository.crypto_service
+        if not crypto_service.verify_password(
+            master_password, hash_info['hash'], hash_info['salt']
+        ):
+            return None
+        
+        # 只解密保存密文的条目，旧格式的明文条目原样保留
+        encrypted_indexes = [
+            i for i, entry_data in enumerate(entries)
+            if entry_data.get('encrypted_password') is not None
+        ]
+        encrypted_infos = []
+        for i in encrypted_indexes:
+            try:
+                encrypted_infos.append(json.loads(entries[i]['encrypted_password']))
+            except (TypeError, ValueError):
+                return None
+        
+        passwords = crypto_service.decrypt_data_batch(encrypted_infos, master_password)
+        if any(password is None for password in passwords):
+            return None
+        
+        # 明文密码之后由当前主密码重新加密
+        decrypted_entries = list(entries)
+        for i, password in zip(encrypted_indexes, passwords):
+            entry_data = dict(entries[i])
+            del entry_data['encrypted_password']
+            entry_data['password'] = password
+            decrypted_entries[i] = entry_data
+        
+        return decrypted_entries
+    
+    def _get_backup_info(self, file_path: Path, is_encrypted: bool,
+                         stat: Optional[os.stat_result] = None) -> BackupInfo:
         """
         获取备份文件信息
         
         Args:
             file_path (Path): 文件路径
             is_encrypted (bool): 是否为加密文件
+            stat (Optional[os.stat_result]): 已获取的文件状态，为None时重新读取
             
         Returns:
-            Dict[str, Any]: 文件信息
+            BackupInfo: 文件信息
         """
-        stat = file_path.stat()
+        if stat is None:
+            stat = file_path.stat()
         
-        return {
-            'filename': file_path.name,
-            'file_path': str(file_path),
-            'file_size': stat.st_size,
-            'file_size_formatted': format_file_size(stat.st_size),
-            'created_at': datetime.fromtimestamp(stat.st_ctime),
-            'modified_at': datetime.fromtimestamp(stat.st_mtime),
-            'is_encrypted': is_encrypted
-        }
+        return BackupInfo(
+            filename=file_path.name,
+            file_path=str(file_path),
+            file_size=stat.st_size,
+            created_timestamp=stat.st_ctime,
+            modified_timestamp=stat.st_mtime,
+            is_encrypted=is_encrypted
+        )
     
     def _cleanup_old_backups(self):
         """
         清理过期的备份文件
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=BACKUP_RETENTION_DAYS)
-            deleted_count = 0
-            
-            # 扫描所有备份文件
-            for pattern in [f"*{BACKUP_FILE_EXTENSION}", f"*{ENCRYPTED_BACKUP_EXTENSION}"]:
-                for file_path in self.backup_dir.glob(pattern):
-                    file_time = datetime.fromtimestamp(file_path.stat().st_ctime)
-                    
-                    if file_time < cutoff_date:
-                        try:
-                            os.remove(file_path)
-                            deleted_count += 1
-                        except Exception as e:
-                            log_system_event("备份清理错误", f"文件: {file_path.name}, 错误: {str(e)}")
-            
+            cutoff = datetime.now() - timedelta(days=BACKUP_RETENTION_DAYS)
+            cutoff_time = cutoff.timestamp()
+            
+            # 一次扫描收集所有过期备份文件，直接比较时间戳
+            with os.scandir(self.backup_dir) as it:
+                expired = [
+                    entry for entry in it
+                    if entry.name.endswith(BACKUP_SUFFIXES) and entry.is_file()
+                    and entry.stat().st_ctime < cutoff_time
+                ]
+            
+            # 批量删除，失败的文件汇总后只记录一条日志
+            failed = []
+            for entry in expired:
+                try:
+                    os.unlink(entry.path)
+                except OSError as e:
+                    failed.append(f"{entry.name}({e.strerror})")
+            
+            deleted_count = len(expired) - len(failed)
             if deleted_count > 0:
+                self._list_cache = None
                 log_system_event("备份清理", f"删除了{deleted_count}个过期备份文件")
+            if failed:
+                log_system_event("备份清理错误", f"{len(failed)}个文件删除失败: {', '.join(failed)}")
                 
         except Exception as e:
             log_system_event("备份清理错误", f"错误: {str(e)}")
\ No newline at end of file
@@ -8,7 +8,11 @@
 
 import os
 import shutil
+import fnmatch
 import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from stat import S_ISDIR, S_ISREG
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 from pathlib import Path
@@ -25,6 +29,34 @@ from config.constants import (
 )
 
 
+# copy_file_range单次调用复制的最大字节数，取较大值以减少系统调用次数
+COPY_CHUNK_SIZE = 64 * 1024 * 1024
+
+# 计算多个文件哈希时共用的线程池，首次使用时创建
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    """
+    获取计算文件哈希的线程池
+    
+    hashlib计算较大数据的哈希时会释放GIL，文件读取同样不占用GIL，
+    多个文件可以在线程池中并行处理。
+    
+    Returns:
+        ThreadPoolExecutor: 线程池
+    """
+    global _hash_executor
+    if _hash_executor is None:
+        with _hash_executor_lock:
+            if _hash_executor is None:
+                _hash_executor = ThreadPoolExecutor(
+                    max_workers=os.cpu_count(), thread_name_prefix="file-hash"
+                )
+    return _hash_executor
+
+
 class FileManager:
     """
     文件管理器
@@ -47,8 +79,8 @@ class FileManager:
         ensure_directory_exists(str(self.data_dir))
         ensure_directory_exists(str(self.temp_dir))
     
-    def create_file(self, filename: str, content: bytes, 
-                   subdirectory: str = "") -> Dict[str, Any]:
+    def create_file(self, filename: str, content: bytes,
+                    subdirectory: str = "", durable: bool = False) -> Dict[str, Any]:
         """
         创建文件
         
@@ -56,6 +88,7 @@ class FileManager:
             filename (str): 文件名
             content (bytes): 文件内容
             subdirectory (str): 子目录名
+            durable (bool): 是否在返回前将数据同步到磁盘
             
         Returns:
             Dict[str, Any]: 创建结果
@@ -87,8 +120,7 @@ class FileManager:
             
             # 如果文件已存在，生成唯一文件名
             if file_path.exists():
-                unique_filename = generate_unique_filename(str(file_path))
-                file_path = target_dir / unique_filename
+                file_path = generate_unique_filename(target_dir, filename)
             
             # 检查磁盘空间
             available_space = get_available_disk_space(str(target_dir))
@@ -99,11 +131,10 @@ class FileManager:
                 }
             
             # 写入文件
-            with open(file_path, 'wb') as f:
-                f.write(content)
+            self._write_file_data(file_path, content, durable)
             
-            # 计算文件哈希
-            file_hash = calculate_file_hash(str(file_path))
+            # 计算文件哈希（内容已在内存中，不必重新读取文件）
+            file_hash = hashlib.sha256(content).hexdigest()
             
             log_user_action("创建文件", f"文件: {file_path.name}, 大小: {format_file_size(len(content))}")
             
@@ -163,8 +194,8 @@ class FileManager:
             with open(path, 'rb') as f:
                 content = f.read()
             
-            # 计算文件哈希
-            file_hash = calculate_file_hash(str(path))
+            # 计算文件哈希（直接使用读取的内容，不必再读一遍文件）
+            file_hash = hashlib.sha256(content).hexdigest()
             
             log_user_action("读取文件", f"文件: {path.name}, 大小: {format_file_size(file_size)}")
             
@@ -183,8 +214,8 @@ class FileManager:
                 'message': f'文件读取失败: {str(e)}'
             }
     
-    def write_file(self, file_path: str, content: bytes, 
-                  create_backup: bool = True) -> Dict[str, Any]:
+    def write_file(self, file_path: str, content: bytes,
+                   create_backup: bool = True, durable: bool = False) -> Dict[str, Any]:
         """
         写入文件
         
@@ -192,6 +223,7 @@ class FileManager:
             file_path (str): 文件路径
             content (bytes): 文件内容
             create_backup (bool): 是否创建备份
+            durable (bool): 是否在返回前将数据同步到磁盘
             
         Returns:
             Dict[str, Any]: 写入结果
@@ -225,11 +257,10 @@ class FileManager:
             ensure_directory_exists(str(path.parent))
             
             # 写入文件
-            with open(path, 'wb') as f:
-                f.write(content)
+            self._write_file_data(path, content, durable)
             
-            # 计算文件哈希
-            file_hash = calculate_file_hash(str(path))
+            # 计算文件哈希（内容已在内存中，不必重新读取文件）
+            file_hash = hashlib.sha256(content).hexdigest()
             
             log_user_action("写入文件", f"文件: {path.name}, 大小: {format_file_size(len(content))}")
             
@@ -353,7 +384,7 @@ class FileManager:
             ensure_directory_exists(str(dest.parent))
             
             # 复制文件
-            shutil.copy2(source, dest)
+            self._copy_file_data(source, dest)
             
             log_user_action("复制文件", f"从 {source.name} 到 {dest.name}")
             
@@ -454,7 +485,7 @@ class FileManager:
             backup_path = source.parent / backup_name
             
             # 复制文件
-            shutil.copy2(source, backup_path)
+            self._copy_file_data(source, backup_path)
             
             log_user_action("创建文件备份", f"文件: {source.name}, 备份: {backup_name}")
             
@@ -472,6 +503,72 @@ class FileManager:
                 'message': f'文件备份失败: {str(e)}'
             }
     
+    def _write_file_data(self, path: Path, content: bytes, durable: bool = False):
+        """
+        将内容一次性写入文件
+        
+        支持时先用posix_fallocate预分配全部空间，文件系统可以一次分配连续的区块；
+        再直接用os.write写出，不经过Python文件对象的缓冲。
+        新建的文件权限限制为仅所有者可读写。
+        
+        Args:
+            path (Path): 文件路径
+            content (bytes): 文件内容
+            durable (bool): 是否调用fsync将数据同步到磁盘（小文件写入时耗时占比最大）
+        """
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            if content and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(fd, 0, len(content))
+                except OSError:
+                    # 文件系统不支持预分配时直接写入
+                    pass
+            
+            view = memoryview(content)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            
+            if durable:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    def _copy_file_data(self, source: Path, dest: Path):
+        """
+        复制文件内容和元数据
+        
+        Linux上优先使用copy_file_range在内核中复制，支持写时复制的文件系统（btrfs、XFS等）
+        可以直接共享数据块；不支持时回退到shutil.copy2（内部使用sendfile）。
+        
+        Args:
+            source (Path): 源文件路径
+            dest (Path): 目标文件路径
+        """
+        if hasattr(os, 'copy_file_range'):
+            try:
+                with open(source, 'rb') as fsrc, open(dest, 'wb') as fdst:
+                    expected = os.fstat(fsrc.fileno()).st_size
+                    copied = 0
+                    while True:
+                        count = os.copy_file_range(
+                            fsrc.fileno(), fdst.fileno(), COPY_CHUNK_SIZE
+                        )
+                        if not count:
+                            break
+                        copied += count
+                # 某些文件系统（如procfs、部分网络文件系统）会返回0而不复制数据，
+                # 复制的字节数不足时回退到普通复制
+                if copied == expected:
+                    shutil.copystat(source, dest)
+                    return
+            except OSError:
+                # 跨文件系统或内核不支持时回退
+                pass
+        
+        shutil.copy2(source, dest)
+    
     def create_temp_file(self, content: bytes, 
                         filename_prefix: str = "temp") -> Dict[str, Any]:
         """
@@ -572,32 +669,49 @@ class FileManager:
                 return None
             
             stat = path.stat()
-            file_hash = calculate_file_hash(str(path))
+            file_hash = calculate_file_hash(path) if S_ISREG(stat.st_mode) else None
             
-            return {
-                'filename': path.name,
-                'file_path': str(path),
-                'file_size': stat.st_size,
-                'file_size_formatted': format_file_size(stat.st_size),
-                'file_hash': file_hash,
-                'created_at': datetime.fromtimestamp(stat.st_ctime),
-                'modified_at': datetime.fromtimestamp(stat.st_mtime),
-                'is_file': path.is_file(),
-                'is_directory': path.is_dir(),
-                'extension': path.suffix.lower()
-            }
+            return self._build_file_info(path, stat, file_hash)
             
         except Exception as e:
             log_system_event("文件信息获取错误", f"文件: {file_path}, 错误: {str(e)}")
             return None
     
-    def list_files(self, directory: str = "", pattern: str = "*") -> List[Dict[str, Any]]:
+    def _build_file_info(self, path: Path, stat: os.stat_result,
+                         file_hash: Optional[str]) -> Dict[str, Any]:
+        """
+        根据已获取的文件状态构建文件信息
+        
+        Args:
+            path (Path): 文件路径
+            stat (os.stat_result): 文件状态
+            file_hash (Optional[str]): 文件哈希，未计算时为None
+            
+        Returns:
+            Dict[str, Any]: 文件信息
+        """
+        return {
+            'filename': path.name,
+            'file_path': str(path),
+            'file_size': stat.st_size,
+            'file_size_formatted': format_file_size(stat.st_size),
+            'file_hash': file_hash,
+            'created_at': datetime.fromtimestamp(stat.st_ctime),
+            'modified_at': datetime.fromtimestamp(stat.st_mtime),
+            'is_file': S_ISREG(stat.st_mode),
+            'is_directory': S_ISDIR(stat.st_mode),
+            'extension': path.suffix.lower()
+        }
+    
+    def list_files(self, directory: str = "", pattern: str = "*",
+                   include_hash: bool = False) -> List[Dict[str, Any]]:
         """
         列出目录中的文件
         
         Args:
             directory (str): 目录路径（相对于数据目录）
-            pattern (str): 文件匹配模式
+            pattern (str): 文件名匹配模式
+            include_hash (bool): 是否计算每个文件的哈希，不计算时file_hash为None
             
         Returns:
             List[Dict[str, Any]]: 文件列表
@@ -611,17 +725,40 @@ class FileManager:
             if not target_dir.exists():
                 return []
             
-            files = []
-            for file_path in target_dir.glob(pattern):
-                if file_path.is_file():
-                    file_info = self.get_file_info(str(file_path))
-                    if file_info:
-                        files.append(file_info)
-            
-            # 按修改时间排序（最新的在前）
-            files.sort(key=lambda x: x['modified_at'], reverse=True)
+            scanned = []
+            if '/' in pattern or '**' in pattern:
+                # 含路径分隔符或递归通配的模式交给Path.glob处理
+                for file_path in target_dir.glob(pattern):
+                    if file_path.is_file():
+                        scanned.append((file_path, file_path.stat()))
+            else:
+                # 一次扫描目录，复用目录项缓存的类型和stat结果；
+                # 与glob一致，模式不以"."开头时不匹配隐藏文件
+                match_hidden = pattern.startswith('.')
+                with os.scandir(target_dir) as it:
+                    for entry in it:
+                        if entry.name.startswith('.') and not match_hidden:
+                            continue
+                        if fnmatch.fnmatch(entry.name, pattern) and entry.is_file():
+                            scanned.append((Path(entry.path), entry.stat()))
+            
+            # 按修改时间排序（最新的在前），直接比较原始时间戳
+            scanned.sort(key=lambda item: item[1].st_mtime, reverse=True)
+            
+            # 需要哈希时在线程池中并行计算，结果与文件顺序一致
+            if include_hash and len(scanned) > 1:
+                hashes = list(_get_hash_executor().map(
+                    calculate_file_hash, [path for path, _ in scanned]
+                ))
+            elif include_hash:
+                hashes = [calculate_file_hash(path) for path, _ in scanned]
+            else:
+                hashes = [None] * len(scanned)
             
-            return files
+            return [
+                self._build_file_info(path, stat, file_hash)
+                for (path, stat), file_hash in zip(scanned, hashes)
+            ]
             
         except Exception as e:
             log_system_event("文件列表获取错误", f"目录: {directory}, 错误: {str(e)}")
@@ -652,10 +789,21 @@ class FileManager:
             total_size = 0
             file_count = 0
             
-            for file_path in target_dir.rglob("*"):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-                    file_count += 1
+            # 用栈代替递归逐层扫描，文件大小取自目录项缓存的stat结果
+            pending = [str(target_dir)]
+            while pending:
+                try:
+                    it = os.scandir(pending.pop())
+                except PermissionError:
+                    # 与rglob一致，跳过无权限访问的目录
+                    continue
+                with it:
+                    for entry in it:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending.append(entry.path)
+                        elif entry.is_file():
+                            total_size += entry.stat().st_size
+                            file_count += 1
             
             return {
                 'success': True,
@@ -6,13 +6,18 @@
 定义应用程序中使用的数据模型和结构
 """
 
+import sys
 import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 from dataclasses import dataclass, asdict
 import json
 
 
+# 频繁创建的结果对象使用__slots__（Python 3.10起支持）
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
 @dataclass
 class PasswordEntry:
     """
@@ -246,6 +251,53 @@ class AppSettings:
         self.updated_at = datetime.now()
 
 
+@dataclass(frozen=True, **_SLOTS)
+class AuthResult:
+    """
+    身份验证操作结果
+    
+    登录、创建主密码和修改主密码的返回值
+    """
+    success: bool
+    message: str
+    locked_out: bool = False
+    rate_limited: bool = False  # 是否因尝试过于频繁被拒绝
+    remaining_time: Optional[int] = None  # 剩余锁定时间（秒）
+    remaining_attempts: Optional[int] = None  # 剩余尝试次数
+    errors: Tuple[str, ...] = ()
+    warnings: Tuple[str, ...] = ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典格式
+        
+        Returns:
+            Dict[str, Any]: 字典格式的数据
+        """
+        return asdict(self)
+
+
+@dataclass(frozen=True, **_SLOTS)
+class SessionInfo:
+    """
+    登录会话信息
+    """
+    authenticated: bool
+    login_time: Optional[datetime] = None
+    session_duration: Optional[int] = None  # 会话时长（秒）
+    last_activity: Optional[int] = None  # 距最后活动的时间（秒）
+    auto_lock_timeout: Optional[int] = None  # 自动锁定超时时间（秒）
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        转换为字典格式
+        
+        Returns:
+            Dict[str, Any]: 字典格式的数据
+        """
+        return asdict(self)
+
+
 class DataStore:
     """
     数据存储容器
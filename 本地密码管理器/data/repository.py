@@ -7,6 +7,7 @@
 """
 
 import os
+import hmac
 import json
 import shutil
 from datetime import datetime
@@ -229,6 +230,32 @@ class DataRepository:
             )
             encrypted_password = json.dumps(encrypted_info)
             
+        except Exception as e:
+            print(f"添加密码条目失败: {e}")
+            return False
+        
+        return self.add_password_entry_raw(
+            platform, username, encrypted_password, notes
+        )
+    
+    def add_password_entry_raw(self, platform: str, username: str,
+                               encrypted_password: str, notes: str = "") -> bool:
+        """
+        添加已加密的密码条目，密文原样保存
+        
+        Args:
+            platform (str): 平台名称
+            username (str): 用户名
+            encrypted_password (str): 用当前主密码加密的密码信息（JSON字符串）
+            notes (str): 备注信息
+            
+        Returns:
+            bool: 是否添加成功
+        """
+        if not self.is_loaded():
+            return False
+        
+        try:
             # 创建密码条目
             entry = PasswordEntry(
                 platform=platform,
@@ -333,6 +360,32 @@ class DataRepository:
             )
             encrypted_password = json.dumps(encrypted_info)
             
+        except Exception as e:
+            print(f"更新密码条目失败: {e}")
+            return False
+        
+        return self.update_password_entry_raw(entry_id, platform, username,
+                                              encrypted_password, notes)
+    
+    def update_password_entry_raw(self, entry_id: str, platform: str, username: str,
+                                  encrypted_password: str, notes: str = "") -> bool:
+        """
+        使用已加密的密码更新密码条目，密文原样保存
+        
+        Args:
+            entry_id (str): 条目ID
+            platform (str): 平台名称
+            username (str): 用户名
+            encrypted_password (str): 用当前主密码加密的密码信息（JSON字符串）
+            notes (str): 备注信息
+            
+        Returns:
+            bool: 是否更新成功
+        """
+        if not self.is_loaded():
+            return False
+        
+        try:
             # 创建更新后的条目
             updated_entry = PasswordEntry(
                 platform=platform,
@@ -389,8 +442,9 @@ class DataRepository:
         if not self.is_loaded():
             return False
         
-        # 验证旧密码
-        if old_password != self._master_password:
+        # 验证旧密码（常量时间比较）
+        if not hmac.compare_digest(old_password.encode('utf-8'),
+                                   self._master_password.encode('utf-8')):
             return False
         
         try:
@@ -428,6 +482,38 @@ class DataRepository:
             print(f"修改主密码失败: {e}")
             return False
     
+    def get_master_password_hash(self) -> Optional[Dict[str, str]]:
+        """
+        获取主密码的哈希和盐值
+        
+        Returns:
+            Optional[Dict[str, str]]: 包含哈希和盐值的字典，数据库未加载时返回None
+        """
+        if not self.is_loaded() or self._data_store.master_config is None:
+            return None
+        
+        master_config = self._data_store.master_config
+        return {'hash': master_config.password_hash, 'salt': master_config.salt}
+    
+    def matches_master_password(self, hash_info: Dict[str, str]) -> bool:
+        """
+        检查当前主密码是否与给定的哈希一致
+        
+        用于判断用其他数据库的主密码加密的密文能否在当前数据库中解密。
+        
+        Args:
+            hash_info (Dict[str, str]): 包含哈希和盐值的字典
+            
+        Returns:
+            bool: 是否一致
+        """
+        if not self.is_loaded():
+            return False
+        
+        return self.crypto_service.verify_password(
+            self._master_password, hash_info['hash'], hash_info['salt']
+        )
+    
     def get_expired_entries(self) -> List[PasswordEntry]:
         """
         获取已过期的密码条目
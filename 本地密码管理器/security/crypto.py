@@ -9,13 +9,31 @@
 import os
 import base64
 import hashlib
-from typing import Optional
+from functools import lru_cache
+from typing import List, Optional
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
 from Crypto.Protocol.KDF import PBKDF2
 from Crypto.Hash import SHA256
 
 
+@lru_cache(maxsize=8)
+def _derive_backup_key(password: bytes, salt: bytes,
+                       key_length: int, iterations: int) -> bytes:
+    """
+    派生备份密钥（带缓存）
+    
+    同一密码和盐值重复派生时直接返回缓存的密钥，跳过耗时的PBKDF2计算
+    """
+    return PBKDF2(
+        password,
+        salt,
+        key_length,
+        count=iterations,
+        hmac_hash_module=SHA256
+    )
+
+
 class CryptoService:
     """
     加密服务类
@@ -130,6 +148,21 @@ class CryptoService:
         except Exception:
             return None
     
+    def decrypt_data_batch(self, encrypted_infos: List[dict],
+                           password: str) -> List[Optional[str]]:
+        """
+        批量解密数据
+        
+        Args:
+            encrypted_infos (List[dict]): 包含加密数据、盐值和IV的字典列表
+            password (str): 解密密码
+            
+        Returns:
+            List[Optional[str]]: 与输入顺序一致的解密结果，解密失败的位置为None
+        """
+        return [self.decrypt_data(encrypted_info, password)
+                for encrypted_info in encrypted_infos]
+    
     def hash_password(self, password: str, salt: bytes = None) -> dict:
         """
         哈希密码用于存储
@@ -215,4 +248,124 @@ class CryptoService:
             bytes: 去除填充后的数据
         """
         padding_length = data[-1]
-        return data[:-padding_length]
\ No newline at end of file
+        return data[:-padding_length]
+
+
+class CryptoManager:
+    """
+    备份加密管理器
+    
+    使用AES-256-GCM加密备份文件。pycryptodome的AES和GHASH实现在支持的CPU上
+    会自动使用AES-NI/PCLMULQDQ（x86）或ARMv8加密扩展，适合对大块数据整体加密。
+    加密结果格式为 nonce || 密文 || 认证标签，标签在末尾便于流式写入。
+    """
+    
+    def __init__(self):
+        """
+        初始化备份加密管理器
+        """
+        self.key_length = 32    # AES-256
+        self.nonce_length = 12  # GCM推荐的nonce长度
+        self.tag_length = 16    # GCM认证标签长度
+        self.salt_length = 32   # 盐值长度
+        self.iterations = 100000  # PBKDF2迭代次数
+    
+    def generate_key(self) -> bytes:
+        """
+        生成随机加密密钥
+        
+        Returns:
+            bytes: 32字节的随机密钥
+        """
+        return get_random_bytes(self.key_length)
+    
+    def generate_salt(self) -> bytes:
+        """
+        生成随机盐值
+        
+        Returns:
+            bytes: 32字节的随机盐值
+        """
+        return get_random_bytes(self.salt_length)
+    
+    def derive_key_from_password(self, password: str, salt: bytes) -> bytes:
+        """
+        从密码和盐值派生加密密钥
+        
+        派生结果按（密码, 盐值）缓存，连续读取同一备份时不会重复计算PBKDF2。
+        
+        Args:
+            password (str): 密码
+            salt (bytes): 盐值
+            
+        Returns:
+            bytes: 派生的32字节密钥
+        """
+        return _derive_backup_key(
+            password.encode('utf-8'), bytes(salt), self.key_length, self.iterations
+        )
+    
+    @staticmethod
+    def clear_key_cache():
+        """
+        清空派生密钥缓存，注销时调用以免密钥在内存中残留
+        """
+        _derive_backup_key.cache_clear()
+    
+    def encrypt_data(self, data: bytes, key: bytes) -> bytes:
+        """
+        加密数据
+        
+        Args:
+            data (bytes): 要加密的数据
+            key (bytes): 加密密钥
+            
+        Returns:
+            bytes: nonce || 密文 || 认证标签
+        """
+        nonce = get_random_bytes(self.nonce_length)
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=self.tag_length)
+        ciphertext, tag = cipher.encrypt_and_digest(data)
+        return nonce + ciphertext + tag
+    
+    def create_encryptor(self, key: bytes):
+        """
+        创建流式加密器，用于分块加密大数据
+        
+        依次调用encrypt()加密各个数据块，最后调用digest()获取认证标签，
+        按 nonce || 各块密文 || 认证标签 写出即与encrypt_data()的结果格式相同。
+        
+        Args:
+            key (bytes): 加密密钥
+            
+        Returns:
+            tuple: (nonce, GCM加密器)
+        """
+        nonce = get_random_bytes(self.nonce_length)
+        return nonce, AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=self.tag_length)
+    
+    def decrypt_data(self, data: bytes, key: bytes) -> Optional[bytes]:
+        """
+        解密数据并校验认证标签
+        
+        Args:
+            data (bytes): nonce || 密文 || 认证标签，可以是任何支持缓冲区协议的对象（如mmap）
+            key (bytes): 解密密钥
+            
+        Returns:
+            Optional[bytes]: 解密后的数据，密钥错误或数据被篡改时返回None
+        """
+        if len(data) < self.nonce_length + self.tag_length:
+            return None
+        
+        # 通过memoryview切片，不复制密文
+        data = memoryview(data)
+        nonce = data[:self.nonce_length]
+        ciphertext = data[self.nonce_length:-self.tag_length]
+        tag = data[-self.tag_length:]
+        
+        try:
+            cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=self.tag_length)
+            return cipher.decrypt_and_verify(ciphertext, tag)
+        except ValueError:
+            return None
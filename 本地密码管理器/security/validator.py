@@ -6,8 +6,21 @@
 提供输入数据验证功能，确保数据的有效性和安全性
 """
 
+import hashlib
+import hmac
 import re
-from typing import List, Dict, Any
+import secrets
+from typing import Dict, Any, Optional, Tuple
+
+
+# 主密码中视为特殊符号的字符
+MASTER_PASSWORD_SYMBOLS = '!@#$%^&*()_+-=[]{}|;:,.<>?"\'\''
+
+# 常见弱密码（小写）
+WEAK_PASSWORDS = frozenset({
+    'password', '12345678', 'qwerty123', 'admin123',
+    'password123', '123456789', 'qwertyuiop'
+})
 
 
 class DataValidator:
@@ -31,6 +44,19 @@ class DataValidator:
         self.email_pattern = re.compile(
             r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         )
+        
+        # 主密码字符类型正则表达式（仅用于ASCII密码，非ASCII密码按Unicode规则逐字符检查）
+        self.lower_pattern = re.compile(r'[a-z]')
+        self.upper_pattern = re.compile(r'[A-Z]')
+        self.digit_pattern = re.compile(r'[0-9]')
+        self.symbol_pattern = re.compile(f'[{re.escape(MASTER_PASSWORD_SYMBOLS)}]')
+        
+        # 连续三个相同字符
+        self.repeat_pattern = re.compile(r'(.)\1\1', re.DOTALL)
+        
+        # 最近一次主密码验证结果，键为以实例随机密钥计算的密码HMAC（输入框逐键验证时复用）
+        self._cache_key = secrets.token_bytes(32)
+        self._last_master_result: Optional[Tuple[bytes, Dict[str, Any]]] = None
     
     def validate_platform_name(self, platform: str) -> Dict[str, Any]:
         """
@@ -153,16 +179,39 @@ class DataValidator:
         Args:
             password (str): 主密码
             
+        Returns:
+            Dict[str, Any]: 验证结果，包含is_valid、errors和warnings
+        """
+        if not password:
+            return {'is_valid': False, 'errors': ['主密码不能为空'], 'warnings': []}
+        
+        key = hmac.new(self._cache_key, password.encode('utf-8', 'surrogatepass'),
+                       hashlib.sha256).digest()
+        cached = self._last_master_result
+        if cached is None or not hmac.compare_digest(cached[0], key):
+            cached = (key, self._check_master_password(password))
+            self._last_master_result = cached
+        
+        result = cached[1]
+        return {
+            'is_valid': result['is_valid'],
+            'errors': list(result['errors']),
+            'warnings': list(result['warnings'])
+        }
+    
+    def _check_master_password(self, password: str) -> Dict[str, Any]:
+        """
+        执行主密码规则检查
+        
+        Args:
+            password (str): 非空主密码
+            
         Returns:
             Dict[str, Any]: 验证结果，包含is_valid、errors和warnings
         """
         errors = []
         warnings = []
         
-        if not password:
-            errors.append('主密码不能为空')
-            return {'is_valid': False, 'errors': errors, 'warnings': warnings}
-        
         if len(password) < 8:
             errors.append('主密码至少需要8个字符')
         
@@ -170,10 +219,15 @@ class DataValidator:
             errors.append('主密码不能超过128个字符')
         
         # 检查字符类型
-        has_lower = any(c.islower() for c in password)
-        has_upper = any(c.isupper() for c in password)
-        has_digit = any(c.isdigit() for c in password)
-        has_symbol = any(c in '!@#$%^&*()_+-=[]{}|;:,.<>?"\'\'' for c in password)
+        if password.isascii():
+            has_lower = self.lower_pattern.search(password) is not None
+            has_upper = self.upper_pattern.search(password) is not None
+            has_digit = self.digit_pattern.search(password) is not None
+        else:
+            has_lower = any(c.islower() for c in password)
+            has_upper = any(c.isupper() for c in password)
+            has_digit = any(c.isdigit() for c in password)
+        has_symbol = self.symbol_pattern.search(password) is not None
         
         char_types = sum([has_lower, has_upper, has_digit, has_symbol])
         
@@ -188,21 +242,11 @@ class DataValidator:
             warnings.append('建议包含特殊符号以提高安全性')
         
         # 检查常见弱密码
-        weak_passwords = [
-            'password', '12345678', 'qwerty123', 'admin123',
-            'password123', '123456789', 'qwertyuiop'
-        ]
-        
-        if password.lower() in weak_passwords:
+        if password.lower() in WEAK_PASSWORDS:
             errors.append('不能使用常见的弱密码')
         
         # 检查重复字符
-        repeat_count = 0
-        for i in range(len(password) - 2):
-            if password[i] == password[i+1] == password[i+2]:
-                repeat_count += 1
-        
-        if repeat_count > 0:
+        if self.repeat_pattern.search(password):
             warnings.append('避免连续重复相同字符')
         
         return {
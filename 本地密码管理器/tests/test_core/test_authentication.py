@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+身份验证服务测试模块
+
+测试AuthenticationService的快速校验、频率限制和自动锁定功能
+"""
+
+import sys
+import os
+import gc
+import tempfile
+import shutil
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from data.repository import DataRepository
+from core.authentication import AuthenticationService, RATE_LIMIT_MAX_ATTEMPTS
+
+
+MASTER_PASSWORD = "TestMasterPassword123!"
+NEW_MASTER_PASSWORD = "NewMasterPassword789!"
+
+
+def _create_service(directory: str) -> AuthenticationService:
+    """
+    创建使用新数据库的身份验证服务
+    """
+    repo = DataRepository(os.path.join(directory, "data.enc"))
+    assert repo.initialize_new_database(MASTER_PASSWORD), "初始化数据库应该成功"
+    return AuthenticationService(repo)
+
+
+def _wait_for_exit(worker, timeout: float = 5.0) -> bool:
+    """
+    等待工作线程退出
+    """
+    worker.join(timeout)
+    return not worker.is_alive()
+
+
+def test_fast_verifier():
+    """
+    测试快速校验值的使用和失效
+    """
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        print("开始测试身份验证服务...")
+
+        service = _create_service(temp_dir)
+        repo = service.repository
+        assert service.authenticate(MASTER_PASSWORD).success, "登录应该成功"
+        assert service._fast_verifier is not None, "登录后应该保存快速校验值"
+
+        with mock.patch.object(repo, 'load_database',
+                               wraps=repo.load_database) as load_database:
+            # 已登录时正确的密码走快速校验，不重新加载数据库
+            assert service.authenticate(MASTER_PASSWORD).success, "再次验证应该成功"
+            load_database.assert_not_called()
+
+            # 错误的密码从不走快速校验
+            result = service.authenticate("WrongPassword123!")
+            assert not result.success, "错误的密码应该验证失败"
+            load_database.assert_called_once_with("WrongPassword123!")
+        print("✓ 快速校验测试通过")
+
+        # 注销后快速校验值被清除
+        service.logout()
+        assert service._fast_verifier is None, "注销后应该清除快速校验值"
+        print("✓ 注销清除快速校验值测试通过")
+
+        # 修改主密码后快速校验值被清除，旧密码不能再通过验证
+        service.reset_failed_attempts()
+        assert service.authenticate(MASTER_PASSWORD).success, "登录应该成功"
+        result = service.change_master_password(MASTER_PASSWORD, NEW_MASTER_PASSWORD)
+        assert result.success, f"修改主密码应该成功: {result.message}"
+        assert service._fast_verifier is None, "修改主密码后应该清除快速校验值"
+
+        with mock.patch.object(repo, 'load_database',
+                               wraps=repo.load_database) as load_database:
+            assert not service.authenticate(MASTER_PASSWORD).success, \
+                "旧密码不应该通过验证"
+            load_database.assert_called_once_with(MASTER_PASSWORD)
+        assert service.authenticate(NEW_MASTER_PASSWORD).success, "新密码应该通过验证"
+        print("✓ 修改主密码清除快速校验值测试通过")
+
+        service.logout()
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_rate_limit():
+    """
+    测试验证频率限制
+    """
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        service = _create_service(temp_dir)
+        repo = service.repository
+
+        for _ in range(RATE_LIMIT_MAX_ATTEMPTS):
+            assert not service.authenticate("WrongPassword123!").rate_limited, \
+                "未达到上限时不应该被限流"
+
+        # 时间窗口内的下一次尝试直接被拒绝，不执行KDF
+        with mock.patch.object(repo, 'load_database') as load_database:
+            result = service.authenticate(MASTER_PASSWORD)
+            assert not result.success and result.rate_limited, "超过上限时应该被限流"
+            load_database.assert_not_called()
+        print("✓ 频率限制测试通过")
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_auto_lock_worker():
+    """
+    测试自动锁定工作线程的退出
+    """
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        service = _create_service(temp_dir)
+        locked = []
+
+        def on_auto_lock(auth_service=service):
+            locked.append(auth_service.is_authenticated())
+
+        service.set_auto_lock_callback(on_auto_lock)
+
+        # 超时后自动锁定，工作线程随之退出
+        assert service.authenticate(MASTER_PASSWORD).success, "登录应该成功"
+        worker = service._auto_lock_worker
+        assert worker is not None and worker.is_alive(), "登录后应该启动工作线程"
+        service.set_auto_lock_timeout(0.1)
+        assert _wait_for_exit(worker), "自动锁定后工作线程应该退出"
+        assert locked == [False], "回调执行时应该已经注销"
+        assert not service.is_authenticated(), "自动锁定后应该注销"
+        assert service._fast_verifier is None, "自动锁定后应该清除快速校验值"
+        print("✓ 自动锁定测试通过")
+
+        # 服务对象被回收后工作线程退出
+        del service, on_auto_lock
+        service = _create_service(temp_dir)
+        assert service.authenticate(MASTER_PASSWORD).success, "登录应该成功"
+        worker = service._auto_lock_worker
+        del service
+        gc.collect()
+        assert _wait_for_exit(worker), "服务对象被回收后工作线程应该退出"
+        print("✓ 工作线程回收测试通过")
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_fast_verifier()
+    test_rate_limit()
+    test_auto_lock_worker()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+备份管理器测试模块
+
+测试BackupManager的备份创建和恢复功能
+"""
+
+import sys
+import os
+import tempfile
+import shutil
+from pathlib import Path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from data.repository import DataRepository
+from core.backup_manager import BackupManager
+from config.constants import BACKUP_FILE_EXTENSION, ENCRYPTED_BACKUP_EXTENSION
+
+
+MASTER_PASSWORD = "TestMasterPassword123!"
+BACKUP_PASSWORD = "BackupPassword456!"
+
+
+def _create_repository(directory: str, name: str) -> DataRepository:
+    """
+    创建并初始化一个测试用的数据仓库
+    """
+    repo = DataRepository(os.path.join(directory, name))
+    assert repo.initialize_new_database(MASTER_PASSWORD), "初始化数据库应该成功"
+    return repo
+
+
+def _decrypted_entries(repo: DataRepository) -> dict:
+    """
+    返回 (平台, 用户名) -> 明文密码 的映射
+    """
+    return {
+        (entry.platform, entry.username): repo.decrypt_password(entry)
+        for entry in repo.get_password_entries()
+    }
+
+
+def test_backup_round_trip():
+    """
+    测试加密备份和普通备份的创建与恢复
+    """
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        print("开始测试备份管理器...")
+
+        assert ENCRYPTED_BACKUP_EXTENSION != BACKUP_FILE_EXTENSION, \
+            "加密备份与普通备份的扩展名必须不同"
+
+        source = _create_repository(temp_dir, "source.enc")
+        assert source.add_password_entry("GitHub", "dev@example.com", "GitHubPass1!")
+        assert source.add_password_entry("Email", "me@example.com", "EmailPass2!", "个人")
+        expected = _decrypted_entries(source)
+
+        backup_manager = BackupManager(source, os.path.join(temp_dir, "backups"))
+
+        # 测试加密备份
+        result = backup_manager.create_backup(backup_password=BACKUP_PASSWORD)
+        assert result['success'], f"创建加密备份应该成功: {result.get('message')}"
+        assert result['backup_file'].endswith(ENCRYPTED_BACKUP_EXTENSION)
+        encrypted_file = result['backup_file']
+
+        target = _create_repository(temp_dir, "target.enc")
+        restore_manager = BackupManager(target, os.path.join(temp_dir, "backups"))
+        result = restore_manager.restore_backup(encrypted_file, BACKUP_PASSWORD)
+        assert result['success'], f"恢复加密备份应该成功: {result.get('message')}"
+        assert result['restored_entries'] == 2, "应该恢复两个条目"
+        assert _decrypted_entries(target) == expected, "恢复后的密码不一致"
+        print("✓ 加密备份测试通过")
+
+        # 再次恢复时已存在的条目被跳过
+        result = restore_manager.restore_backup(encrypted_file, BACKUP_PASSWORD)
+        assert result['success'] and result['skipped_entries'] == 2, \
+            "已存在的条目应该被跳过"
+        print("✓ 重复恢复测试通过")
+
+        # 测试错误的备份密码
+        result = restore_manager.restore_backup(encrypted_file, "WrongPassword!")
+        assert not result['success'], "错误的备份密码应该恢复失败"
+        result = restore_manager.restore_backup(encrypted_file)
+        assert not result['success'], "缺少备份密码应该恢复失败"
+        print("✓ 错误密码测试通过")
+
+        # 测试被篡改的备份文件
+        tampered_file = "tampered" + ENCRYPTED_BACKUP_EXTENSION
+        tampered_path = Path(temp_dir, "backups", tampered_file)
+        data = bytearray(Path(temp_dir, "backups", encrypted_file).read_bytes())
+        data[-1] ^= 0xFF
+        tampered_path.write_bytes(bytes(data))
+        result = restore_manager.restore_backup(tampered_file, BACKUP_PASSWORD)
+        assert not result['success'], "被篡改的备份应该恢复失败"
+        print("✓ 篡改文件测试通过")
+
+        # 测试普通备份
+        result = backup_manager.create_backup(encrypt_backup=False)
+        assert result['success'], f"创建普通备份应该成功: {result.get('message')}"
+        assert result['backup_file'].endswith(BACKUP_FILE_EXTENSION)
+
+        plain_target = _create_repository(temp_dir, "plain_target.enc")
+        plain_manager = BackupManager(plain_target, os.path.join(temp_dir, "backups"))
+        result = plain_manager.restore_backup(result['backup_file'])
+        assert result['success'], f"恢复普通备份应该成功: {result.get('message')}"
+        assert _decrypted_entries(plain_target) == expected, "恢复后的密码不一致"
+        print("✓ 普通备份测试通过")
+
+        print("\n所有备份管理器测试通过！")
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_restore_after_master_password_change():
+    """
+    测试备份后修改主密码再恢复
+    """
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        repo = _create_repository(temp_dir, "data.enc")
+        assert repo.add_password_entry("GitHub", "dev@example.com", "GitHubPass1!")
+        expected = _decrypted_entries(repo)
+
+        backup_manager = BackupManager(repo, os.path.join(temp_dir, "backups"))
+        result = backup_manager.create_backup(backup_password=BACKUP_PASSWORD)
+        assert result['success'], f"创建备份应该成功: {result.get('message')}"
+        backup_file = result['backup_file']
+
+        new_master_password = "NewMasterPassword789!"
+        assert repo.change_master_password(MASTER_PASSWORD, new_master_password)
+        for entry in repo.get_password_entries():
+            assert repo.delete_password_entry(entry.id)
+
+        # 未提供备份时的主密码时不能恢复
+        result = backup_manager.restore_backup(backup_file, BACKUP_PASSWORD)
+        assert not result['success'], "主密码不同且未提供原主密码时应该失败"
+
+        # 原主密码错误时不能恢复
+        result = backup_manager.restore_backup(
+            backup_file, BACKUP_PASSWORD, backup_master_password="WrongPassword!"
+        )
+        assert not result['success'], "原主密码错误时应该失败"
+
+        # 提供原主密码后条目被重新加密为新主密码
+        result = backup_manager.restore_backup(
+            backup_file, BACKUP_PASSWORD, backup_master_password=MASTER_PASSWORD
+        )
+        assert result['success'], f"恢复备份应该成功: {result.get('message')}"
+        assert _decrypted_entries(repo) == expected, "恢复后的密码不一致"
+
+        reloaded = DataRepository(os.path.join(temp_dir, "data.enc"))
+        assert reloaded.load_database(new_master_password), "新主密码应该能加载数据库"
+        assert _decrypted_entries(reloaded) == expected, "重新加载后的密码不一致"
+        print("✓ 修改主密码后恢复测试通过")
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_backup_round_trip()
+    test_restore_after_master_password_change()
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+文件管理器测试模块
+
+测试FileManager的文件读写、哈希、复制和列表功能
+"""
+
+import sys
+import os
+import hashlib
+import tempfile
+import shutil
+from pathlib import Path
+from unittest import mock
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from core.file_manager import FileManager
+from utils.helpers import calculate_file_hash, MMAP_HASH_THRESHOLD
+
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_file_manager():
+    """
+    测试文件管理器的基本功能
+    """
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        print("开始测试文件管理器...")
+
+        file_manager = FileManager(os.path.join(temp_dir, "data"),
+                                   os.path.join(temp_dir, "temp"))
+
+        # 测试创建文件，哈希直接由内存中的内容计算
+        content = os.urandom(4096)
+        result = file_manager.create_file("test.enc", content)
+        assert result['success'], f"创建文件应该成功: {result.get('message')}"
+        assert result['file_hash'] == _sha256(content), "创建文件的哈希不正确"
+        file_path = result['file_path']
+        print("✓ 创建文件测试通过")
+
+        # 测试同名文件生成唯一文件名
+        result = file_manager.create_file("test.enc", b"other")
+        assert result['success'], "同名文件应该创建成功"
+        assert result['file_path'] != file_path, "同名文件应该使用新的文件名"
+        print("✓ 唯一文件名测试通过")
+
+        # 测试读取文件
+        result = file_manager.read_file(file_path)
+        assert result['success'], "读取文件应该成功"
+        assert result['content'] == content, "读取的内容不一致"
+        assert result['file_hash'] == _sha256(content), "读取文件的哈希不正确"
+        print("✓ 读取文件测试通过")
+
+        # 测试写入文件并创建备份
+        new_content = b"updated content"
+        result = file_manager.write_file(file_path, new_content)
+        assert result['success'], "写入文件应该成功"
+        assert result['file_hash'] == _sha256(new_content), "写入文件的哈希不正确"
+        assert Path(result['backup_path']).read_bytes() == content, \
+            "备份文件内容应为写入前的内容"
+        assert Path(file_path).read_bytes() == new_content, "写入后的内容不一致"
+        print("✓ 写入文件测试通过")
+
+        # 测试文件信息
+        info = file_manager.get_file_info(file_path)
+        assert info['file_hash'] == _sha256(new_content), "文件信息中的哈希不正确"
+        assert info['is_file'] and not info['is_directory'], "文件类型判断错误"
+        print("✓ 文件信息测试通过")
+
+        # 测试复制文件
+        dest_path = os.path.join(temp_dir, "data", "copy.enc")
+        result = file_manager.copy_file(file_path, dest_path)
+        assert result['success'], "复制文件应该成功"
+        assert Path(dest_path).read_bytes() == new_content, "复制的内容不一致"
+        result = file_manager.copy_file(file_path, dest_path)
+        assert not result['success'], "目标已存在且未设置覆盖时应该失败"
+        print("✓ 复制文件测试通过")
+
+        # 测试列出文件，默认不计算哈希
+        file_manager.create_file("note.txt", b"note")
+        files = file_manager.list_files()
+        filenames = {f['filename'] for f in files}
+        assert filenames >= {"copy.enc", "note.txt"}, "文件列表不完整"
+        assert all(f['file_hash'] is None for f in files), "默认不应计算哈希"
+
+        files = file_manager.list_files(pattern="*.txt", include_hash=True)
+        assert [f['filename'] for f in files] == ["note.txt"], "文件名匹配模式无效"
+        assert files[0]['file_hash'] == _sha256(b"note"), "列表中的哈希不正确"
+
+        # 隐藏文件只有在模式以"."开头时才匹配
+        Path(temp_dir, "data", ".hidden.txt").write_bytes(b"hidden")
+        files = file_manager.list_files(pattern="*.txt")
+        assert [f['filename'] for f in files] == ["note.txt"], "不应匹配隐藏文件"
+        files = file_manager.list_files(pattern=".*.txt")
+        assert [f['filename'] for f in files] == [".hidden.txt"], "应该匹配隐藏文件"
+
+        # 递归模式匹配子目录中的文件
+        Path(temp_dir, "data", "sub").mkdir()
+        Path(temp_dir, "data", "sub", "nested.txt").write_bytes(b"nested")
+        files = file_manager.list_files(pattern="sub/*.txt")
+        assert [f['filename'] for f in files] == ["nested.txt"], "路径模式无效"
+        files = file_manager.list_files(pattern="**/nested.txt")
+        assert [f['filename'] for f in files] == ["nested.txt"], "递归模式无效"
+        print("✓ 列出文件测试通过")
+
+        # 测试目录大小，包含子目录中的文件
+        size_info = file_manager.get_directory_size()
+        assert size_info['success'], "计算目录大小应该成功"
+        expected_size = sum(
+            f.stat().st_size for f in Path(temp_dir, "data").rglob("*") if f.is_file()
+        )
+        assert size_info['total_size'] == expected_size, "目录大小不正确"
+        print("✓ 目录大小测试通过")
+
+        print("\n所有文件管理器测试通过！")
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def test_calculate_file_hash_large_file():
+    """
+    测试大文件通过内存映射计算哈希
+    """
+    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+        content = os.urandom(MMAP_HASH_THRESHOLD + 12345)
+        temp_file.write(content)
+        temp_path = temp_file.name
+
+    try:
+        assert calculate_file_hash(temp_path) == _sha256(content), \
+            "大文件的SHA-256不正确"
+        md5_hash = hashlib.md5(content).hexdigest()
+        assert calculate_file_hash(Path(temp_path), "md5") == md5_hash, \
+            "大文件的MD5不正确"
+        assert calculate_file_hash(temp_path + ".missing") is None, \
+            "不存在的文件应该返回None"
+        print("✓ 大文件哈希测试通过")
+
+    finally:
+        os.unlink(temp_path)
+
+
+def test_copy_file_short_copy_fallback():
+    """
+    测试copy_file_range复制不完整时回退到普通复制
+    """
+    temp_dir = tempfile.mkdtemp()
+
+    try:
+        file_manager = FileManager(os.path.join(temp_dir, "data"),
+                                   os.path.join(temp_dir, "temp"))
+        content = os.urandom(8192)
+        source = file_manager.create_file("source.enc", content)['file_path']
+        dest_path = os.path.join(temp_dir, "data", "dest.enc")
+
+        # 模拟文件系统返回0而不复制任何数据
+        with mock.patch("core.file_manager.os.copy_file_range",
+                        return_value=0, create=True):
+            result = file_manager.copy_file(source, dest_path)
+
+        assert result['success'], "复制文件应该成功"
+        assert Path(dest_path).read_bytes() == content, "回退复制的内容不一致"
+        print("✓ 复制回退测试通过")
+
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    test_file_manager()
+    test_calculate_file_hash_large_file()
+    test_copy_file_short_copy_fallback()
@@ -58,6 +58,19 @@ def test_data_repository():
         assert decrypted_password == "MySecretPassword123!", "解密后的密码应该匹配"
         print("✓ 密码解密测试通过")
         
+        # 测试原样保存密文的条目
+        success = repo.add_password_entry_raw(
+            "GitLab", "test@example.com", entries[0].encrypted_password
+        )
+        assert success, "添加密文条目应该成功"
+        raw_entry = repo.get_password_entries("GitLab")[0]
+        assert repo.decrypt_password(raw_entry) == "MySecretPassword123!", \
+            "密文条目应该能用主密码解密"
+        assert repo.matches_master_password(repo.get_master_password_hash()), \
+            "主密码哈希应该一致"
+        assert repo.delete_password_entry(raw_entry.id), "删除密文条目应该成功"
+        print("✓ 密文条目测试通过")
+        
         # 测试搜索功能
         search_results = repo.get_password_entries("GitHub")
         assert len(search_results) == 1, "搜索应该找到一个结果"
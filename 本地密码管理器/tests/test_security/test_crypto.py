@@ -10,7 +10,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
 
-from security.crypto import CryptoService
+from security.crypto import CryptoService, CryptoManager
 
 
 def test_crypto_service():
@@ -59,5 +59,40 @@ def test_crypto_service():
     print("\n所有加密服务测试通过！")
 
 
+def test_crypto_manager():
+    """
+    测试备份加密管理器的AES-GCM加密解密
+    """
+    crypto = CryptoManager()
+    
+    test_data = "备份数据：{\"entries\": []}".encode('utf-8') * 1000
+    salt = crypto.generate_salt()
+    key = crypto.derive_key_from_password("BackupPassword123!", salt)
+    
+    # 测试加密解密往返
+    encrypted_data = crypto.encrypt_data(test_data, key)
+    assert crypto.decrypt_data(encrypted_data, key) == test_data, "加密解密数据不一致"
+    print("✓ 备份加密解密往返测试通过")
+    
+    # 测试错误密钥
+    wrong_key = crypto.derive_key_from_password("WrongPassword", salt)
+    assert crypto.decrypt_data(encrypted_data, wrong_key) is None, "错误密钥应该解密失败"
+    print("✓ 错误密钥解密测试通过")
+    
+    # 测试数据被篡改
+    tampered = bytearray(encrypted_data)
+    tampered[20] ^= 0x01
+    assert crypto.decrypt_data(bytes(tampered), key) is None, "被篡改的数据应该解密失败"
+    print("✓ 篡改检测测试通过")
+    
+    # 测试派生密钥缓存
+    assert crypto.derive_key_from_password("BackupPassword123!", salt) == key, \
+        "缓存的密钥不一致"
+    CryptoManager.clear_key_cache()
+    assert crypto.derive_key_from_password("BackupPassword123!", salt) == key, \
+        "清空缓存后派生的密钥不一致"
+    print("✓ 派生密钥缓存测试通过")
+
+
 if __name__ == "__main__":
     test_crypto_service
\ No newline at end of file
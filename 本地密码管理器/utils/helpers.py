@@ -8,13 +8,19 @@
 
 import os
 import re
+import mmap
 import hashlib
 import platform
 from datetime import datetime, timedelta
-from typing import str, bool, Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from pathlib import Path
 
 
+# 文件达到该大小时通过内存映射计算哈希，直接读取页缓存，不复制到用户空间缓冲区；
+# 小文件建立映射的固定开销不划算，仍按普通方式读取
+MMAP_HASH_THRESHOLD = 1024 * 1024
+
+
 def format_file_size(size_bytes: int) -> str:
     """
     格式化文件大小
@@ -186,25 +192,34 @@ def generate_unique_filename(base_path: Path, filename: str) -> Path:
         counter += 1
 
 
-def calculate_file_hash(file_path: Path, algorithm: str = "sha256") -> Optional[str]:
+def calculate_file_hash(file_path: Union[str, Path],
+                        algorithm: str = "sha256") -> Optional[str]:
     """
     计算文件哈希值
     
     Args:
-        file_path (Path): 文件路径
+        file_path (Union[str, Path]): 文件路径
         algorithm (str): 哈希算法
         
     Returns:
         Optional[str]: 文件哈希值
     """
+    file_path = Path(file_path)
     if not file_path.exists():
         return None
     
     try:
-        hash_obj = hashlib.new(algorithm)
-        
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            if os.fstat(f.fileno()).st_size >= MMAP_HASH_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return hashlib.new(algorithm, mm).hexdigest()
+            
+            # Python 3.11+ 的file_digest在C中循环读取并更新哈希，避免Python层的分块循环
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, algorithm).hexdigest()
+            
+            hash_obj = hashlib.new(algorithm)
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
                 hash_obj.update(chunk)
         
         return hash_obj.hexdigest()
@@ -350,18 +365,18 @@ def create_backup_filename(original_name: str, timestamp: Optional[datetime] = N
     return f"{stem}_backup_{time_str}{suffix}"
 
 
-def ensure_directory_exists(directory: Path) -> bool:
+def ensure_directory_exists(directory: Union[str, Path]) -> bool:
     """
     确保目录存在
     
     Args:
-        directory (Path): 目录路径
+        directory (Union[str, Path]): 目录路径
         
     Returns:
         bool: 是否成功创建或已存在
     """
     try:
-        directory.mkdir(parents=True, exist_ok=True)
+        Path(directory).mkdir(parents=True, exist_ok=True)
         return True
     except Exception:
         return False
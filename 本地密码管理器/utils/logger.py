@@ -6,9 +6,11 @@
 提供应用程序日志记录功能
 """
 
+import atexit
 import logging
 import logging.handlers
 import os
+import queue
 from pathlib import Path
 from typing import Optional
 from datetime import datetime
@@ -93,6 +95,7 @@ class AppLogger:
         self.name = name
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.DEBUG)
+        self._listener: Optional[logging.handlers.QueueListener] = None
         
         # 避免重复添加处理器
         if not self.logger.handlers:
@@ -102,9 +105,14 @@ class AppLogger:
         """
         设置日志处理器
         
+        控制台和文件处理器由后台QueueListener线程驱动，记录日志的线程
+        只把记录放入队列，不会被磁盘写入阻塞。
+        
         Args:
             log_file (Optional[Path]): 日志文件路径
         """
+        handlers = []
+        
         # 创建格式化器
         formatter = logging.Formatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -116,7 +124,7 @@ class AppLogger:
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(formatter)
         console_handler.addFilter(SecurityFilter())
-        self.logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # 文件处理器
         if log_file:
@@ -133,7 +141,16 @@ class AppLogger:
             file_handler.setLevel(logging.DEBUG)
             file_handler.setFormatter(formatter)
             file_handler.addFilter(SecurityFilter())
-            self.logger.addHandler(file_handler)
+            handlers.append(file_handler)
+        
+        # 记录器只挂QueueHandler，实际输出在监听线程中完成
+        log_queue = queue.SimpleQueue()
+        self.logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self._listener.stop)
     
     def debug(self, message: str, *args, **kwargs):
         """
@@ -189,44 +206,47 @@ class AppLogger:
         """
         self.logger.exception(message, *args, **kwargs)
     
-    def log_user_action(self, action: str, details: str = ""):
+    def log_user_action(self, action: str, details: str = "", *args):
         """
         记录用户操作
         
         Args:
             action (str): 操作类型
-            details (str): 操作详情
+            details (str): 操作详情，可以是%格式模板
+            *args: 详情模板参数，由日志系统延迟格式化
         """
         message = f"用户操作: {action}"
         if details:
             message += f" - {details}"
-        self.info(message)
+        self.info(message, *args)
     
-    def log_security_event(self, event: str, details: str = ""):
+    def log_security_event(self, event: str, details: str = "", *args):
         """
         记录安全事件
         
         Args:
             event (str): 事件类型
-            details (str): 事件详情
+            details (str): 事件详情，可以是%格式模板
+            *args: 详情模板参数，由日志系统延迟格式化
         """
         message = f"安全事件: {event}"
         if details:
             message += f" - {details}"
-        self.warning(message)
+        self.warning(message, *args)
     
-    def log_system_event(self, event: str, details: str = ""):
+    def log_system_event(self, event: str, details: str = "", *args):
         """
         记录系统事件
         
         Args:
             event (str): 事件类型
-            details (str): 事件详情
+            details (str): 事件详情，可以是%格式模板
+            *args: 详情模板参数，由日志系统延迟格式化
         """
         message = f"系统事件: {event}"
         if details:
             message += f" - {details}"
-        self.info(message)
+        self.info(message, *args)
     
     def set_level(self, level: str):
         """
@@ -337,37 +357,40 @@ def log_exception(message: str, *args, **kwargs):
         _app_logger.exception(message, *args, **kwargs)
 
 
-def log_user_action(action: str, details: str = ""):
+def log_user_action(action: str, details: str = "", *args):
     """
     记录用户操作（便捷函数）
     
     Args:
         action (str): 操作类型
-        details (str): 操作详情
+        details (str): 操作详情，可以是%格式模板
+        *args: 详情模板参数
     """
     if _app_logger:
-        _app_logger.log_user_action(action, details)
+        _app_logger.log_user_action(action, details, *args)
 
 
-def log_security_event(event: str, details: str = ""):
+def log_security_event(event: str, details: str = "", *args):
     """
     记录安全事件（便捷函数）
     
     Args:
         event (str): 事件类型
-        details (str): 事件详情
+        details (str): 事件详情，可以是%格式模板
+        *args: 详情模板参数
     """
     if _app_logger:
-        _app_logger.log_security_event(event, details)
+        _app_logger.log_security_event(event, details, *args)
 
 
-def log_system_event(event: str, details: str = ""):
+def log_system_event(event: str, details: str = "", *args):
     """
     记录系统事件（便捷函数）
     
     Args:
         event (str): 事件类型
-        details (str): 事件详情
+        details (str): 事件详情，可以是%格式模板
+        *args: 详情模板参数
     """
     if _app_logger:
-        _app_logger.log_system_event(event, details)
\ No newline at end of file
+        _app_logger.log_system_event(event, details, *args)
\ No newline at end of file